@@ -50,7 +50,9 @@ def merge_references(function):
 
                 if merged_local_value is not local_value:
                     with entity.session.operation_recording(False):
-                        attribute.set_local_value(entity, merged_local_value)
+                        attribute._set_local_value(
+                            entity, merged_local_value, modified=False
+                        )
 
             # Remote attributes.
             remote_value = attribute.get_remote_value(entity)
@@ -71,7 +73,8 @@ def merge_references(function):
                 if merged_remote_value is not remote_value:
                     attribute.set_remote_value(entity, merged_remote_value)
 
-            entity._inflated.add(attribute.name)
+            # Shared empty set on the class is replaced rather than mutated.
+            entity._inflated = entity._inflated.union((attribute.name,))
 
         return function(attribute, entity)
 
@@ -79,11 +82,19 @@ def merge_references(function):
 
 
 class Attributes(object):
-    """Collection of properties accessible by name."""
+    """Collection of properties accessible by name.
+
+    Each added attribute is assigned a fixed slot so that entities can store
+    local and remote values in a flat list indexed by slot rather than in a
+    mapping keyed by attribute name.
+
+    """
 
     def __init__(self, attributes=None):
         super(Attributes, self).__init__()
         self._data = dict()
+        self._merge_order = None
+        self._slot_count = 0
         if attributes is not None:
             for attribute in attributes:
                 self.add(attribute)
@@ -99,10 +110,52 @@ class Attributes(object):
             )
 
         self._data[attribute.name] = attribute
+        self._merge_order = None
+
+        if attribute._storage_owner is None:
+            attribute._storage_owner = self
+            attribute._local_index = 2 * self._slot_count
+            attribute._remote_index = attribute._local_index + 1
+            self._slot_count += 1
 
     def remove(self, attribute):
-        """Remove attribute."""
+        """Remove attribute.
+
+        .. note::
+
+            The slot of the attribute is not reused so that storage of
+            existing entities remains valid.
+
+        """
         self._data.pop(attribute.name)
+        self._merge_order = None
+
+    @property
+    def storage_size(self):
+        """Return length of value storage required by an entity."""
+        return 2 * self._slot_count
+
+    def merge_order(self):
+        """Return list of attributes in the order to merge them.
+
+        Scalar attributes come first so that the attributes making up the
+        identity of an entity are merged before any collections that may
+        reference that entity.
+
+        """
+        if self._merge_order is None:
+            scalars = []
+            others = []
+            for attribute in self._data.values():
+                if isinstance(attribute, ScalarAttribute):
+                    scalars.append(attribute)
+                else:
+                    others.append(attribute)
+
+            scalars.reverse()
+            self._merge_order = scalars + others
+
+        return self._merge_order
 
     def get(self, name):
         """Return attribute by *name*.
@@ -166,6 +219,12 @@ class Attribute(object):
         self._local_key = "local"
         self._remote_key = "remote"
 
+        # Position of values in entity storage as assigned by the first
+        # :class:`Attributes` this attribute is added to.
+        self._storage_owner = None
+        self._local_index = None
+        self._remote_index = None
+
     def __repr__(self):
         """Return representation of entity."""
         return "<{0}.{1}({2}) object at {3}>".format(
@@ -173,7 +232,14 @@ class Attribute(object):
         )
 
     def get_entity_storage(self, entity):
-        """Return attribute storage on *entity* creating if missing."""
+        """Return attribute storage on *entity* creating if missing.
+
+        .. note::
+
+            Only used for attributes without a slot in the attributes of
+            *entity*. See :meth:`get_entity_values`.
+
+        """
         storage_key = "_ftrack_attribute_storage"
         storage = getattr(entity, storage_key, None)
         if storage is None:
@@ -187,6 +253,30 @@ class Attribute(object):
 
         return storage
 
+    def get_entity_values(self, entity):
+        """Return flat value storage on *entity* or None if not applicable.
+
+        Storage is only used when this attribute has a slot in the attributes
+        of *entity*. It is created or extended on demand so that it remains
+        valid for attributes added after *entity* was constructed.
+
+        """
+        if entity.attributes is not self._storage_owner:
+            return None
+
+        try:
+            values = entity._ftrack_values
+        except AttributeError:
+            values = entity._ftrack_values = []
+
+        if len(values) <= self._remote_index:
+            values.extend(
+                [ftrack_api.symbol.NOT_SET]
+                * (self._storage_owner.storage_size - len(values))
+            )
+
+        return values
+
     @property
     def name(self):
         """Return name."""
@@ -216,6 +306,11 @@ class Attribute(object):
 
         value = self.get_remote_value(entity)
         if value is not ftrack_api.symbol.NOT_SET:
+            session = entity.session
+            if session.freshness_policies and session.auto_populate:
+                session._revalidate_if_stale(entity)
+                value = self.get_remote_value(entity)
+
             return value
 
         if not entity.session.auto_populate:
@@ -226,6 +321,10 @@ class Attribute(object):
 
     def get_local_value(self, entity):
         """Return locally set value for *entity*."""
+        values = self.get_entity_values(entity)
+        if values is not None:
+            return values[self._local_index]
+
         storage = self.get_entity_storage(entity)
         return storage[self.name][self._local_key]
 
@@ -237,11 +336,33 @@ class Attribute(object):
             Only return locally stored remote value, do not fetch from remote.
 
         """
+        values = self.get_entity_values(entity)
+        if values is not None:
+            return values[self._remote_index]
+
         storage = self.get_entity_storage(entity)
         return storage[self.name][self._remote_key]
 
     def set_local_value(self, entity, value):
-        """Set local *value* for *entity*."""
+        """Set local *value* for *entity*.
+
+        Raise :exc:`~ftrack_api.exception.ReadOnlySessionError` if the session
+        of *entity* is read only.
+
+        """
+        self._set_local_value(entity, value)
+
+    def _set_local_value(self, entity, value, modified=True):
+        """Set local *value* for *entity*.
+
+        If *modified* is False then *value* only mirrors existing state, such
+        as a copy of the remote value, and *entity* is not marked as modified
+        with the session.
+
+        """
+        if entity.session.read_only:
+            raise ftrack_api.exception.ReadOnlySessionError()
+
         if (
             not self.mutable
             and self.is_set(entity)
@@ -251,8 +372,17 @@ class Attribute(object):
 
         old_value = self.get_local_value(entity)
 
-        storage = self.get_entity_storage(entity)
-        storage[self.name][self._local_key] = value
+        values = self.get_entity_values(entity)
+        if values is not None:
+            values[self._local_index] = value
+        else:
+            storage = self.get_entity_storage(entity)
+            storage[self.name][self._local_key] = value
+        if self.name in entity.primary_key_attributes:
+            entity._ftrack_identity = None
+
+        if modified and value is not ftrack_api.symbol.NOT_SET:
+            entity.session._mark_modified(entity)
 
         # Record operation.
         if entity.session.record_operations:
@@ -274,8 +404,25 @@ class Attribute(object):
             Only set locally stored remote value, do not persist to remote.
 
         """
-        storage = self.get_entity_storage(entity)
-        storage[self.name][self._remote_key] = value
+        values = self.get_entity_values(entity)
+        if values is not None:
+            values[self._remote_index] = value
+        else:
+            storage = self.get_entity_storage(entity)
+            storage[self.name][self._remote_key] = value
+        if self.name in entity.primary_key_attributes:
+            entity._ftrack_identity = None
+
+    def clear_value(self, entity):
+        """Clear local and remote value of *entity* without recording it."""
+        values = self.get_entity_values(entity)
+        if values is not None:
+            values[self._local_index] = ftrack_api.symbol.NOT_SET
+            values[self._remote_index] = ftrack_api.symbol.NOT_SET
+        else:
+            storage = self.get_entity_storage(entity)[self.name]
+            storage[self._local_key] = ftrack_api.symbol.NOT_SET
+            storage[self._remote_key] = ftrack_api.symbol.NOT_SET
 
     def populate_remote_value(self, entity):
         """Populate remote value for *entity*."""
@@ -360,9 +507,9 @@ class ReferenceAttribute(Attribute):
         if remote_value is ftrack_api.symbol.NOT_SET:
             return True
 
-        if ftrack_api.inspection.identity(
+        if ftrack_api.inspection.identity_key(
             local_value
-        ) != ftrack_api.inspection.identity(remote_value):
+        ) != ftrack_api.inspection.identity_key(remote_value):
             return True
 
         return False
@@ -392,8 +539,12 @@ class AbstractCollectionAttribute(Attribute):
             value into the local value on access if no local value currently
             set.
 
+            For a read only session the remote value is returned as is.
+
         """
-        super(AbstractCollectionAttribute, self).get_value(entity)
+        value = super(AbstractCollectionAttribute, self).get_value(entity)
+        if entity.session.read_only:
+            return value
 
         # Conditionally, copy remote value into local value so that it can be
         # mutated without side effects.
@@ -404,7 +555,9 @@ class AbstractCollectionAttribute(Attribute):
         ):
             try:
                 with entity.session.operation_recording(False):
-                    self.set_local_value(entity, copy.copy(remote_value))
+                    self._set_local_value(
+                        entity, copy.copy(remote_value), modified=False
+                    )
             except ftrack_api.exception.ImmutableAttributeError:
                 pass
 
@@ -419,23 +572,26 @@ class AbstractCollectionAttribute(Attribute):
         if value is ftrack_api.symbol.NOT_SET:
             try:
                 with entity.session.operation_recording(False):
-                    self.set_local_value(
+                    self._set_local_value(
                         entity,
                         # None should be treated as empty collection.
                         None,
+                        modified=False,
                     )
             except ftrack_api.exception.ImmutableAttributeError:
                 pass
 
         return self.get_local_value(entity)
 
-    def set_local_value(self, entity, value):
+    def _set_local_value(self, entity, value, modified=True):
         """Set local *value* for *entity*."""
         if value is not ftrack_api.symbol.NOT_SET:
             value = self._adapt_to_collection(entity, value)
             value.mutable = self.mutable
 
-        super(AbstractCollectionAttribute, self).set_local_value(entity, value)
+        super(AbstractCollectionAttribute, self)._set_local_value(
+            entity, value, modified=modified
+        )
 
     def set_remote_value(self, entity, value):
         """Set remote *value*.
@@ -449,6 +605,13 @@ class AbstractCollectionAttribute(Attribute):
             value = self._adapt_to_collection(entity, value)
             value.mutable = False
 
+            # Remote value is the baseline that local copies report changes
+            # against.
+            if isinstance(value, ftrack_api.collection.MappedCollectionProxy):
+                value.collection.track_changes()
+            else:
+                value.track_changes()
+
         super(AbstractCollectionAttribute, self).set_remote_value(entity, value)
 
     def _adapt_to_collection(self, entity, value):
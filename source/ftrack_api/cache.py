@@ -19,48 +19,1518 @@ from builtins import str
 from builtins import object
 import functools
 import abc
+import hashlib
+import mmap
 import collections.abc
 import copy
 import inspect
+import logging
+import os
 import re
+import socket
+import sqlite3
+import struct
+import sys
+import threading
+import time
+import weakref
 
 import pickle
 import contextlib
 
 import dbm as anydbm
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+import ftrack_api.exception
 import ftrack_api.inspection
 import ftrack_api.symbol
 
 
-class Cache(metaclass=abc.ABCMeta):
-    """Cache interface.
+class Cache(metaclass=abc.ABCMeta):
+    """Cache interface.
+
+    Derive from this to define concrete cache implementations. A cache is
+    centered around the concept of key:value pairings where the key is unique
+    across the cache.
+
+    """
+
+    @abc.abstractmethod
+    def get(self, key):
+        """Return value for *key*.
+
+        Raise :exc:`KeyError` if *key* not found.
+
+        """
+
+    @abc.abstractmethod
+    def set(self, key, value):
+        """Set *value* for *key*."""
+
+    @abc.abstractmethod
+    def remove(self, key):
+        """Remove *key* and return stored value.
+
+        Raise :exc:`KeyError` if *key* not found.
+
+        """
+
+    def get_many(self, keys):
+        """Return mapping of *keys* to values for keys found.
+
+        Keys not found are omitted from the returned mapping. Override to
+        retrieve several keys more efficiently than individually.
+
+        """
+        values = {}
+        for key in keys:
+            try:
+                values[key] = self.get(key)
+            except KeyError:
+                continue
+
+        return values
+
+    def set_many(self, items):
+        """Set values for keys in *items* mapping.
+
+        Override to set several keys more efficiently than individually.
+
+        """
+        for key, value in items.items():
+            self.set(key, value)
+
+    def remove_many(self, keys):
+        """Remove *keys*, ignoring any not found.
+
+        Override to remove several keys more efficiently than individually.
+
+        """
+        for key in keys:
+            try:
+                self.remove(key)
+            except KeyError:
+                continue
+
+    def keys(self):
+        """Return list of keys at this current time.
+
+        .. warning::
+
+            Actual keys may differ from those returned due to timing of access.
+
+        """
+        raise NotImplementedError()  # pragma: no cover
+
+    def values(self):
+        """Return values for current keys."""
+        values = []
+        for key in list(self.keys()):
+            try:
+                value = self.get(key)
+            except KeyError:
+                continue
+            else:
+                values.append(value)
+
+        return values
+
+    def clear(self, pattern=None):
+        """Remove all keys matching *pattern*.
+
+        *pattern* should be a regular expression string.
+
+        If *pattern* is None then all keys will be removed.
+
+        """
+
+        if pattern is not None:
+            pattern = re.compile(pattern)
+
+        for key in list(self.keys()):
+            if pattern is not None:
+                if not pattern.search(key):
+                    continue
+
+            try:
+                self.remove(key)
+            except KeyError:
+                pass
+
+
+class ProxyCache(Cache):
+    """Proxy another cache."""
+
+    def __init__(self, proxied):
+        """Initialise cache with *proxied* cache instance."""
+        self.proxied = proxied
+        super(ProxyCache, self).__init__()
+
+    def get(self, key):
+        """Return value for *key*.
+
+        Raise :exc:`KeyError` if *key* not found.
+
+        """
+        return self.proxied.get(key)
+
+    def set(self, key, value):
+        """Set *value* for *key*."""
+        return self.proxied.set(key, value)
+
+    def remove(self, key):
+        """Remove *key* and return stored value.
+
+        Raise :exc:`KeyError` if *key* not found.
+
+        """
+        return self.proxied.remove(key)
+
+    def get_many(self, keys):
+        """Return mapping of *keys* to values for keys found."""
+        return self.proxied.get_many(keys)
+
+    def set_many(self, items):
+        """Set values for keys in *items* mapping."""
+        return self.proxied.set_many(items)
+
+    def remove_many(self, keys):
+        """Remove *keys*, ignoring any not found."""
+        return self.proxied.remove_many(keys)
+
+    def keys(self):
+        """Return list of keys at this current time.
+
+        .. warning::
+
+            Actual keys may differ from those returned due to timing of access.
+
+        """
+        return list(self.proxied.keys())
+
+
+class LayeredCache(Cache):
+    """Layered cache."""
+
+    def __init__(self, caches, negative_cache=None, statistics=None):
+        """Initialise cache with *caches*.
+
+        *negative_cache* may be a :class:`NegativeCache` used to remember keys
+        known not to exist remotely. Setting a key on this cache will discard
+        any such record for it.
+
+        *statistics* may be a :class:`CacheStatistics` instance to record
+        retrievals against each layer with.
+
+        """
+        super(LayeredCache, self).__init__()
+        self.caches = caches
+        self.negative_cache = negative_cache
+        self.statistics = statistics
+
+    def get(self, key):
+        """Return value for *key*.
+
+        Raise :exc:`KeyError` if *key* not found.
+
+        Attempt to retrieve from cache layers in turn, starting with shallowest.
+        If value retrieved, then also set the value in each higher level cache
+        up from where retrieved.
+
+        """
+        statistics = self.statistics
+        if statistics is not None:
+            return self._get_recording(key, statistics)
+
+        target_caches = []
+        value = ftrack_api.symbol.NOT_SET
+
+        for cache in self.caches:
+            try:
+                value = cache.get(key)
+            except KeyError:
+                target_caches.append(cache)
+                continue
+            else:
+                break
+
+        if value is ftrack_api.symbol.NOT_SET:
+            raise KeyError(key)
+
+        # Set value on all higher level caches.
+        for cache in target_caches:
+            cache.set(key, value)
+
+        return value
+
+    def _get_recording(self, key, statistics):
+        """Return value for *key* recording retrievals in *statistics*."""
+        value = ftrack_api.symbol.NOT_SET
+        layer = 0
+
+        for layer, cache in enumerate(self.caches):
+            start = time.perf_counter()
+            try:
+                value = cache.get(key)
+            except KeyError:
+                statistics.record_lookup(layer, (), (key,), time.perf_counter() - start)
+                continue
+            else:
+                statistics.record_lookup(layer, (key,), (), time.perf_counter() - start)
+                break
+
+        if value is ftrack_api.symbol.NOT_SET:
+            statistics.record_missing((key,))
+            raise KeyError(key)
+
+        # Set value on all higher level caches.
+        for target_layer in range(layer):
+            self.caches[target_layer].set(key, value)
+            statistics.record_backfill(target_layer, (key,))
+
+        return value
+
+    def get_many(self, keys):
+        """Return mapping of *keys* to values for keys found.
+
+        Each layer is asked in turn for the keys not found in shallower layers
+        using a single :meth:`~Cache.get_many` call. Values retrieved are also
+        set in each higher level cache.
+
+        """
+        statistics = self.statistics
+        values = {}
+        missing = list(keys)
+
+        for layer, cache in enumerate(self.caches):
+            if not missing:
+                break
+
+            start = time.perf_counter()
+            found = cache.get_many(missing)
+            remaining = [key for key in missing if key not in found]
+
+            if statistics is not None:
+                statistics.record_lookup(
+                    layer, list(found), remaining, time.perf_counter() - start
+                )
+
+            if found:
+                # Set values on all higher level caches.
+                for target_layer in range(layer):
+                    self.caches[target_layer].set_many(found)
+                    if statistics is not None:
+                        statistics.record_backfill(target_layer, list(found))
+
+            values.update(found)
+            missing = remaining
+
+        if missing and statistics is not None:
+            statistics.record_missing(missing)
+
+        return values
+
+    def set(self, key, value):
+        """Set *value* for *key*."""
+        if self.negative_cache is not None:
+            self.negative_cache.discard(key)
+
+        for cache in self.caches:
+            cache.set(key, value)
+
+    def set_many(self, items):
+        """Set values for keys in *items* mapping."""
+        if self.negative_cache is not None:
+            for key in items:
+                self.negative_cache.discard(key)
+
+        for cache in self.caches:
+            cache.set_many(items)
+
+    def remove_many(self, keys):
+        """Remove *keys* from all layers, ignoring any not found."""
+        keys = list(keys)
+        for cache in self.caches:
+            cache.remove_many(keys)
+
+    def remove(self, key):
+        """Remove *key*.
+
+        Raise :exc:`KeyError` if *key* not found in any layer.
+
+        """
+        removed = False
+        for cache in self.caches:
+            try:
+                cache.remove(key)
+            except KeyError:
+                pass
+            else:
+                removed = True
+
+        if not removed:
+            raise KeyError(key)
+
+    def keys(self):
+        """Return list of keys at this current time.
+
+        .. warning::
+
+            Actual keys may differ from those returned due to timing of access.
+
+        """
+        keys = []
+        for cache in self.caches:
+            keys.extend(list(cache.keys()))
+
+        return list(set(keys))
+
+
+class MemoryCache(Cache):
+    """Memory based cache."""
+
+    def __init__(self):
+        """Initialise cache."""
+        self._cache = {}
+        super(MemoryCache, self).__init__()
+
+    def get(self, key):
+        """Return value for *key*.
+
+        Raise :exc:`KeyError` if *key* not found.
+
+        """
+        return self._cache[key]
+
+    def set(self, key, value):
+        """Set *value* for *key*."""
+        self._cache[key] = value
+
+    def remove(self, key):
+        """Remove *key*.
+
+        Raise :exc:`KeyError` if *key* not found.
+
+        """
+        del self._cache[key]
+
+    def get_many(self, keys):
+        """Return mapping of *keys* to values for keys found."""
+        cache = self._cache
+        return dict((key, cache[key]) for key in keys if key in cache)
+
+    def set_many(self, items):
+        """Set values for keys in *items* mapping."""
+        self._cache.update(items)
+
+    def remove_many(self, keys):
+        """Remove *keys*, ignoring any not found."""
+        for key in keys:
+            self._cache.pop(key, None)
+
+    def keys(self):
+        """Return list of keys at this current time.
+
+        .. warning::
+
+            Actual keys may differ from those returned due to timing of access.
+
+        """
+        return list(self._cache.keys())
+
+
+class BoundedMemoryCache(MemoryCache):
+    """Memory based cache bounded by entry count and/or approximate size.
+
+    The least recently used values are evicted once a limit is exceeded.
+    Evicted values are only weakly referenced so that, whilst still in use
+    elsewhere, the same value is returned for a key.
+
+    """
+
+    def __init__(
+        self, max_entries=None, max_bytes=None, is_evictable=None, size_of=None
+    ):
+        """Initialise cache.
+
+        *max_entries* limits the number of values held whilst *max_bytes* limits
+        their total approximate size. A limit of None is unbounded.
+
+        *is_evictable* may be a callable accepting a value and returning
+        whether it may be evicted. Values that may not be evicted are retained
+        regardless of the limits.
+
+        *size_of* may be a callable returning the approximate size in bytes of a
+        value. It is called each time the value is set. Defaults to
+        :func:`sys.getsizeof`.
+
+        """
+        super(BoundedMemoryCache, self).__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._is_evictable = is_evictable
+        self._size_of = size_of if size_of is not None else sys.getsizeof
+
+        self._cache = collections.OrderedDict()
+        self._sizes = {}
+        self._size = 0
+        self._evicted = weakref.WeakValueDictionary()
+
+        # Values found not evictable are set aside so that they are not checked
+        # again on each eviction. They still count towards the limits.
+        self._pinned = {}
+        self._lock = threading.RLock()
+        self.stats = {"evictions": 0, "revivals": 0, "skipped": 0}
+
+    def get(self, key):
+        """Return value for *key*.
+
+        Raise :exc:`KeyError` if *key* not found.
+
+        """
+        with self._lock:
+            try:
+                value = self._cache[key]
+
+            except KeyError:
+                value = self._pinned.get(key)
+                if value is None:
+                    # Raises KeyError if no longer referenced elsewhere.
+                    value = self._evicted.pop(key)
+                    self.stats["revivals"] += 1
+                    self.set(key, value)
+
+            else:
+                self._cache.move_to_end(key)
+
+            return value
+
+    def set(self, key, value):
+        """Set *value* for *key*."""
+        with self._lock:
+            self._discard(key)
+
+            size = self._size_of(value)
+            self._cache[key] = value
+            self._sizes[key] = size
+            self._size += size
+
+            self._evict()
+
+    def remove(self, key):
+        """Remove *key*.
+
+        Raise :exc:`KeyError` if *key* not found.
+
+        """
+        with self._lock:
+            if not self._discard(key):
+                raise KeyError(key)
+
+    def get_many(self, keys):
+        """Return mapping of *keys* to values for keys found."""
+        with self._lock:
+            return super(MemoryCache, self).get_many(keys)
+
+    def set_many(self, items):
+        """Set values for keys in *items* mapping.
+
+        Limits are only enforced once all values are set.
+
+        """
+        with self._lock:
+            for key, value in items.items():
+                self._discard(key)
+
+                size = self._size_of(value)
+                self._cache[key] = value
+                self._sizes[key] = size
+                self._size += size
+
+            self._evict()
+
+    def remove_many(self, keys):
+        """Remove *keys*, ignoring any not found."""
+        with self._lock:
+            for key in keys:
+                self._discard(key)
+
+    def clear(self, pattern=None):
+        """Remove all keys matching *pattern*.
+
+        *pattern* should be a regular expression string.
+
+        If *pattern* is None then all keys will be removed.
+
+        """
+        with self._lock:
+            if pattern is None:
+                self._cache.clear()
+                self._pinned.clear()
+                self._sizes.clear()
+                self._size = 0
+                self._evicted.clear()
+                return
+
+            expression = re.compile(pattern)
+            for key in (
+                list(self._cache.keys())
+                + list(self._pinned.keys())
+                + list(self._evicted.keys())
+            ):
+                if expression.search(key):
+                    self._discard(key)
+
+    def _discard(self, key):
+        """Remove *key* if present and return whether it was."""
+        found = self._evicted.pop(key, None) is not None
+
+        if key in self._cache:
+            del self._cache[key]
+            self._size -= self._sizes.pop(key)
+            found = True
+
+        elif key in self._pinned:
+            del self._pinned[key]
+            self._size -= self._sizes.pop(key)
+            found = True
+
+        return found
+
+    def keys(self):
+        """Return list of keys at this current time.
+
+        .. warning::
+
+            Actual keys may differ from those returned due to timing of access.
+
+        """
+        with self._lock:
+            return list(self._cache.keys()) + list(self._pinned.keys())
+
+    def release_pinned(self):
+        """Return values set aside as not evictable to eviction order.
+
+        Call once values may have become evictable again, such as after local
+        changes were committed. Released values are treated as most recently
+        used.
+
+        """
+        with self._lock:
+            pinned = self._pinned
+            self._pinned = {}
+            self._cache.update(pinned)
+            self._evict()
+
+    def _evict(self):
+        """Evict least recently used values until within limits."""
+        excess_entries = 0
+        if self.max_entries is not None:
+            excess_entries = len(self._cache) + len(self._pinned) - self.max_entries
+
+        excess_bytes = 0
+        if self.max_bytes is not None:
+            excess_bytes = self._size - self.max_bytes
+
+        while (excess_entries > 0 or excess_bytes > 0) and self._cache:
+            key, value = self._cache.popitem(last=False)
+
+            if self._is_evictable is not None and not self._is_evictable(value):
+                self._pinned[key] = value
+                self.stats["skipped"] += 1
+                continue
+
+            size = self._sizes.pop(key)
+            self._size -= size
+            excess_entries -= 1
+            excess_bytes -= size
+            try:
+                self._evicted[key] = value
+            except TypeError:
+                # Value cannot be weakly referenced so is simply dropped.
+                pass
+
+            self.stats["evictions"] += 1
+
+
+class NegativeCache(object):
+    """Record of keys known to have no matching value.
+
+    Each record expires after a time to live so that values created
+    elsewhere are eventually picked up again.
+
+    """
+
+    def __init__(self, ttl=60):
+        """Initialise cache with records expiring after *ttl* seconds."""
+        super(NegativeCache, self).__init__()
+        self.ttl = ttl
+        self._expiries = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "invalidations": 0,
+            "expirations": 0,
+        }
+
+    def __contains__(self, key):
+        """Return whether *key* is currently recorded as missing."""
+        expiry = self._expiries.get(key)
+        if expiry is None:
+            self.stats["misses"] += 1
+            return False
+
+        if expiry <= time.monotonic():
+            self._expiries.pop(key, None)
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            return False
+
+        self.stats["hits"] += 1
+        return True
+
+    def add(self, key):
+        """Record *key* as missing."""
+        self._expiries[key] = time.monotonic() + self.ttl
+        self.stats["stores"] += 1
+
+    def discard(self, key):
+        """Remove any record of *key* being missing."""
+        if self._expiries.pop(key, None) is not None:
+            self.stats["invalidations"] += 1
+
+    def clear(self):
+        """Remove all records."""
+        self._expiries.clear()
+
+
+class CacheStatistics(object):
+    """Record effectiveness of the layers of a :class:`LayeredCache`.
+
+    Hits, misses, back-fills and time spent are counted per layer and, where
+    a *categorise* callable is given, per category of key such as entity type.
+    The most frequently retrieved and missed keys are also tracked.
+
+    """
+
+    def __init__(self, categorise=None, max_tracked_keys=10000):
+        """Initialise statistics.
+
+        *categorise* may be a callable returning a category name for a key or
+        None if the key has no category.
+
+        *max_tracked_keys* limits the number of distinct keys counted for hot
+        and missed key reports. When exceeded, the least frequent half are
+        forgotten.
+
+        """
+        super(CacheStatistics, self).__init__()
+        self.categorise = categorise
+        self.max_tracked_keys = max_tracked_keys
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset all counters."""
+        with self._lock:
+            self._layers = collections.defaultdict(self._new_counters)
+            self._categories = collections.defaultdict(
+                lambda: collections.defaultdict(
+                    lambda: {"hits": 0, "misses": 0, "backfills": 0}
+                )
+            )
+            self._hot_keys = collections.Counter()
+            self._missed_keys = collections.Counter()
+
+    def _new_counters(self):
+        """Return new counters for a layer."""
+        return {"hits": 0, "misses": 0, "backfills": 0, "seconds": 0.0}
+
+    def record_lookup(self, layer, hits, misses, seconds):
+        """Record lookup of keys against *layer* taking *seconds*.
+
+        *hits* and *misses* are lists of keys found and not found in the layer
+        respectively.
+
+        """
+        with self._lock:
+            counters = self._layers[layer]
+            counters["hits"] += len(hits)
+            counters["misses"] += len(misses)
+            counters["seconds"] += seconds
+
+            if self.categorise is not None:
+                categories = self._categories[layer]
+                for name, keys in (("hits", hits), ("misses", misses)):
+                    for key in keys:
+                        categories[self.categorise(key)][name] += 1
+
+            self._hot_keys.update(hits)
+            self._trim(self._hot_keys)
+
+    def record_backfill(self, layer, keys):
+        """Record setting of *keys* in *layer* after being found deeper."""
+        with self._lock:
+            self._layers[layer]["backfills"] += len(keys)
+            if self.categorise is not None:
+                categories = self._categories[layer]
+                for key in keys:
+                    categories[self.categorise(key)]["backfills"] += 1
+
+    def record_missing(self, keys):
+        """Record *keys* not found in any layer."""
+        with self._lock:
+            self._missed_keys.update(keys)
+            self._trim(self._missed_keys)
+
+    def _trim(self, counter):
+        """Forget least frequent keys in *counter* beyond tracked limit."""
+        if len(counter) > self.max_tracked_keys:
+            retained = counter.most_common(self.max_tracked_keys // 2)
+            counter.clear()
+            counter.update(dict(retained))
+
+    def report(self, names=None, top=10):
+        """Return mapping of recorded statistics.
+
+        *names* may be a list of names for the layers, by index. *top* limits
+        the number of hot and missed keys reported.
+
+        """
+        with self._lock:
+            layers = []
+            for layer in sorted(self._layers):
+                counters = dict(self._layers[layer])
+                lookups = counters["hits"] + counters["misses"]
+                counters["hit_rate"] = (
+                    float(counters["hits"]) / lookups if lookups else None
+                )
+                counters["name"] = names[layer] if names is not None else str(layer)
+                counters["categories"] = dict(
+                    (category, dict(values))
+                    for category, values in self._categories[layer].items()
+                )
+                layers.append(counters)
+
+            return {
+                "layers": layers,
+                "hot_keys": self._hot_keys.most_common(top),
+                "missed_keys": self._missed_keys.most_common(top),
+            }
+
+
+class FileCache(Cache):
+    """File based cache that uses :mod:`anydbm` module.
+
+    .. note::
+
+        No locking of the underlying file is performed.
+
+    """
+
+    def __init__(self, path):
+        """Initialise cache at *path*."""
+        self.path = path
+
+        # Initialise cache.
+        cache = anydbm.open(self.path, "c")
+        cache.close()
+
+        super(FileCache, self).__init__()
+
+    @contextlib.contextmanager
+    def _database(self):
+        """Yield opened database file."""
+        cache = anydbm.open(self.path, "w")
+        try:
+            yield cache
+        finally:
+            cache.close()
+
+    def get(self, key):
+        """Return value for *key*.
+
+        Raise :exc:`KeyError` if *key* not found.
+
+        """
+        with self._database() as cache:
+            return cache[key.encode("ascii")].decode("utf-8")
+
+    def set(self, key, value):
+        """Set *value* for *key*."""
+        with self._database() as cache:
+            cache[key.encode("ascii")] = value
+
+    def remove(self, key):
+        """Remove *key*.
+
+        Raise :exc:`KeyError` if *key* not found.
+
+        """
+        with self._database() as cache:
+            del cache[key.encode("ascii")]
+
+    def get_many(self, keys):
+        """Return mapping of *keys* to values for keys found.
+
+        The database file is opened once for all keys.
+
+        """
+        values = {}
+        with self._database() as cache:
+            for key in keys:
+                try:
+                    values[key] = cache[key.encode("ascii")].decode("utf-8")
+                except KeyError:
+                    continue
+
+        return values
+
+    def set_many(self, items):
+        """Set values for keys in *items* mapping.
+
+        The database file is opened once for all keys.
+
+        """
+        with self._database() as cache:
+            for key, value in items.items():
+                cache[key.encode("ascii")] = value
+
+    def remove_many(self, keys):
+        """Remove *keys*, ignoring any not found.
+
+        The database file is opened once for all keys.
+
+        """
+        with self._database() as cache:
+            for key in keys:
+                try:
+                    del cache[key.encode("ascii")]
+                except KeyError:
+                    continue
+
+    def keys(self):
+        """Return list of keys at this current time.
+
+        .. warning::
+
+            Actual keys may differ from those returned due to timing of access.
+
+        """
+        with self._database() as cache:
+            return [s.decode("utf-8") for s in cache.keys()]
+            # return list(map(str, cache.keys()))
+
+
+class SqliteCache(Cache):
+    """File based cache using an SQLite database.
+
+    A single connection is kept open per process and the database uses
+    write-ahead logging so that several processes can share the same cache
+    file, waiting up to *timeout* seconds for locks held by others.
+
+    Values should be strings or bytes, such as those produced by a
+    :class:`SerialisedCache`.
+
+    """
+
+    #: Maximum number of keys bound to a single statement.
+    _batch_size = 500
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS cache ("
+        "key TEXT PRIMARY KEY, value BLOB, size INTEGER NOT NULL, "
+        "stored REAL NOT NULL, expires REAL)",
+        "CREATE INDEX IF NOT EXISTS cache_stored ON cache (stored)",
+        "CREATE TABLE IF NOT EXISTS cache_size (total INTEGER NOT NULL)",
+        "INSERT INTO cache_size (total) SELECT 0 "
+        "WHERE NOT EXISTS (SELECT 1 FROM cache_size)",
+        "CREATE TRIGGER IF NOT EXISTS cache_insert AFTER INSERT ON cache "
+        "BEGIN UPDATE cache_size SET total = total + NEW.size; END",
+        "CREATE TRIGGER IF NOT EXISTS cache_delete AFTER DELETE ON cache "
+        "BEGIN UPDATE cache_size SET total = total - OLD.size; END",
+        "CREATE TRIGGER IF NOT EXISTS cache_update AFTER UPDATE ON cache "
+        "BEGIN UPDATE cache_size SET total = total - OLD.size + NEW.size; END",
+        # Correct any total left inaccurate by earlier versions.
+        "UPDATE cache_size SET total = (SELECT COALESCE(SUM(size), 0) FROM cache)",
+    )
+
+    def __init__(self, path, ttl=None, max_bytes=None, timeout=30):
+        """Initialise cache at *path*.
+
+        *ttl* is the default number of seconds after which a value expires. If
+        None then values do not expire unless a *ttl* is passed when setting
+        them.
+
+        *max_bytes* limits the total size of stored values. When exceeded, the
+        least recently set values are evicted.
+
+        *timeout* is the number of seconds to wait for a lock held by another
+        connection before failing.
+
+        """
+        super(SqliteCache, self).__init__()
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+
+        self._lock = threading.RLock()
+        self._connection = None
+        self._pid = None
+
+        # Initialise cache.
+        self._connect()
+
+    def _connect(self):
+        """Return connection to database, opening it if required."""
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+
+        # Connections cannot be shared with forked processes.
+        connection = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("BEGIN IMMEDIATE")
+        for statement in self._SCHEMA:
+            connection.execute(statement)
+        connection.execute("COMMIT")
+
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Yield connection within a write transaction."""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            else:
+                connection.execute("COMMIT")
+
+    def close(self):
+        """Close connection to database.
+
+        The connection is reopened on next access.
+
+        """
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+
+            self._connection = None
+
+    def get(self, key):
+        """Return value for *key*.
+
+        Raise :exc:`KeyError` if *key* not found.
+
+        """
+        values = self.get_many([key])
+        if key not in values:
+            raise KeyError(key)
+
+        return values[key]
+
+    def get_many(self, keys):
+        """Return mapping of *keys* to values for keys found."""
+        keys = list(keys)
+        values = {}
+        now = time.time()
+
+        with self._lock:
+            connection = self._connect()
+            for index in range(0, len(keys), self._batch_size):
+                batch = keys[index : index + self._batch_size]
+                rows = connection.execute(
+                    "SELECT key, value FROM cache WHERE key IN ({0}) "
+                    "AND (expires IS NULL OR expires > ?)".format(
+                        ", ".join("?" * len(batch))
+                    ),
+                    batch + [now],
+                )
+                values.update(rows)
+
+        return values
+
+    def set(self, key, value, ttl=None):
+        """Set *value* for *key*.
+
+        *ttl* overrides the default number of seconds before the value expires.
+
+        """
+        self.set_many({key: value}, ttl=ttl)
+
+    def set_many(self, items, ttl=None):
+        """Set values for keys in *items* mapping within a single transaction.
+
+        *ttl* overrides the default number of seconds before the values expire.
+
+        """
+        if ttl is None:
+            ttl = self.ttl
+
+        now = time.time()
+        expires = now + ttl if ttl is not None else None
+
+        with self._transaction() as connection:
+            connection.executemany(
+                # An upsert fires the update trigger when overwriting, unlike
+                # a replace which deletes without firing the delete trigger.
+                "INSERT INTO cache (key, value, size, stored, expires) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, "
+                "size = excluded.size, stored = excluded.stored, "
+                "expires = excluded.expires",
+                [
+                    (key, value, len(value), now, expires)
+                    for key, value in items.items()
+                ],
+            )
+
+            if self.max_bytes is not None:
+                self._evict(connection, now)
+
+    def _evict(self, connection, now):
+        """Evict expired and then least recently set values beyond size limit."""
+        (total,) = connection.execute("SELECT total FROM cache_size").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        connection.execute(
+            "DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?", (now,)
+        )
+
+        (total,) = connection.execute("SELECT total FROM cache_size").fetchone()
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+
+        victims = []
+        for key, size in connection.execute(
+            "SELECT key, size FROM cache ORDER BY stored"
+        ):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+
+        connection.executemany("DELETE FROM cache WHERE key = ?", victims)
+
+    def remove(self, key):
+        """Remove *key*.
+
+        Raise :exc:`KeyError` if *key* not found.
+
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "DELETE FROM cache WHERE key = ? "
+                "AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            )
+
+        if not cursor.rowcount:
+            raise KeyError(key)
+
+    def remove_many(self, keys):
+        """Remove *keys* in a single transaction, ignoring any not found."""
+        with self._transaction() as connection:
+            connection.executemany(
+                "DELETE FROM cache WHERE key = ?", [(key,) for key in keys]
+            )
+
+    def keys(self):
+        """Return list of keys at this current time.
+
+        .. warning::
+
+            Actual keys may differ from those returned due to timing of access.
+
+        """
+        with self._lock:
+            connection = self._connect()
+            return [
+                key
+                for (key,) in connection.execute(
+                    "SELECT key FROM cache WHERE expires IS NULL OR expires > ?",
+                    (time.time(),),
+                )
+            ]
+
+    def clear(self, pattern=None):
+        """Remove all keys matching *pattern*.
+
+        *pattern* should be a regular expression string.
+
+        If *pattern* is None then all keys will be removed.
+
+        """
+        if pattern is not None:
+            super(SqliteCache, self).clear(pattern=pattern)
+            return
+
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM cache")
+
+
+class MappedFileCache(Cache):
+    """Cache shared between processes through a memory-mapped file.
+
+    Values are stored in a fixed size file, ideally on a memory backed
+    filesystem such as ``/dev/shm``, that every process on a host maps into
+    memory. Reads do not take any lock. Instead each entry carries a version
+    that is checked before and after reading so that concurrent writes are
+    detected and the read retried. Writes are serialised with a file lock.
+
+    New values are appended to the data region of the file. Once the data
+    region or the entry table is full, the cache is emptied and filled again.
+
+    Values should be strings or bytes, such as those produced by a
+    :class:`SerialisedCache`.
+
+    .. note::
+
+        File locking is only available on platforms providing :mod:`fcntl`.
+        Elsewhere, writes are only serialised within the current process.
+
+    """
+
+    _MAGIC = b"FTCACHE1"
+
+    #: Header of magic, generation, entry slot count, file size and data tail.
+    _HEADER = struct.Struct("<8sQQQQ")
+
+    #: Entry slot of version, key hash, data offset, key length and value
+    #: length.
+    _SLOT = struct.Struct("<QQQII")
+
+    #: Number of times a read is retried whilst a write is in progress.
+    _read_attempts = 100
+
+    #: Number of slots searched for a key before the table is considered full.
+    _max_probes = 64
+
+    def __init__(self, path, size=64 * 1024 * 1024, slots=65536):
+        """Initialise cache backed by file at *path*.
+
+        If the file does not exist, create it with a total *size* in bytes and
+        room for *slots* entries. Otherwise, use the layout of the existing
+        file.
+
+        """
+        super(MappedFileCache, self).__init__()
+        self.path = path
+        self._requested_size = size
+        self._requested_slots = slots
+
+        self._lock = threading.RLock()
+        self._file = None
+        self._map = None
+        self._pid = None
+
+        # Initialise cache.
+        self._open()
+
+    def _open(self):
+        """Return mapped file, opening it if required."""
+        if self._map is not None and self._pid == os.getpid():
+            return self._map
+
+        # File locks are shared with forked processes so reopen the file.
+        descriptor = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        file_object = os.fdopen(descriptor, "r+b")
+
+        with self._locked(file_object):
+            file_object.seek(0, os.SEEK_END)
+            if file_object.tell() == 0:
+                data_start = self._HEADER.size + self._SLOT.size * self._requested_slots
+                if self._requested_size <= data_start:
+                    file_object.close()
+                    raise ValueError(
+                        "Size {0} too small to hold {1} slots.".format(
+                            self._requested_size, self._requested_slots
+                        )
+                    )
+
+                file_object.truncate(self._requested_size)
+                file_object.seek(0)
+                file_object.write(
+                    self._HEADER.pack(
+                        self._MAGIC,
+                        0,
+                        self._requested_slots,
+                        self._requested_size,
+                        data_start,
+                    )
+                )
+                file_object.flush()
+
+            file_object.seek(0)
+            magic, _, slot_count, size, _ = self._HEADER.unpack(
+                file_object.read(self._HEADER.size)
+            )
+
+        if magic != self._MAGIC:
+            file_object.close()
+            raise ValueError("{0!r} is not a mapped file cache.".format(self.path))
+
+        self._slot_count = slot_count
+        self._size = size
+        self._data_start = self._HEADER.size + self._SLOT.size * slot_count
+        self._map = mmap.mmap(file_object.fileno(), size)
+        self._file = file_object
+        self._pid = os.getpid()
+        return self._map
+
+    def close(self):
+        """Close mapped file.
+
+        The file is reopened on next access.
+
+        """
+        with self._lock:
+            if self._map is not None and self._pid == os.getpid():
+                self._map.close()
+                self._file.close()
+
+            self._map = None
+            self._file = None
+
+    @contextlib.contextmanager
+    def _locked(self, file_object):
+        """Hold exclusive lock on *file_object* across processes."""
+        if fcntl is None:
+            yield
+            return
+
+        fcntl.flock(file_object.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file_object.fileno(), fcntl.LOCK_UN)
+
+    @contextlib.contextmanager
+    def _writing(self):
+        """Yield mapped file whilst holding exclusive write lock."""
+        with self._lock:
+            mapped = self._open()
+            with self._locked(self._file):
+                yield mapped
+
+    def _hash(self, key):
+        """Return non-zero hash of encoded *key* stable across processes."""
+        digest = hashlib.blake2b(key, digest_size=8).digest()
+        return struct.unpack("<Q", digest)[0] | 1
+
+    def _slot_offset(self, index):
+        """Return file offset of slot at *index*."""
+        return self._HEADER.size + self._SLOT.size * index
+
+    def _generation(self, mapped):
+        """Return current generation of *mapped* file."""
+        return struct.unpack_from("<Q", mapped, 8)[0]
+
+    def _probe(self, key_hash):
+        """Yield slot indexes in probing order for *key_hash*."""
+        start = key_hash % self._slot_count
+        for step in range(min(self._max_probes, self._slot_count)):
+            yield (start + step) % self._slot_count
+
+    def get(self, key):
+        """Return value for *key*.
+
+        Raise :exc:`KeyError` if *key* not found.
+
+        """
+        encoded_key = key.encode("utf-8")
+        key_hash = self._hash(encoded_key)
+
+        # Hold lock whilst reading so the mapping cannot be closed underneath.
+        with self._lock:
+            mapped = self._open()
+
+            for _ in range(self._read_attempts):
+                generation = self._generation(mapped)
+                if generation % 2:
+                    continue
+
+                result = self._read(mapped, encoded_key, key_hash)
+                if result is None or self._generation(mapped) != generation:
+                    # Concurrent write detected.
+                    continue
+
+                found, value = result
+                if not found:
+                    break
+
+                return value
+
+        raise KeyError(key)
+
+    def _read(self, mapped, encoded_key, key_hash):
+        """Return (found, value) for *encoded_key* or None if changed whilst read."""
+        for index in self._probe(key_hash):
+            slot_offset = self._slot_offset(index)
+            (
+                version,
+                slot_hash,
+                offset,
+                key_length,
+                value_length,
+            ) = self._SLOT.unpack_from(mapped, slot_offset)
+            if version % 2:
+                return None
+
+            if not slot_hash:
+                # Empty slot terminates probing.
+                return False, None
+
+            if not offset or slot_hash != key_hash:
+                continue
+
+            end = offset + 1 + key_length + value_length
+            if end > self._size:
+                return None
+
+            record = mapped[offset:end]
+            if struct.unpack_from("<Q", mapped, slot_offset)[0] != version:
+                return None
+
+            if record[1 : 1 + key_length] != encoded_key:
+                continue
+
+            value = record[1 + key_length :]
+            if record[0:1] == b"s":
+                value = value.decode("utf-8")
+
+            return True, value
+
+        return False, None
+
+    def set(self, key, value):
+        """Set *value* for *key*.
+
+        Values larger than the data region of the file are not stored.
+
+        """
+        encoded_key = key.encode("utf-8")
+        key_hash = self._hash(encoded_key)
+
+        if isinstance(value, str):
+            record = b"s" + encoded_key + value.encode("utf-8")
+        else:
+            record = b"b" + encoded_key + bytes(value)
+
+        value_length = len(record) - 1 - len(encoded_key)
+
+        with self._writing() as mapped:
+            if len(record) > self._size - self._data_start:
+                return
+
+            for _ in range(2):
+                tail = struct.unpack_from("<Q", mapped, 32)[0]
+                index = self._find_slot(mapped, encoded_key, key_hash)
+                if index is not None and tail + len(record) <= self._size:
+                    break
+
+                self._reset(mapped)
+
+            mapped[tail : tail + len(record)] = record
+            struct.pack_into("<Q", mapped, 32, tail + len(record))
+            self._write_slot(
+                mapped, index, key_hash, tail, len(encoded_key), value_length
+            )
+
+    def _find_slot(self, mapped, encoded_key, key_hash):
+        """Return index of slot to store *encoded_key* in or None if full."""
+        available = None
+        for index in self._probe(key_hash):
+            _, slot_hash, offset, key_length, _ = self._SLOT.unpack_from(
+                mapped, self._slot_offset(index)
+            )
+            if not slot_hash:
+                return index if available is None else available
+
+            if not offset:
+                if available is None:
+                    available = index
+                continue
 
-    Derive from this to define concrete cache implementations. A cache is
-    centered around the concept of key:value pairings where the key is unique
-    across the cache.
+            if (
+                slot_hash == key_hash
+                and mapped[offset + 1 : offset + 1 + key_length] == encoded_key
+            ):
+                return index
 
-    """
+        return available
 
-    @abc.abstractmethod
-    def get(self, key):
-        """Return value for *key*.
+    def _write_slot(self, mapped, index, key_hash, offset, key_length, value_length):
+        """Write slot at *index* marking it as changing whilst written."""
+        slot_offset = self._slot_offset(index)
+        version = struct.unpack_from("<Q", mapped, slot_offset)[0]
 
-        Raise :exc:`KeyError` if *key* not found.
+        struct.pack_into("<Q", mapped, slot_offset, version + 1)
+        self._SLOT.pack_into(
+            mapped, slot_offset, version + 1, key_hash, offset, key_length, value_length
+        )
+        struct.pack_into("<Q", mapped, slot_offset, version + 2)
 
-        """
+    def _reset(self, mapped):
+        """Remove all entries whilst marking the file as changing."""
+        generation = self._generation(mapped)
+        struct.pack_into("<Q", mapped, 8, generation + 1)
 
-    @abc.abstractmethod
-    def set(self, key, value):
-        """Set *value* for *key*."""
+        mapped[self._HEADER.size : self._data_start] = bytes(
+            self._data_start - self._HEADER.size
+        )
+        struct.pack_into("<Q", mapped, 32, self._data_start)
+
+        struct.pack_into("<Q", mapped, 8, generation + 2)
 
-    @abc.abstractmethod
     def remove(self, key):
-        """Remove *key* and return stored value.
+        """Remove *key*.
 
         Raise :exc:`KeyError` if *key* not found.
 
         """
+        encoded_key = key.encode("utf-8")
+        key_hash = self._hash(encoded_key)
+
+        with self._writing() as mapped:
+            for index in self._probe(key_hash):
+                _, slot_hash, offset, key_length, _ = self._SLOT.unpack_from(
+                    mapped, self._slot_offset(index)
+                )
+                if not slot_hash:
+                    break
+
+                if (
+                    offset
+                    and slot_hash == key_hash
+                    and mapped[offset + 1 : offset + 1 + key_length] == encoded_key
+                ):
+                    # Leave key hash in place so probing continues past it.
+                    self._write_slot(mapped, index, key_hash, 0, 0, 0)
+                    return
+
+        raise KeyError(key)
 
     def keys(self):
         """Return list of keys at this current time.
@@ -70,20 +1540,18 @@ class Cache(metaclass=abc.ABCMeta):
             Actual keys may differ from those returned due to timing of access.
 
         """
-        raise NotImplementedError()  # pragma: no cover
-
-    def values(self):
-        """Return values for current keys."""
-        values = []
-        for key in list(self.keys()):
-            try:
-                value = self.get(key)
-            except KeyError:
-                continue
-            else:
-                values.append(value)
+        with self._writing() as mapped:
+            keys = []
+            for index in range(self._slot_count):
+                _, _, offset, key_length, _ = self._SLOT.unpack_from(
+                    mapped, self._slot_offset(index)
+                )
+                if offset:
+                    keys.append(
+                        mapped[offset + 1 : offset + 1 + key_length].decode("utf-8")
+                    )
 
-        return values
+            return keys
 
     def clear(self, pattern=None):
         """Remove all keys matching *pattern*.
@@ -93,217 +1561,324 @@ class Cache(metaclass=abc.ABCMeta):
         If *pattern* is None then all keys will be removed.
 
         """
-
         if pattern is not None:
-            pattern = re.compile(pattern)
-
-        for key in list(self.keys()):
-            if pattern is not None:
-                if not pattern.search(key):
-                    continue
-
-            try:
-                self.remove(key)
-            except KeyError:
-                pass
-
+            super(MappedFileCache, self).clear(pattern=pattern)
+            return
 
-class ProxyCache(Cache):
-    """Proxy another cache."""
+        with self._writing() as mapped:
+            self._reset(mapped)
 
-    def __init__(self, proxied):
-        """Initialise cache with *proxied* cache instance."""
-        self.proxied = proxied
-        super(ProxyCache, self).__init__()
 
-    def get(self, key):
-        """Return value for *key*.
+class RedisCache(Cache):
+    """Network cache speaking the Redis protocol.
 
-        Raise :exc:`KeyError` if *key* not found.
+    Suitable for sharing read mostly values, such as serialised entities from a
+    :class:`SerialisedCache`, between many sessions on different hosts.
 
-        """
-        return self.proxied.get(key)
+    Several keys are retrieved or set with a single round trip using
+    pipelining. Writes do not wait for a reply, with outstanding replies read
+    before the next command that needs one.
 
-    def set(self, key, value):
-        """Set *value* for *key*."""
-        return self.proxied.set(key, value)
+    Connection and server errors are logged and treated as cache misses so
+    that an unavailable server degrades performance rather than failing the
+    session. After a failure no reconnection is attempted for *retry_delay*
+    seconds.
 
-    def remove(self, key):
-        """Remove *key* and return stored value.
+    """
 
-        Raise :exc:`KeyError` if *key* not found.
+    def __init__(
+        self,
+        host="localhost",
+        port=6379,
+        namespace="",
+        ttl=None,
+        db=0,
+        password=None,
+        timeout=5,
+        retry_delay=1,
+    ):
+        """Initialise cache connecting to server at *host* and *port*.
+
+        *namespace* is prefixed to every key so that several caches can share
+        a server. It may also be a callable returning the namespace, called on
+        first access. See :func:`session_namespace` for namespacing by server
+        and schemas.
+
+        *ttl* is the default number of seconds after which a value expires. If
+        None then values do not expire unless a *ttl* is passed when setting
+        them.
+
+        *db* and *password* select the database and authenticate the
+        connection respectively. *timeout* is the number of seconds to wait on
+        the network. *retry_delay* is the number of seconds to wait before
+        reconnecting after a failure.
 
         """
-        return self.proxied.remove(key)
-
-    def keys(self):
-        """Return list of keys at this current time.
-
-        .. warning::
-
-            Actual keys may differ from those returned due to timing of access.
+        super(RedisCache, self).__init__()
+        self.logger = logging.getLogger(__name__ + "." + self.__class__.__name__)
+        self.host = host
+        self.port = port
+        self.ttl = ttl
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+
+        self._namespace = namespace
+        self._lock = threading.RLock()
+        self._socket = None
+        self._reader = None
+        self._pid = None
+        self._pending_replies = 0
+        self._retry_at = 0
+
+    @property
+    def namespace(self):
+        """Return prefix applied to keys."""
+        if callable(self._namespace):
+            self._namespace = self._namespace()
+
+        return self._namespace
+
+    def _connect(self):
+        """Return connected socket, connecting if required."""
+        if self._socket is not None and self._pid == os.getpid():
+            return self._socket
+
+        # Sockets cannot be shared with forked processes.
+        connection = socket.create_connection(
+            (self.host, self.port), timeout=self.timeout
+        )
+        self._socket = connection
+        self._reader = connection.makefile("rb")
+        self._pid = os.getpid()
+        self._pending_replies = 0
+
+        commands = []
+        if self.password is not None:
+            commands.append(("AUTH", self.password))
+
+        if self.db:
+            commands.append(("SELECT", self.db))
+
+        if commands:
+            self._execute(commands)
+
+        return connection
+
+    def close(self):
+        """Close connection to server.
+
+        The connection is reopened on next access.
 
         """
-        return list(self.proxied.keys())
-
+        with self._lock:
+            if self._socket is not None and self._pid == os.getpid():
+                try:
+                    self._drain()
+                except (OSError, ftrack_api.exception.RedisError):
+                    pass
+
+            self._disconnect()
+
+    def _disconnect(self):
+        """Close and forget any connection to server."""
+        # Leave connections inherited from a parent process open for it.
+        if self._socket is not None and self._pid == os.getpid():
+            for stream in (self._reader, self._socket):
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+
+        self._socket = None
+        self._reader = None
+        self._pending_replies = 0
+
+    def _encode_command(self, command):
+        """Return *command* encoded for sending."""
+        parts = [b"*" + str(len(command)).encode("ascii") + b"\r\n"]
+        for argument in command:
+            if isinstance(argument, str):
+                argument = argument.encode("utf-8")
+            elif isinstance(argument, int):
+                argument = str(argument).encode("ascii")
+
+            parts.append(b"$" + str(len(argument)).encode("ascii") + b"\r\n")
+            parts.append(argument)
+            parts.append(b"\r\n")
+
+        return b"".join(parts)
+
+    def _read_reply(self):
+        """Return next reply from server.
+
+        Raise :exc:`~ftrack_api.exception.RedisError` if the server replied
+        with an error.
 
-class LayeredCache(Cache):
-    """Layered cache."""
-
-    def __init__(self, caches):
-        """Initialise cache with *caches*."""
-        super(LayeredCache, self).__init__()
-        self.caches = caches
+        """
+        line = self._reader.readline()
+        if not line:
+            raise OSError("Connection closed by server.")
 
-    def get(self, key):
-        """Return value for *key*.
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload
 
-        Raise :exc:`KeyError` if *key* not found.
+        if prefix == b"-":
+            raise ftrack_api.exception.RedisError(payload.decode("utf-8", "replace"))
 
-        Attempt to retrieve from cache layers in turn, starting with shallowest.
-        If value retrieved, then also set the value in each higher level cache
-        up from where retrieved.
+        if prefix == b":":
+            return int(payload)
 
-        """
-        target_caches = []
-        value = ftrack_api.symbol.NOT_SET
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
 
-        for cache in self.caches:
-            try:
-                value = cache.get(key)
-            except KeyError:
-                target_caches.append(cache)
-                continue
-            else:
-                break
+            data = self._reader.read(length + 2)
+            return data[:-2]
 
-        if value is ftrack_api.symbol.NOT_SET:
-            raise KeyError(key)
+        if prefix == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
 
-        # Set value on all higher level caches.
-        for cache in target_caches:
-            cache.set(key, value)
+            return [self._read_reply() for _ in range(length)]
 
-        return value
+        raise ftrack_api.exception.RedisError("Unexpected reply {0!r}.".format(line))
 
-    def set(self, key, value):
-        """Set *value* for *key*."""
-        for cache in self.caches:
-            cache.set(key, value)
+    def _drain(self):
+        """Read and discard replies to commands sent without waiting."""
+        while self._pending_replies:
+            self._pending_replies -= 1
+            try:
+                self._read_reply()
+            except ftrack_api.exception.RedisError as error:
+                self.logger.warning("Cache write failed: {0}".format(error))
 
-    def remove(self, key):
-        """Remove *key*.
+    def _execute(self, commands, wait=True):
+        """Send *commands* in a single pipeline and return replies.
 
-        Raise :exc:`KeyError` if *key* not found in any layer.
+        If *wait* is False, do not wait for replies and return None.
 
         """
-        removed = False
-        for cache in self.caches:
-            try:
-                cache.remove(key)
-            except KeyError:
-                pass
-            else:
-                removed = True
+        connection = self._connect()
+        connection.sendall(
+            b"".join(self._encode_command(command) for command in commands)
+        )
 
-        if not removed:
-            raise KeyError(key)
+        if not wait:
+            self._pending_replies += len(commands)
+            return None
 
-    def keys(self):
-        """Return list of keys at this current time.
+        self._drain()
+        return [self._read_reply() for _ in commands]
 
-        .. warning::
+    def _call(self, commands, wait=True):
+        """Execute *commands* returning replies or None on failure.
 
-            Actual keys may differ from those returned due to timing of access.
+        On failure the connection is closed and no reconnection is attempted
+        until :attr:`retry_delay` seconds have passed.
 
         """
-        keys = []
-        for cache in self.caches:
-            keys.extend(list(cache.keys()))
-
-        return list(set(keys))
+        with self._lock:
+            if self._socket is None and time.monotonic() < self._retry_at:
+                return None
 
+            try:
+                return self._execute(commands, wait=wait)
+            except (OSError, ftrack_api.exception.RedisError) as error:
+                self.logger.warning(
+                    "Cache server {0}:{1} unavailable: {2}".format(
+                        self.host, self.port, error
+                    )
+                )
+                self._disconnect()
+                self._retry_at = time.monotonic() + self.retry_delay
+                return None
 
-class MemoryCache(Cache):
-    """Memory based cache."""
-
-    def __init__(self):
-        """Initialise cache."""
-        self._cache = {}
-        super(MemoryCache, self).__init__()
+    def _key(self, key):
+        """Return namespaced server key for *key*."""
+        return self.namespace + key
 
-    def get(self, key):
-        """Return value for *key*.
+    def _encode_value(self, value):
+        """Return *value* as bytes retaining whether it was a string."""
+        if isinstance(value, str):
+            return b"s" + value.encode("utf-8")
 
-        Raise :exc:`KeyError` if *key* not found.
+        return b"b" + bytes(value)
 
-        """
-        return self._cache[key]
+    def _decode_value(self, data):
+        """Return value from *data* encoded with :meth:`_encode_value`."""
+        if data[:1] == b"s":
+            return data[1:].decode("utf-8")
 
-    def set(self, key, value):
-        """Set *value* for *key*."""
-        self._cache[key] = value
+        return data[1:]
 
-    def remove(self, key):
-        """Remove *key*.
+    def get(self, key):
+        """Return value for *key*.
 
         Raise :exc:`KeyError` if *key* not found.
 
         """
-        del self._cache[key]
+        values = self.get_many([key])
+        if key not in values:
+            raise KeyError(key)
 
-    def keys(self):
-        """Return list of keys at this current time.
+        return values[key]
 
-        .. warning::
+    def get_many(self, keys):
+        """Return mapping of *keys* to values for keys found.
 
-            Actual keys may differ from those returned due to timing of access.
+        All keys are retrieved with a single round trip.
 
         """
-        return list(self._cache.keys())
+        keys = list(keys)
+        if not keys:
+            return {}
 
+        replies = self._call([["MGET"] + [self._key(key) for key in keys]])
+        if replies is None:
+            return {}
 
-class FileCache(Cache):
-    """File based cache that uses :mod:`anydbm` module.
-
-    .. note::
+        (replies,) = replies
+        return dict(
+            (key, self._decode_value(reply))
+            for key, reply in zip(keys, replies)
+            if reply is not None
+        )
 
-        No locking of the underlying file is performed.
+    def set(self, key, value, ttl=None):
+        """Set *value* for *key* without waiting for confirmation.
 
-    """
+        *ttl* overrides the default number of seconds before the value expires.
 
-    def __init__(self, path):
-        """Initialise cache at *path*."""
-        self.path = path
+        """
+        self.set_many({key: value}, ttl=ttl)
 
-        # Initialise cache.
-        cache = anydbm.open(self.path, "c")
-        cache.close()
+    def set_many(self, items, ttl=None):
+        """Set values for keys in *items* mapping without waiting.
 
-        super(FileCache, self).__init__()
+        All values are sent in a single pipeline. *ttl* overrides the default
+        number of seconds before the values expire.
 
-    @contextlib.contextmanager
-    def _database(self):
-        """Yield opened database file."""
-        cache = anydbm.open(self.path, "w")
-        try:
-            yield cache
-        finally:
-            cache.close()
+        """
+        if ttl is None:
+            ttl = self.ttl
 
-    def get(self, key):
-        """Return value for *key*.
+        commands = []
+        for key, value in items.items():
+            command = ["SET", self._key(key), self._encode_value(value)]
+            if ttl is not None:
+                command.extend(["PX", int(ttl * 1000)])
 
-        Raise :exc:`KeyError` if *key* not found.
+            commands.append(command)
 
-        """
-        with self._database() as cache:
-            return cache[key.encode("ascii")].decode("utf-8")
+        if not commands:
+            return
 
-    def set(self, key, value):
-        """Set *value* for *key*."""
-        with self._database() as cache:
-            cache[key.encode("ascii")] = value
+        self._call(commands, wait=False)
 
     def remove(self, key):
         """Remove *key*.
@@ -311,8 +1886,17 @@ class FileCache(Cache):
         Raise :exc:`KeyError` if *key* not found.
 
         """
-        with self._database() as cache:
-            del cache[key.encode("ascii")]
+        replies = self._call([["DEL", self._key(key)]])
+        if not replies or not replies[0]:
+            raise KeyError(key)
+
+    def remove_many(self, keys):
+        """Remove *keys* with a single command, ignoring any not found."""
+        keys = [self._key(key) for key in keys]
+        if not keys:
+            return
+
+        self._call([["DEL"] + keys])
 
     def keys(self):
         """Return list of keys at this current time.
@@ -322,9 +1906,36 @@ class FileCache(Cache):
             Actual keys may differ from those returned due to timing of access.
 
         """
-        with self._database() as cache:
-            return [s.decode("utf-8") for s in cache.keys()]
-            # return list(map(str, cache.keys()))
+        namespace = self.namespace.encode("utf-8")
+        pattern = re.sub(rb"([*?\[\]\\])", rb"\\\1", namespace) + b"*"
+
+        keys = []
+        cursor = b"0"
+        while True:
+            replies = self._call([["SCAN", cursor, "MATCH", pattern, "COUNT", 1000]])
+            if replies is None:
+                return []
+
+            ((cursor, batch),) = replies
+            keys.extend(key[len(namespace) :].decode("utf-8") for key in batch)
+            if cursor == b"0":
+                break
+
+        return list(set(keys))
+
+
+def session_namespace(session):
+    """Return callable giving a cache key namespace for *session*.
+
+    The namespace identifies the server and its schemas, so that sessions
+    connected to different servers, or after a schema change, never share
+    cached values. It is resolved lazily as schemas are not yet available when
+    a session constructs its cache.
+
+    """
+    return lambda: "ftrack:{0}:{1}:".format(
+        session.server_url, session.server_information.get("schema_hash", "")
+    )
 
 
 class SerialisedCache(ProxyCache):
@@ -359,6 +1970,32 @@ class SerialisedCache(ProxyCache):
 
         super(SerialisedCache, self).set(key, value)
 
+    def get_many(self, keys):
+        """Return mapping of *keys* to values for keys found.
+
+        Values that fail to decode with :exc:`KeyError` are omitted.
+
+        """
+        values = super(SerialisedCache, self).get_many(keys)
+        if not self.decode:
+            return values
+
+        decoded = {}
+        for key, value in values.items():
+            try:
+                decoded[key] = self.decode(value)
+            except KeyError:
+                continue
+
+        return decoded
+
+    def set_many(self, items):
+        """Set values for keys in *items* mapping."""
+        if self.encode:
+            items = dict((key, self.encode(value)) for key, value in items.items())
+
+        super(SerialisedCache, self).set_many(items)
+
 
 class KeyMaker(metaclass=abc.ABCMeta):
     """Generate unique keys."""
@@ -384,6 +2021,14 @@ class KeyMaker(metaclass=abc.ABCMeta):
 class StringKeyMaker(KeyMaker):
     """Generate string key."""
 
+    def key(self, *items):
+        """Return key for *items*."""
+        if len(items) == 1 and type(items[0]) is ftrack_api.inspection.Identity:
+            # Entity identities carry their precomputed string form.
+            return items[0].key
+
+        return super(StringKeyMaker, self).key(*items)
+
     def _key(self, obj):
         """Return key for *obj*."""
         return str(obj)
@@ -400,10 +2045,26 @@ class ObjectKeyMaker(KeyMaker):
         self.mapping_pair_separator = b"\2"
         self.iterable_identifier = b"\3"
         self.name_identifier = b"\4"
+        self.identity_identifier = b"\5"
 
     def _key(self, item):
         return self.__key(item)
 
+    def _is_identity(self, item):
+        """Return whether *item* is a plain tuple equal to an identity.
+
+        Such a tuple holds an entity type name and a list of primary key value
+        strings.
+
+        """
+        return (
+            type(item) is tuple
+            and len(item) == 2
+            and isinstance(item[0], str)
+            and type(item[1]) is list
+            and all(isinstance(value, str) for value in item[1])
+        )
+
     def __key(self, item):
         """Return key for *item*.
 
@@ -436,6 +2097,15 @@ class ObjectKeyMaker(KeyMaker):
 
         # TODO: Consider using a more robust and comprehensive solution such as
         # dill (https://github.com/uqfoundation/dill).
+        if isinstance(item, ftrack_api.inspection.Identity):
+            # Entity identities are unique by their precomputed string form so
+            # avoid pickling each part.
+            return self.identity_identifier + item.key.encode("utf-8")
+
+        if self._is_identity(item):
+            # Key equal plain tuples the same as identities.
+            return self.identity_identifier + str(item).encode("utf-8")
+
         if isinstance(item, collections.abc.Iterable):
             if isinstance(item, str):
                 return pickle.dumps(item, pickle_protocol)
@@ -525,6 +2195,7 @@ class Memoiser(object):
             self.key_maker = ObjectKeyMaker()
 
         self.return_copies = return_copies
+        self.stats = {"hits": 0, "misses": 0}
         super(Memoiser, self).__init__()
 
     def call(self, function, args=None, kw=None):
@@ -550,8 +2221,12 @@ class Memoiser(object):
             value = self.cache.get(key)
 
         except KeyError:
+            self.stats["misses"] += 1
             value = function(*args, **kw)
-            self.cache.set(key, value)
+            self._store(key, value, arguments)
+
+        else:
+            self.stats["hits"] += 1
 
         # If requested, deep copy value to return in order to avoid cached value
         # being inadvertently altered by the caller.
@@ -560,6 +2235,48 @@ class Memoiser(object):
 
         return value
 
+    def _store(self, key, value, arguments):
+        """Store *value* for call with *arguments* under *key*."""
+        self.cache.set(key, value)
+
+
+class SessionMemoiser(Memoiser):
+    """Memoise function calls once per session.
+
+    The session is taken from a *session* argument or the session of an
+    *entity* argument. Results are discarded once that session is reclaimed
+    so that a later session reusing its identifier never receives them.
+
+    """
+
+    def __init__(self, cache=None, key_maker=None, return_copies=False):
+        """Initialise with *cache* and *key_maker* to use.
+
+        See :class:`Memoiser` for the meaning of each argument.
+
+        """
+        super(SessionMemoiser, self).__init__(
+            cache=cache, key_maker=key_maker, return_copies=return_copies
+        )
+
+    def _store(self, key, value, arguments):
+        """Store *value* for call with *arguments* under *key*."""
+        super(SessionMemoiser, self)._store(key, value, arguments)
+
+        session = arguments.get("session")
+        if session is None and arguments.get("entity") is not None:
+            session = arguments["entity"].session
+
+        if session is not None:
+            weakref.finalize(session, self._discard, key)
+
+    def _discard(self, key):
+        """Remove memoised result stored under *key*."""
+        try:
+            self.cache.remove(key)
+        except KeyError:
+            pass
+
 
 def memoise_decorator(memoiser):
     """Decorator to memoise function calls using *memoiser*."""
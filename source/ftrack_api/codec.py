@@ -0,0 +1,161 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2024 ftrack
+
+"""Binary serialisation of entities for persistent cache layers.
+
+A :class:`BinaryEntityCodec` is a faster alternative to the JSON based
+:meth:`Session.encode<ftrack_api.session.Session.encode>` and
+:meth:`Session.decode<ftrack_api.session.Session.decode>` for use with a
+:class:`~ftrack_api.cache.SerialisedCache`::
+
+    def cache(session):
+        codec = ftrack_api.codec.BinaryEntityCodec(session)
+        return ftrack_api.cache.SerialisedCache(
+            ftrack_api.cache.SqliteCache("/path/to/cache.sqlite"),
+            encode=codec.encode,
+            decode=codec.decode,
+        )
+
+    session = ftrack_api.Session(cache=cache)
+
+"""
+
+from builtins import object
+import pickle
+
+import ftrack_api.entity.base
+import ftrack_api.collection
+import ftrack_api.inspection
+import ftrack_api.symbol
+
+
+class BinaryEntityCodec(object):
+    """Encode entities as compact binary data and decode them again.
+
+    Only persisted remote values are stored, with references to other entities
+    stored as their primary key. Values such as dates are pickled directly
+    rather than round tripping through strings.
+
+    """
+
+    #: Version of the encoded format. Data of any other version is rejected.
+    FORMAT_VERSION = 1
+
+    _ENTITY = 0
+    _REFERENCE = 1
+    _COLLECTION = 2
+    _LIST = 3
+    _DICT = 4
+
+    def __init__(self, session):
+        """Initialise codec for *session*."""
+        super(BinaryEntityCodec, self).__init__()
+        self.session = session
+
+    @property
+    def schema_hash(self):
+        """Return hash of the schemas that encoded data is valid for."""
+        return self.session.server_information.get("schema_hash")
+
+    def encode(self, value):
+        """Return *value* encoded as bytes."""
+        return pickle.dumps(
+            (self.FORMAT_VERSION, self.schema_hash, self._encode(value)),
+            protocol=5,
+        )
+
+    def decode(self, data):
+        """Return value decoded from *data*.
+
+        Raise :exc:`KeyError` if *data* was encoded with a different format or
+        for different schemas so that a cache treats it as missing.
+
+        """
+        version, schema_hash, value = pickle.loads(data)
+        if version != self.FORMAT_VERSION or schema_hash != self.schema_hash:
+            raise KeyError("Encoded data does not match current schemas.")
+
+        with self.session.operation_recording(False):
+            return self._decode(value)
+
+    def _encode(self, value):
+        """Return picklable representation of *value*."""
+        if isinstance(value, ftrack_api.entity.base.Entity):
+            data = {}
+            with self.session.auto_populating(False):
+                for attribute in value.attributes:
+                    if attribute.computed:
+                        continue
+
+                    attribute_value = attribute.get_remote_value(value)
+                    if attribute_value is not ftrack_api.symbol.NOT_SET:
+                        data[attribute.name] = self._encode_reference(attribute_value)
+
+            return (self._ENTITY, value.entity_type, data)
+
+        if isinstance(value, list):
+            return (self._LIST, [self._encode(item) for item in value])
+
+        if isinstance(value, dict):
+            return (
+                self._DICT,
+                dict((key, self._encode(item)) for key, item in value.items()),
+            )
+
+        return value
+
+    def _encode_reference(self, value):
+        """Return picklable representation of attribute *value*."""
+        if isinstance(value, ftrack_api.entity.base.Entity):
+            return (
+                self._REFERENCE,
+                value.entity_type,
+                dict(ftrack_api.inspection.primary_key(value)),
+            )
+
+        if isinstance(value, ftrack_api.collection.MappedCollectionProxy):
+            value = value.collection
+
+        if isinstance(value, ftrack_api.collection.Collection):
+            return (
+                self._COLLECTION,
+                [self._encode_reference(entity) for entity in value],
+            )
+
+        return value
+
+    def _decode(self, value):
+        """Return value reconstructed from picklable *value*."""
+        if not isinstance(value, tuple) or not value:
+            return value
+
+        marker = value[0]
+        if marker == self._ENTITY:
+            _, entity_type, data = value
+            data = dict(
+                (name, self._decode_reference(item)) for name, item in data.items()
+            )
+            return self.session._create(entity_type, data, reconstructing=True)
+
+        if marker == self._LIST:
+            return [self._decode(item) for item in value[1]]
+
+        if marker == self._DICT:
+            return dict((key, self._decode(item)) for key, item in value[1].items())
+
+        return value
+
+    def _decode_reference(self, value):
+        """Return attribute value reconstructed from picklable *value*."""
+        if not isinstance(value, tuple) or not value:
+            return value
+
+        marker = value[0]
+        if marker == self._REFERENCE:
+            _, entity_type, primary_key = value
+            return self.session._create(entity_type, primary_key, reconstructing=True)
+
+        if marker == self._COLLECTION:
+            return [self._decode_reference(item) for item in value[1]]
+
+        return value
@@ -28,6 +28,15 @@ class Collection(collections.abc.MutableSequence):
         self._data = []
         self._identities = set()
 
+        # Entities added and removed relative to a known baseline, keyed by
+        # identity. None until tracking is started with :meth:`track_changes`.
+        self._added = None
+        self._removed = None
+
+        # Whether a recorded operation references this collection directly as
+        # its new value.
+        self._referenced = False
+
         # Set initial dataset.
         # Note: For initialisation, immutability is deferred till after initial
         # population as otherwise there would be no public way to initialise an
@@ -45,7 +54,7 @@ class Collection(collections.abc.MutableSequence):
 
     def _identity_key(self, entity):
         """Return identity key for *entity*."""
-        return str(ftrack_api.inspection.identity(entity))
+        return ftrack_api.inspection.identity_key(entity)
 
     def __copy__(self):
         """Return shallow copy.
@@ -61,23 +70,117 @@ class Collection(collections.abc.MutableSequence):
         copied_instance.__dict__.update(self.__dict__)
         copied_instance._data = copy.copy(self._data)
         copied_instance._identities = copy.copy(self._identities)
+        copied_instance._referenced = False
+        if self._added is not None:
+            copied_instance._added = copy.copy(self._added)
+            copied_instance._removed = copy.copy(self._removed)
 
         return copied_instance
 
+    def track_changes(self):
+        """Start tracking changes relative to the current contents.
+
+        Typically called when the collection represents the remote value so
+        that copies made from it can report their changes via :attr:`changes`.
+
+        """
+        self._added = {}
+        self._removed = {}
+
+    @property
+    def changes(self):
+        """Return tuple of (added, removed) entities or None if not tracked.
+
+        Changes are relative to the contents when :meth:`track_changes` was
+        called on this collection or on the collection it was copied from.
+
+        """
+        if self._added is None:
+            return None
+
+        return list(self._added.values()), list(self._removed.values())
+
+    def _track_insert(self, identity_key, item):
+        """Track insertion of *item* with *identity_key*."""
+        if self._added is None:
+            return
+
+        if self._removed.pop(identity_key, None) is None:
+            self._added[identity_key] = item
+
+    def _track_remove(self, identity_key, item):
+        """Track removal of *item* with *identity_key*."""
+        if self._added is None:
+            return
+
+        if self._added.pop(identity_key, None) is None:
+            self._removed[identity_key] = item
+
+    def _pending_update(self):
+        """Return pending update operation for this collection or None."""
+        return self.entity.session.recorded_operations.get_update(
+            self.entity.entity_type,
+            ftrack_api.inspection.primary_key(self.entity),
+            self.attribute.name,
+        )
+
+    def _old_value(self):
+        """Return value to record as old value for an upcoming modification.
+
+        A copy is only made for the first recorded modification. Subsequent
+        updates to the same attribute are coalesced by the recorded operations
+        and retain the original old value, so appending is O(1) amortised.
+
+        If operations are not being recorded and a pending operation references
+        this collection, freeze that operation's new value with a copy so the
+        unrecorded modification is not persisted.
+
+        """
+        if self.entity.session.record_operations:
+            if self._pending_update() is not None:
+                return ftrack_api.symbol.NOT_SET
+
+            return copy.copy(self)
+
+        if self._referenced:
+            operation = self._pending_update()
+            if operation is not None and operation.new_value is self:
+                operation.new_value = copy.copy(self)
+
+            self._referenced = False
+
+        return ftrack_api.symbol.NOT_SET
+
     def _notify(self, old_value):
         """Notify about modification."""
+        # Only a collection held as the local value of its entity is a change,
+        # not one being populated, such as on construction.
+        local_value = self.attribute.get_local_value(self.entity)
+        if isinstance(local_value, MappedCollectionProxy):
+            local_value = local_value.collection
+
+        if local_value is self:
+            self.entity.session._mark_modified(self.entity)
+
         # Record operation.
         if self.entity.session.record_operations:
-            self.entity.session.recorded_operations.push(
-                ftrack_api.operation.UpdateEntityOperation(
-                    self.entity.entity_type,
-                    ftrack_api.inspection.primary_key(self.entity),
-                    self.attribute.name,
-                    old_value,
-                    self,
-                )
+            operation = ftrack_api.operation.UpdateEntityOperation(
+                self.entity.entity_type,
+                ftrack_api.inspection.primary_key(self.entity),
+                self.attribute.name,
+                ftrack_api.symbol.NOT_SET,
+                ftrack_api.symbol.NOT_SET,
             )
 
+            # Assign values directly to avoid the shallow copies the operation
+            # would otherwise make. The collection itself is referenced as new
+            # value (see :meth:`_old_value`).
+            operation.old_value = old_value
+            operation.new_value = self
+            self._referenced = True
+
+            self.entity.session.recorded_operations.push(operation)
+
     def insert(self, index, item):
         """Insert *item* at *index*."""
         if not self.mutable:
@@ -86,9 +189,11 @@ class Collection(collections.abc.MutableSequence):
         if item in self:
             raise ftrack_api.exception.DuplicateItemInCollectionError(item, self)
 
-        old_value = copy.copy(self)
+        old_value = self._old_value()
+        identity_key = self._identity_key(item)
         self._data.insert(index, item)
-        self._identities.add(self._identity_key(item))
+        self._identities.add(identity_key)
+        self._track_insert(identity_key, item)
         self._notify(old_value)
 
     def __contains__(self, value):
@@ -112,16 +217,20 @@ class Collection(collections.abc.MutableSequence):
             if index != existing_index:
                 raise ftrack_api.exception.DuplicateItemInCollectionError(item, self)
 
-        old_value = copy.copy(self)
+        old_value = self._old_value()
         try:
             existing_item = self._data[index]
         except IndexError:
             pass
         else:
-            self._identities.remove(self._identity_key(existing_item))
+            existing_identity_key = self._identity_key(existing_item)
+            self._identities.remove(existing_identity_key)
+            self._track_remove(existing_identity_key, existing_item)
 
+        identity_key = self._identity_key(item)
         self._data[index] = item
-        self._identities.add(self._identity_key(item))
+        self._identities.add(identity_key)
+        self._track_insert(identity_key, item)
         self._notify(old_value)
 
     def __delitem__(self, index):
@@ -129,10 +238,12 @@ class Collection(collections.abc.MutableSequence):
         if not self.mutable:
             raise ftrack_api.exception.ImmutableCollectionError(self)
 
-        old_value = copy.copy(self)
+        old_value = self._old_value()
         item = self._data[index]
+        identity_key = self._identity_key(item)
         del self._data[index]
-        self._identities.remove(self._identity_key(item))
+        self._identities.remove(identity_key)
+        self._track_remove(identity_key, item)
         self._notify(old_value)
 
     def __len__(self):
@@ -316,9 +427,7 @@ class PerSessionDefaultKeyMaker(ftrack_api.cache.KeyMaker):
 
 #: Memoiser for use with callables that should be called once per session.
 memoise_session = ftrack_api.cache.memoise_decorator(
-    ftrack_api.cache.Memoiser(
-        key_maker=PerSessionDefaultKeyMaker(), return_copies=False
-    )
+    ftrack_api.cache.SessionMemoiser(key_maker=PerSessionDefaultKeyMaker())
 )
 
 
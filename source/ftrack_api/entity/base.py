@@ -31,6 +31,12 @@ class DynamicEntityTypeMetaclass(abc.ABCMeta):
 
     """
 
+    def __init__(self, name, bases, namespace):
+        """Initialise class with a shared logger unless one is defined."""
+        super(DynamicEntityTypeMetaclass, self).__init__(name, bases, namespace)
+        if "logger" not in namespace:
+            self.logger = logging.getLogger(__name__ + "." + name)
+
     def __repr__(self):
         """Return representation of class."""
         return "<dynamic ftrack class '{0}'>".format(self.__name__)
@@ -46,6 +52,10 @@ class Entity(
     primary_key_attributes = None
     default_projections = None
 
+    # Shared defaults replaced per instance only when changed.
+    _inflated = frozenset()
+    _ignore_data_keys = ("__entity_type__",)
+
     def __init__(self, session, data=None, reconstructing=False):
         """Initialise entity.
 
@@ -61,9 +71,10 @@ class Entity(
 
         """
         super(Entity, self).__init__()
-        self.logger = logging.getLogger(__name__ + "." + self.__class__.__name__)
         self.session = session
-        self._inflated = set()
+        self._ftrack_values = [ftrack_api.symbol.NOT_SET] * (
+            self.attributes.storage_size if self.attributes is not None else 0
+        )
 
         if data is None:
             data = {}
@@ -76,7 +87,6 @@ class Entity(
             )
         )
 
-        self._ignore_data_keys = ["__entity_type__"]
         if not reconstructing:
             self._construct(data)
         else:
@@ -202,7 +212,7 @@ class Entity(
 
     def __hash__(self):
         """Return hash representing instance."""
-        return hash(str(ftrack_api.inspection.identity(self)))
+        return hash(ftrack_api.inspection.identity_key(self))
 
     def __eq__(self, other):
         """Return whether *other* is equal to this instance.
@@ -214,9 +224,9 @@ class Entity(
 
         """
         try:
-            return ftrack_api.inspection.identity(
+            return ftrack_api.inspection.identity_key(
                 other
-            ) == ftrack_api.inspection.identity(self)
+            ) == ftrack_api.inspection.identity_key(self)
         except (AttributeError, KeyError):
             return False
 
@@ -298,76 +308,93 @@ class Entity(
             * new_value - The new merged value.
 
         """
-        log_debug = self.logger.isEnabledFor(logging.DEBUG)
-
         if merged is None:
             merged = {}
 
-        log_message = 'Merged {type} "{name}": {old_value!r} -> {new_value!r}'
         changes = []
+        self._merge(entity, merged, self.session.merge, changes)
+        return changes
+
+    def _merge(self, entity, merged, merge_value, changes=None, merge_local=True):
+        """Merge *entity* into this entity and return whether anything changed.
+
+        Referenced values are merged by calling *merge_value* with the value
+        and *merged*. If *changes* is a list then a mapping describing each
+        change, as returned from :meth:`merge`, is appended to it.
+
+        If *merge_local* is False then local values are ignored, as for a read
+        only session where there are none.
+
+        """
+        log_debug = self.logger.isEnabledFor(logging.DEBUG)
+        if log_debug and changes is None:
+            changes = []
+
+        log_message = 'Merged {type} "{name}": {old_value!r} -> {new_value!r}'
+        changed = False
+        not_set = ftrack_api.symbol.NOT_SET
 
         # Attributes.
+        same_class = entity.attributes is self.attributes
 
-        # Prioritise by type so that scalar values are set first. This should
-        # guarantee that the attributes making up the identity of the entity
-        # are merged before merging any collections that may have references to
-        # this entity.
-        attributes = collections.deque()
-        for attribute in entity.attributes:
-            if isinstance(attribute, ftrack_api.attribute.ScalarAttribute):
-                attributes.appendleft(attribute)
+        for other_attribute in entity.attributes.merge_order():
+            if same_class:
+                attribute = other_attribute
             else:
-                attributes.append(attribute)
-
-        for other_attribute in attributes:
-            attribute = self.attributes.get(other_attribute.name)
+                attribute = self.attributes.get(other_attribute.name)
 
             # Local attributes.
-            other_local_value = other_attribute.get_local_value(entity)
-            if other_local_value is not ftrack_api.symbol.NOT_SET:
+            if merge_local:
+                other_local_value = other_attribute.get_local_value(entity)
+            else:
+                other_local_value = not_set
+
+            if other_local_value is not not_set:
                 local_value = attribute.get_local_value(self)
                 if local_value != other_local_value:
-                    merged_local_value = self.session.merge(
-                        other_local_value, merged=merged
-                    )
+                    merged_local_value = merge_value(other_local_value, merged)
 
                     attribute.set_local_value(self, merged_local_value)
-                    changes.append(
-                        {
-                            "type": "local_attribute",
-                            "name": attribute.name,
-                            "old_value": local_value,
-                            "new_value": merged_local_value,
-                        }
-                    )
-                    log_debug and self.logger.debug(log_message.format(**changes[-1]))
+                    changed = True
+                    if changes is not None:
+                        changes.append(
+                            {
+                                "type": "local_attribute",
+                                "name": attribute.name,
+                                "old_value": local_value,
+                                "new_value": merged_local_value,
+                            }
+                        )
+                        log_debug and self.logger.debug(
+                            log_message.format(**changes[-1])
+                        )
 
             # Remote attributes.
             other_remote_value = other_attribute.get_remote_value(entity)
-            if other_remote_value is not ftrack_api.symbol.NOT_SET:
+            if other_remote_value is not not_set:
                 remote_value = attribute.get_remote_value(self)
                 if remote_value != other_remote_value:
-                    merged_remote_value = self.session.merge(
-                        other_remote_value, merged=merged
-                    )
+                    merged_remote_value = merge_value(other_remote_value, merged)
 
                     attribute.set_remote_value(self, merged_remote_value)
-
-                    changes.append(
-                        {
-                            "type": "remote_attribute",
-                            "name": attribute.name,
-                            "old_value": remote_value,
-                            "new_value": merged_remote_value,
-                        }
-                    )
-
-                    log_debug and self.logger.debug(log_message.format(**changes[-1]))
+                    changed = True
+                    if changes is not None:
+                        changes.append(
+                            {
+                                "type": "remote_attribute",
+                                "name": attribute.name,
+                                "old_value": remote_value,
+                                "new_value": merged_remote_value,
+                            }
+                        )
+                        log_debug and self.logger.debug(
+                            log_message.format(**changes[-1])
+                        )
 
                     # We need to handle collections separately since
                     # they may store a local copy of the remote attribute
                     # even though it may not be modified.
-                    if not isinstance(
+                    if not merge_local or not isinstance(
                         attribute, ftrack_api.attribute.AbstractCollectionAttribute
                     ):
                         continue
@@ -375,25 +402,37 @@ class Entity(
                     local_value = attribute.get_local_value(self)
 
                     # Populated but not modified, update it.
-                    if (
-                        local_value is not ftrack_api.symbol.NOT_SET
-                        and local_value == remote_value
-                    ):
-                        attribute.set_local_value(self, merged_remote_value)
-                        changes.append(
-                            {
-                                "type": "local_attribute",
-                                "name": attribute.name,
-                                "old_value": local_value,
-                                "new_value": merged_remote_value,
-                            }
+                    if local_value is not not_set and local_value == remote_value:
+                        attribute._set_local_value(
+                            self, merged_remote_value, modified=False
                         )
+                        if changes is not None:
+                            changes.append(
+                                {
+                                    "type": "local_attribute",
+                                    "name": attribute.name,
+                                    "old_value": local_value,
+                                    "new_value": merged_remote_value,
+                                }
+                            )
+                            log_debug and self.logger.debug(
+                                log_message.format(**changes[-1])
+                            )
+
+        return changed
+
+    def _clear_values(self):
+        """Clear all values except primary key values without recording.
+
+        References to other entities and collections are released, breaking
+        any reference cycles through them.
 
-                        log_debug and self.logger.debug(
-                            log_message.format(**changes[-1])
-                        )
+        """
+        for attribute in self.attributes:
+            if attribute.name not in self.primary_key_attributes:
+                attribute.clear_value(self)
 
-        return changes
+        self.__dict__.pop("_inflated", None)
 
     def _populate_unset_scalar_attributes(self):
         """Populate all unset scalar attributes in one query."""
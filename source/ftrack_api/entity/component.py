@@ -47,11 +47,12 @@ class CreateThumbnailMixin(object):
 
         thumbnail_component = self.session.create_component(path, data, location=None)
 
-        origin_location = self.session.get(
-            "Location", ftrack_api.symbol.ORIGIN_LOCATION_ID
-        )
-        server_location = self.session.get(
-            "Location", ftrack_api.symbol.SERVER_LOCATION_ID
+        origin_location, server_location = self.session.get_many(
+            "Location",
+            [
+                ftrack_api.symbol.ORIGIN_LOCATION_ID,
+                ftrack_api.symbol.SERVER_LOCATION_ID,
+            ],
         )
         server_location.add_component(thumbnail_component, [origin_location])
 
@@ -212,16 +212,12 @@ class PerSessionDefaultKeyMaker(ftrack_api.cache.KeyMaker):
 #: Memoiser for use with default callables that should only be called once per
 # session.
 memoise_defaults = ftrack_api.cache.memoise_decorator(
-    ftrack_api.cache.Memoiser(
-        key_maker=PerSessionDefaultKeyMaker(), return_copies=False
-    )
+    ftrack_api.cache.SessionMemoiser(key_maker=PerSessionDefaultKeyMaker())
 )
 
 #: Memoiser for use with callables that should be called once per session.
 memoise_session = ftrack_api.cache.memoise_decorator(
-    ftrack_api.cache.Memoiser(
-        key_maker=PerSessionDefaultKeyMaker(), return_copies=False
-    )
+    ftrack_api.cache.SessionMemoiser(key_maker=PerSessionDefaultKeyMaker())
 )
 
 
@@ -136,6 +136,12 @@ class InvalidStateTransitionError(InvalidStateError):
         super(InvalidStateTransitionError, self).__init__(**kw)
 
 
+class ReadOnlySessionError(Error):
+    """Raise when modification attempted through a read only session."""
+
+    default_message = "Cannot modify entities of a read only session."
+
+
 class AttributeError(Error):
     """Raise when an error related to an attribute occurs."""
 
@@ -374,3 +380,17 @@ class ConnectionClosedError(Error):
     """Raise when attempt to use closed connection detected."""
 
     default_message = "Connection closed."
+
+
+class RedisError(Error):
+    """Raise when a Redis protocol server replies with an error."""
+
+    default_message = "Cache server replied with an error."
+
+    def __init__(self, message=None, **kw):
+        """Initialise error with *message* as replied by the server."""
+        if message is not None:
+            # Replies are not format strings.
+            message = message.replace("{", "{{").replace("}", "}}")
+
+        super(RedisError, self).__init__(message, **kw)
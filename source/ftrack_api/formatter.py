@@ -100,7 +100,7 @@ def format(
     if _seen is None:
         _seen = set()
 
-    identifier = str(ftrack_api.inspection.identity(entity))
+    identifier = ftrack_api.inspection.identity_key(entity)
     if identifier in _seen:
         return first_line_spacer + formatters["header"](entity.entity_type) + "{...}"
 
@@ -8,9 +8,68 @@ import ftrack_api.symbol
 import ftrack_api.operation
 
 
+class Identity(tuple):
+    """Identity of an entity as (entity type, primary key values).
+
+    Compares equal to and formats the same as an equivalent plain tuple. The
+    string form is computed once and available as :attr:`key` so that key
+    makers need not format it again.
+
+    """
+
+    def __new__(cls, entity_type, primary_key_values, key=None):
+        """Return identity for *entity_type* and *primary_key_values*."""
+        identity = super(Identity, cls).__new__(cls, (entity_type, primary_key_values))
+        if key is None:
+            key = tuple.__repr__(identity)
+
+        identity.key = key
+        return identity
+
+    def __getnewargs__(self):
+        """Return arguments to reconstruct identity with when copying."""
+        return (self[0], self[1], self.key)
+
+    def __str__(self):
+        """Return string key."""
+        return self.key
+
+
 def identity(entity):
-    """Return unique identity of *entity*."""
-    return (str(entity.entity_type), list(primary_key(entity).values()))
+    """Return unique identity of *entity*.
+
+    The result is an :class:`Identity` comparing equal to a tuple of entity
+    type and list of primary key values.
+
+    .. note::
+
+        The identity is cached on *entity* until a primary key attribute is
+        set.
+
+    """
+    entity_type, values, key = _identity(entity)
+    return Identity(entity_type, list(values), key)
+
+
+def identity_key(entity):
+    """Return string key unique to identity of *entity*.
+
+    Equivalent to ``str(identity(entity))``.
+
+    """
+    return _identity(entity)[2]
+
+
+def _identity(entity):
+    """Return cached (entity type, primary key values, key) for *entity*."""
+    cached = getattr(entity, "_ftrack_identity", None)
+    if cached is None:
+        entity_type = str(entity.entity_type)
+        values = tuple(_primary_key(entity).values())
+        cached = (entity_type, values, str((entity_type, list(values))))
+        entity._ftrack_identity = cached
+
+    return cached
 
 
 def primary_key(entity):
@@ -21,6 +80,17 @@ def primary_key(entity):
         primary_key(entity).values()
 
     """
+    cached = getattr(entity, "_ftrack_identity", None)
+    if cached is not None:
+        return collections.OrderedDict(
+            zip(map(str, entity.primary_key_attributes), cached[1])
+        )
+
+    return _primary_key(entity)
+
+
+def _primary_key(entity):
+    """Return primary key of *entity* computed from its attribute values."""
     primary_key = collections.OrderedDict()
     for name in entity.primary_key_attributes:
         value = entity[name]
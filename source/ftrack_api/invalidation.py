@@ -0,0 +1,244 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2024 ftrack
+
+"""Invalidate cached entity values in response to remote changes.
+
+A :class:`CacheInvalidator` subscribes to ``ftrack.update`` events published
+by the server and resets the changed attributes of matching cached entities so
+that a long running session does not keep serving outdated values::
+
+    invalidator = ftrack_api.invalidation.CacheInvalidator(session)
+    invalidator.subscribe()
+
+    session.event_hub.wait()
+
+"""
+
+from builtins import object
+import collections
+import logging
+import threading
+
+import ftrack_api.symbol
+from ftrack_api.logging import LazyLogMessage as L
+
+
+class CacheInvalidator(object):
+    """Invalidate session cache from ``ftrack.update`` events."""
+
+    #: Mapping of entity types used in update events to schema entity types
+    #: where the names differ.
+    ENTITY_TYPE_ALIASES = {"show": ["Project"]}
+
+    def __init__(self, session, refresh=False, delay=0.5):
+        """Initialise invalidator for *session*.
+
+        If *refresh* is True, changed attributes are retrieved again straight
+        away using a single :meth:`~ftrack_api.session.Session.populate` call
+        per entity type. Otherwise they are reset to
+        :attr:`ftrack_api.symbol.NOT_SET` and retrieved on next access.
+
+        Events received within *delay* seconds of the first pending event are
+        coalesced so that repeated changes to the same entity are applied once.
+        Set to 0 to apply each event as it is received.
+
+        .. note::
+
+            When *delay* is greater than 0, pending changes are applied from a
+            timer thread. Call :meth:`flush` to apply them immediately instead.
+
+        """
+        super(CacheInvalidator, self).__init__()
+        self.logger = logging.getLogger(__name__ + "." + self.__class__.__name__)
+        self.session = session
+        self.refresh = refresh
+        self.delay = delay
+
+        self.stats = {"events": 0, "invalidated": 0, "refreshed": 0}
+
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._timer = None
+        self._subscriber_identifier = None
+        self._entity_types = {}
+
+    def subscribe(self):
+        """Subscribe to update events on the session event hub."""
+        if self._subscriber_identifier is None:
+            self._subscriber_identifier = self.session.event_hub.subscribe(
+                "topic=ftrack.update", self.handle_event
+            )
+
+    def unsubscribe(self):
+        """Unsubscribe from update events, applying any pending changes."""
+        if self._subscriber_identifier is not None:
+            self.session.event_hub.unsubscribe(self._subscriber_identifier)
+            self._subscriber_identifier = None
+
+        self.flush()
+
+    def handle_event(self, event):
+        """Record changes described by update *event* for invalidation."""
+        with self._lock:
+            self.stats["events"] += 1
+
+            for item in event["data"].get("entities", []):
+                entity_type = item.get("entityType")
+                entity_id = item.get("entityId")
+                if not entity_type or not entity_id:
+                    continue
+
+                # None represents all attributes.
+                keys = item.get("keys")
+                if item.get("action") != "update" or not keys:
+                    keys = None
+
+                pending_key = (entity_type, entity_id)
+                if pending_key in self._pending:
+                    existing = self._pending[pending_key]
+                    if existing is None or keys is None:
+                        keys = None
+                    else:
+                        keys = existing.union(keys)
+
+                elif keys is not None:
+                    keys = set(keys)
+
+                self._pending[pending_key] = keys
+
+            if self.delay > 0 and self._timer is None and self._pending:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if self.delay <= 0:
+            self.flush()
+
+    def flush(self):
+        """Apply all pending changes to the session cache."""
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not pending:
+            return
+
+        session = self.session
+        to_refresh = collections.OrderedDict()
+        invalidated = 0
+
+        # Hold the session lock so that invalidation does not interleave with
+        # merges or populates from other threads.
+        with session._thread_lock, session.auto_populating(False):
+            for (entity_type, entity_id), keys in pending.items():
+                for entity in self._resolve(entity_type, entity_id):
+                    names = self._attribute_names(entity, keys)
+                    for name in names:
+                        entity.attributes.get(name).set_remote_value(
+                            entity, ftrack_api.symbol.NOT_SET
+                        )
+
+                    invalidated += 1
+
+                    if self.refresh and names:
+                        entities, projections = to_refresh.setdefault(
+                            entity.entity_type, ([], set())
+                        )
+                        entities.append(entity)
+                        projections.update(names)
+
+        with self._lock:
+            self.stats["invalidated"] += invalidated
+
+        for entity_type, (entities, projections) in to_refresh.items():
+            self.logger.debug(
+                L("Refreshing {0} {1} entities.", len(entities), entity_type)
+            )
+            session.populate(entities, ", ".join(sorted(projections)))
+
+            with self._lock:
+                self.stats["refreshed"] += len(entities)
+
+    def _resolve(self, entity_type, entity_id):
+        """Return cached entities matching event *entity_type* and *entity_id*.
+
+        Any serialised copies held by deeper cache layers are removed as they
+        are no longer current.
+
+        """
+        session = self.session
+        entities = []
+        for name in self._schema_entity_types(entity_type):
+            cache_key = session.cache_key_maker.key((name, [entity_id]))
+
+            for cache in session.cache.caches[1:]:
+                try:
+                    cache.remove(cache_key)
+                except KeyError:
+                    pass
+
+            try:
+                entities.append(session.cache.caches[0].get(cache_key))
+            except KeyError:
+                pass
+
+        return entities
+
+    def _schema_entity_types(self, entity_type):
+        """Return schema entity type names for event *entity_type*."""
+        names = self._entity_types.get(entity_type)
+        if names is None:
+            names = self.ENTITY_TYPE_ALIASES.get(entity_type)
+
+            if names is None and entity_type == "task":
+                # Tasks in events cover all contexts such as shots and folders.
+                names = [
+                    name
+                    for name, entity_class in self.session.types.items()
+                    if entity_class.attributes.get("context_type") is not None
+                ]
+
+            if names is None:
+                names = [
+                    name
+                    for name in self.session.types
+                    if name.lower() == entity_type.lower()
+                ]
+
+            self._entity_types[entity_type] = names
+
+        return names
+
+    def _attribute_names(self, entity, keys):
+        """Return names of *entity* attributes affected by changed *keys*.
+
+        Event keys are matched ignoring case and underscores. A changed foreign
+        key such as ``statusid`` also affects the matching relationship, here
+        ``status``. If *keys* is None then return all attributes holding a
+        remote value.
+
+        """
+        loaded = [
+            attribute.name
+            for attribute in entity.attributes
+            if attribute.name not in entity.primary_key_attributes
+            and attribute.get_remote_value(entity) is not ftrack_api.symbol.NOT_SET
+        ]
+        if keys is None:
+            return loaded
+
+        normalised_keys = set(key.replace("_", "").lower() for key in keys)
+
+        names = []
+        for name in loaded:
+            normalised_name = name.replace("_", "").lower()
+            if normalised_name in normalised_keys or (
+                normalised_name + "id" in normalised_keys
+            ):
+                names.append(name)
+
+        return names
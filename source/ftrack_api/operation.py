@@ -3,27 +3,119 @@
 
 from builtins import object
 import copy
+import itertools
 
 
 class Operations(object):
-    """Stack of operations."""
+    """Stack of operations.
+
+    Operations are coalesced as they are recorded so that the stack only grows
+    with the number of distinct modifications rather than the number of
+    individual changes:
+
+    * An :class:`UpdateEntityOperation` for an entity attribute that already
+      has a pending update replaces that update. The original *old_value* is
+      retained and the operation moves to the top of the stack, mirroring the
+      "last update wins" optimisation applied on commit.
+    * A :class:`DeleteEntityOperation` for an entity that has a pending
+      :class:`CreateEntityOperation` discards all pending updates for that
+      entity. The create and delete are both kept so the entity is still
+      reported as deleted and the pair is dropped on commit.
+
+    """
 
     def __init__(self):
         """Initialise stack."""
-        self._stack = []
+        self._stack = {}
+        self._entities = {}
+        self._counter = itertools.count()
         super(Operations, self).__init__()
 
     def clear(self):
         """Clear all operations."""
-        del self._stack[:]
+        self._stack.clear()
+        self._entities.clear()
 
     def push(self, operation):
         """Push *operation* onto stack."""
-        self._stack.append(operation)
+        identity = self._identity(operation)
+
+        if isinstance(operation, DeleteEntityOperation):
+            keys = self._entities.get(identity, ())
+            if ("create",) + identity in keys:
+                # Created then deleted before being persisted so updates will
+                # never be applied.
+                for key in list(keys):
+                    if key[0] == "update":
+                        del self._stack[key]
+                        keys.discard(key)
+
+        if isinstance(operation, UpdateEntityOperation):
+            key = ("update",) + identity + (operation.attribute_name,)
+            existing = self._stack.pop(key, None)
+            if existing is not None:
+                operation.old_value = existing.old_value
+
+        elif isinstance(operation, CreateEntityOperation):
+            key = ("create",) + identity
+
+        else:
+            key = next(self._counter)
+
+        self._stack[key] = operation
+        if identity is not None:
+            self._entities.setdefault(identity, set()).add(key)
 
     def pop(self):
         """Pop and return most recent operation from stack."""
-        return self._stack.pop()
+        key, operation = self._stack.popitem()
+
+        identity = self._identity(operation)
+        if identity is not None:
+            keys = self._entities[identity]
+            keys.discard(key)
+            if not keys:
+                del self._entities[identity]
+
+        return operation
+
+    def is_created(self, entity_type, entity_key):
+        """Return whether a create is pending for *entity_type* and *entity_key*.
+
+        *entity_key* should follow the form returned from
+        :func:`ftrack_api.inspection.primary_key`.
+
+        """
+        identity = (entity_type, tuple(entity_key.values()))
+        return ("create",) + identity in self._entities.get(identity, ())
+
+    def has_entity(self, entity_type, entity_key):
+        """Return whether any operation is pending for *entity_type* and *entity_key*.
+
+        *entity_key* should follow the form returned from
+        :func:`ftrack_api.inspection.primary_key`.
+
+        """
+        return (entity_type, tuple(entity_key.values())) in self._entities
+
+    def get_update(self, entity_type, entity_key, attribute_name):
+        """Return pending update of *attribute_name* or None if not present.
+
+        *entity_key* should follow the form returned from
+        :func:`ftrack_api.inspection.primary_key`.
+
+        """
+        return self._stack.get(
+            ("update", entity_type, tuple(entity_key.values()), attribute_name)
+        )
+
+    def _identity(self, operation):
+        """Return entity identity for *operation* or None if not applicable."""
+        entity_key = getattr(operation, "entity_key", None)
+        if entity_key is None:
+            return None
+
+        return (operation.entity_type, tuple(entity_key.values()))
 
     def __len__(self):
         """Return count of operations."""
@@ -31,7 +123,7 @@ class Operations(object):
 
     def __iter__(self):
         """Return iterator over operations."""
-        return iter(self._stack)
+        return iter(list(self._stack.values()))
 
 
 class Operation(object):
@@ -10,16 +10,21 @@ from builtins import str
 from builtins import object
 import json
 import logging
+import pickle
 import collections.abc
 import datetime
 import os
+import sys
 import getpass
 import functools
 import itertools
 import hashlib
 import tempfile
 import threading
+import time
 import atexit
+import contextlib
+import contextvars
 import warnings
 
 import requests
@@ -35,6 +40,7 @@ import ftrack_api.entity.factory
 import ftrack_api.entity.base
 import ftrack_api.entity.location
 import ftrack_api.cache
+import ftrack_api.codec
 import ftrack_api.symbol
 import ftrack_api.query
 import ftrack_api.attribute
@@ -52,6 +58,7 @@ import ftrack_api._centralized_storage_scenario
 import ftrack_api.logging
 from ftrack_api.logging import LazyLogMessage as L
 
+import weakref
 from weakref import WeakMethod
 
 
@@ -75,6 +82,15 @@ class SessionAuthentication(requests.auth.AuthBase):
 class Session(object):
     """An isolated session for interaction with an ftrack server."""
 
+    #: Maximum number of stale entities refreshed together.
+    _revalidation_batch_size = 100
+
+    #: Actions that do not modify remote data and can therefore share the
+    #: response of an identical call already in flight.
+    _COALESCABLE_ACTIONS = frozenset(
+        ["query", "query_schemas", "query_server_information"]
+    )
+
     def __init__(
         self,
         server_url=None,
@@ -91,6 +107,12 @@ class Session(object):
         cookies=None,
         headers=None,
         strict_api=False,
+        negative_cache_ttl=None,
+        memory_cache_max_entries=None,
+        memory_cache_max_bytes=None,
+        freshness_policies=None,
+        read_only=False,
+        cache_statistics=False,
     ):
         """Initialise session.
 
@@ -174,6 +196,39 @@ class Session(object):
         specified) indicating whether to add the 'ftrack-strict-api': 'true' header
         to the request or not.
 
+        *negative_cache_ttl* may be set to a number of seconds to remember
+        lookups through :meth:`get` that found no matching entity, avoiding
+        repeated server queries for the same missing key. Records are discarded
+        when an entity with that key is created or merged into the session. If
+        not specified, missing entities are always queried again.
+
+        *memory_cache_max_entries* and *memory_cache_max_bytes* may be set to
+        bound the top level memory cache by entry count and approximate size
+        respectively. Least recently used entities are then evicted, except for
+        those with local modifications or pending operations. Evicted entities
+        still referenced elsewhere keep their identity within the session. If
+        not specified, the memory cache holds every entity until
+        :meth:`reset` or :meth:`close`.
+
+        *freshness_policies* may be a mapping of entity type name to the number
+        of seconds that remote values retrieved for entities of that type are
+        considered fresh, such as ``{"Status": 3600, "Task": 30}``. Reading a
+        stale attribute value then first refreshes the loaded attributes of
+        that entity, together with other stale entities of the same type, using
+        :meth:`populate`. Entity types without a policy never go stale. The
+        policies can also be changed later through
+        :attr:`freshness_policies`.
+
+        If *read_only* is True then entities retrieved through the session are
+        immutable, with any attempt to set a value or to create or delete an
+        entity raising :exc:`~ftrack_api.exception.ReadOnlySessionError`.
+        Operations are never recorded, merging skips local values and
+        :meth:`commit` does nothing. Use for services that only query data.
+
+        If *cache_statistics* is True then hits, misses and time spent are
+        recorded per cache layer and reported by :meth:`cache_stats`. Recording
+        adds a small overhead to every cache lookup so is off by default.
+
         """
         super(Session, self).__init__()
         self.logger = logging.getLogger(__name__ + "." + self.__class__.__name__)
@@ -222,9 +277,25 @@ class Session(object):
 
         self._api_user = api_user
 
+        self._read_only = read_only
+
         # Currently pending operations.
         self.recorded_operations = ftrack_api.operation.Operations()
-        self._record_operations = collections.defaultdict(lambda: True)
+
+        # Identifies settings of this session changed in a context, such as
+        # record_operations, falling back to these defaults otherwise.
+        self._context_key = next(_SESSION_CONTEXT_KEYS)
+        self._record_operations_default = not read_only
+
+        # Weak references to entities holding local values, keyed by id, so
+        # that only those need resetting on commit and rollback.
+        self._modified_entities = {}
+
+        # Time remote values were last merged for entities with a freshness
+        # policy, keyed by entity type and then entity id. Records for each
+        # entity type are ordered from least to most recently loaded.
+        self.freshness_policies = dict(freshness_policies or {})
+        self._loaded_at = collections.defaultdict(collections.OrderedDict)
 
         self.cache_key_maker = cache_key_maker
         if self.cache_key_maker is None:
@@ -232,7 +303,29 @@ class Session(object):
 
         # Enforce always having a memory cache at top level so that the same
         # in-memory instance is returned from session.
-        self.cache = ftrack_api.cache.LayeredCache([ftrack_api.cache.MemoryCache()])
+        negative_cache = None
+        if negative_cache_ttl is not None:
+            negative_cache = ftrack_api.cache.NegativeCache(ttl=negative_cache_ttl)
+
+        if memory_cache_max_entries is None and memory_cache_max_bytes is None:
+            memory_cache = ftrack_api.cache.MemoryCache()
+        else:
+            memory_cache = ftrack_api.cache.BoundedMemoryCache(
+                max_entries=memory_cache_max_entries,
+                max_bytes=memory_cache_max_bytes,
+                is_evictable=self._is_evictable,
+                size_of=self._approximate_size,
+            )
+
+        statistics = None
+        if cache_statistics:
+            statistics = ftrack_api.cache.CacheStatistics(
+                categorise=self.cache_key_entity_type
+            )
+
+        self.cache = ftrack_api.cache.LayeredCache(
+            [memory_cache], negative_cache=negative_cache, statistics=statistics
+        )
 
         if cache is not None:
             if callable(cache):
@@ -242,6 +335,23 @@ class Session(object):
                 self.cache.caches.append(cache)
 
         self._thread_lock = threading.RLock()
+
+        # Cache traffic for entities merged from a query page is batched per
+        # thread, mapping thread ident to batch state.
+        self._cache_batches = {}
+
+        # Active scopes recording entities attached within them, mapping thread
+        # ident to a list of scopes from outermost to innermost.
+        self._scopes = {}
+
+        # Identical read only calls made concurrently from several threads are
+        # sent once, with the other callers sharing the response. Set to False
+        # to always send a request per call.
+        self.coalesce_requests = True
+        self._in_flight_lock = threading.Lock()
+        self._in_flight_calls = {}
+        self._call_stats = {"requests": 0, "coalesced": 0}
+
         self._managed_request = None
         self._request = requests.Session()
 
@@ -268,8 +378,8 @@ class Session(object):
         self._request.auth = SessionAuthentication(self._api_key, self._api_user)
         self.request_timeout = timeout
 
-        # Auto populating state is now thread-local
-        self._auto_populate = collections.defaultdict(lambda: auto_populate)
+        # Auto populating state is local to each thread and asyncio task.
+        self._auto_populate_default = auto_populate
 
         # Fetch server information and in doing so also check credentials.
         self._server_information = self._fetch_server_information()
@@ -366,23 +476,42 @@ class Session(object):
 
     @property
     def auto_populate(self):
-        """The current state of auto populate, stored per thread."""
-        return self._auto_populate[threading.current_thread().ident]
+        """The current state of auto populate, stored per context.
+
+        Each thread starts from the value the session was initialised with.
+        An :mod:`asyncio` task starts from the value current when it was
+        created.
+
+        """
+        return _AUTO_POPULATE.get().get(self._context_key, self._auto_populate_default)
 
     @auto_populate.setter
     def auto_populate(self, value):
-        """Setter for auto_populate, stored per thread."""
-        self._auto_populate[threading.current_thread().ident] = value
+        """Setter for auto_populate, stored per context."""
+        _set_context_setting(_AUTO_POPULATE, self._context_key, value)
 
     @property
     def record_operations(self):
-        """The current state of record operations, stored per thread."""
-        return self._record_operations[threading.current_thread().ident]
+        """The current state of record operations, stored per context.
+
+        Each thread starts from the value the session was initialised with.
+        An :mod:`asyncio` task starts from the value current when it was
+        created.
+
+        """
+        return _RECORD_OPERATIONS.get().get(
+            self._context_key, self._record_operations_default
+        )
 
     @record_operations.setter
     def record_operations(self, value):
-        """Setter for record operations, stored per thread."""
-        self._record_operations[threading.current_thread().ident] = value
+        """Setter for record operations, stored per context."""
+        _set_context_setting(_RECORD_OPERATIONS, self._context_key, value)
+
+    @property
+    def read_only(self):
+        """Return whether session is read only."""
+        return self._read_only
 
     @property
     def closed(self):
@@ -414,6 +543,95 @@ class Session(object):
         """Return event hub."""
         return self._event_hub
 
+    @property
+    def call_stats(self):
+        """Return mapping of server call counters.
+
+        *requests* counts requests sent to the server whilst *coalesced* counts
+        calls that shared the response of an identical request already in
+        flight instead of sending their own.
+
+        """
+        with self._in_flight_lock:
+            return dict(self._call_stats)
+
+    def cache_stats(self, top=10, reset=False):
+        """Return mapping of statistics describing cache effectiveness.
+
+        *layers* lists hits, misses, back-fills and seconds spent per cache
+        layer, with the same counters per entity type under *categories*.
+        *hot_keys* and *missed_keys* list the *top* most retrieved and most
+        missed cache keys with their counts. Where applicable, *negative*,
+        *memory* and *calls* hold the counters of the negative cache, bounded
+        memory cache and :attr:`call_stats` respectively.
+
+        If *reset* is True, reset the counters after returning them.
+
+        .. note::
+
+            Per layer counters are only recorded for sessions constructed with
+            *cache_statistics* enabled. Set ``session.cache.statistics`` to
+            None to stop recording.
+
+        """
+        statistics = self.cache.statistics
+        if statistics is not None:
+            report = statistics.report(
+                names=[cache.__class__.__name__ for cache in self.cache.caches],
+                top=top,
+            )
+        else:
+            report = {"layers": [], "hot_keys": [], "missed_keys": []}
+
+        negative_cache = self.cache.negative_cache
+        if negative_cache is not None:
+            report["negative"] = dict(negative_cache.stats)
+
+        local_stats = getattr(self._local_cache, "stats", None)
+        if local_stats is not None:
+            report["memory"] = dict(local_stats)
+
+        report["calls"] = self.call_stats
+
+        if reset:
+            self.reset_cache_stats()
+
+        return report
+
+    def reset_cache_stats(self):
+        """Reset cache statistics counters."""
+        if self.cache.statistics is not None:
+            self.cache.statistics.reset()
+
+        negative_cache = self.cache.negative_cache
+        if negative_cache is not None:
+            for name in negative_cache.stats:
+                negative_cache.stats[name] = 0
+
+        local_stats = getattr(self._local_cache, "stats", None)
+        if local_stats is not None:
+            for name in local_stats:
+                local_stats[name] = 0
+
+        with self._in_flight_lock:
+            for name in self._call_stats:
+                self._call_stats[name] = 0
+
+    def cache_key_entity_type(self, key):
+        """Return entity type of cache *key* or None if not recognised.
+
+        .. note::
+
+            Only keys made by :class:`~ftrack_api.cache.StringKeyMaker`, the
+            default :attr:`cache_key_maker`, are recognised. Lookups with keys
+            from other key makers are counted without a category.
+
+        """
+        if isinstance(key, str) and key.startswith("('"):
+            return key[2 : key.find("'", 2)]
+
+        return None
+
     @property
     def _local_cache(self):
         """Return top level memory cache."""
@@ -453,6 +671,12 @@ class Session(object):
 
         Use this to ensure that session is cleaned up properly after use.
 
+        .. note::
+
+            Values of entities held in the local cache are cleared, except for
+            primary key values, to break reference cycles between them. Read
+            any values needed after closing beforehand.
+
         """
         if self.closed:
             self.logger.debug("Session already closed.")
@@ -470,7 +694,11 @@ class Session(object):
         self.recorded_operations.clear()
 
         # Clear top level cache (expected to be enforced memory cache).
-        self._local_cache.clear()
+        self._clear_local_cache()
+        self._modified_entities.clear()
+        self._loaded_at.clear()
+        if self.cache.negative_cache is not None:
+            self.cache.negative_cache.clear()
 
         # Close connections.
         self._request.close()
@@ -483,6 +711,12 @@ class Session(object):
         except ftrack_api.exception.EventHubConnectionError:
             pass
 
+        # Forget settings changed in the current context.
+        for variable in (_AUTO_POPULATE, _RECORD_OPERATIONS):
+            _reset_context_setting(
+                variable, self._context_key, ftrack_api.symbol.NOT_SET
+            )
+
         self.logger.debug("Session closed.")
 
     def reset(self):
@@ -500,8 +734,9 @@ class Session(object):
 
         .. warning::
 
-            Previously attached entities are not reset in memory and will retain
-            their state, but should not be used. Doing so will cause errors.
+            Previously attached entities are cleared in memory, except for
+            their primary key values, to break reference cycles between them.
+            They should not be used. Doing so will cause errors.
 
         """
         if self.recorded_operations:
@@ -513,7 +748,11 @@ class Session(object):
         self.recorded_operations.clear()
 
         # Clear top level cache (expected to be enforced memory cache).
-        self._local_cache.clear()
+        self._clear_local_cache()
+        self._modified_entities.clear()
+        self._loaded_at.clear()
+        if self.cache.negative_cache is not None:
+            self.cache.negative_cache.clear()
 
         # Re-configure certain session aspects that may be dependant on cache.
         self._configure_locations()
@@ -525,6 +764,303 @@ class Session(object):
             synchronous=True,
         )
 
+    def expunge(self, entities, cascade=False):
+        """Detach *entities* from session, releasing them from the local cache.
+
+        *entities* may be a single entity or a list of entities. If *cascade*
+        is True then entities held in their collection attributes are also
+        expunged, recursively. Referenced entities, such as a parent or status,
+        are not followed as they are commonly shared with other entities.
+
+        Only loaded values are followed, nothing is fetched from the server.
+
+        Return list of expunged entities.
+
+        .. note::
+
+            Only the local memory cache is affected, any deeper cache layers
+            keep their copies. Pending operations are not discarded.
+
+        .. warning::
+
+            Expunged entities retain their state but are no longer attached.
+            Retrieve them from the session again to continue using them.
+
+        """
+        if isinstance(entities, ftrack_api.entity.base.Entity):
+            entities = [entities]
+
+        expunged = {}
+        seen = set()
+        pending = list(entities)
+        with self.auto_populating(False):
+            while pending:
+                entity = pending.pop()
+                if id(entity) in seen:
+                    continue
+
+                seen.add(id(entity))
+
+                try:
+                    entity_key = self.cache_key_maker.key(
+                        ftrack_api.inspection.identity(entity)
+                    )
+                    attached = self._local_cache.get(entity_key)
+                except KeyError:
+                    continue
+
+                expunged[entity_key] = attached
+
+                if cascade:
+                    for collection in self._loaded_collections(attached):
+                        pending.extend(collection)
+
+        return self._expunge(expunged)
+
+    def _loaded_collections(self, entity):
+        """Yield loaded local and remote collections of *entity*."""
+        for attribute in entity.attributes:
+            if not isinstance(
+                attribute, ftrack_api.attribute.AbstractCollectionAttribute
+            ):
+                continue
+
+            for value in (
+                attribute.get_local_value(entity),
+                attribute.get_remote_value(entity),
+            ):
+                if isinstance(value, ftrack_api.collection.MappedCollectionProxy):
+                    value = value.collection
+
+                if isinstance(value, ftrack_api.collection.Collection):
+                    yield value
+
+    def _clear_local_cache(self):
+        """Clear local cache, breaking reference cycles of cached entities.
+
+        Entities reference each other through collections and reference
+        attributes, such as a parent and its children. Clearing their values
+        lets them be freed by reference counting rather than waiting for the
+        garbage collector to find the cycles.
+
+        """
+        for value in self._local_cache.values():
+            if isinstance(value, ftrack_api.entity.base.Entity):
+                value._clear_values()
+
+        self._local_cache.clear()
+
+    def _expunge(self, entities):
+        """Remove *entities* mapping of cache keys to entities from local cache.
+
+        Return list of removed entities.
+
+        """
+        if entities:
+            self._local_cache.remove_many(list(entities))
+
+            for entity in entities.values():
+                self._modified_entities.pop(id(entity), None)
+                loaded = self._loaded_at.get(entity.entity_type)
+                if loaded:
+                    loaded.pop(id(entity), None)
+
+        return list(entities.values())
+
+    def scope(self):
+        """Return context expunging clean entities attached within it on exit.
+
+        Useful for long running processes to release entities retrieved whilst
+        handling an event::
+
+            with session.scope():
+                for task in session.query("Task where parent.id is " + shot_id):
+                    print(task["name"])
+
+        Entities already in the local cache when merged within the scope, such
+        as shared statuses or projects, are kept, as are entities with local
+        modifications or pending operations. Scopes apply to the current thread
+        and may be nested.
+
+        """
+        return SessionScope(self)
+
+    def _enter_scope(self, scope):
+        """Start recording entities attached in current thread for *scope*."""
+        ident = threading.current_thread().ident
+        self._scopes.setdefault(ident, []).append(scope)
+
+    def _exit_scope(self, scope):
+        """Stop recording for *scope* and expunge its clean entities.
+
+        Return list of expunged entities.
+
+        """
+        ident = threading.current_thread().ident
+        scopes = self._scopes[ident]
+        scopes.remove(scope)
+        if not scopes:
+            del self._scopes[ident]
+
+        entities = {}
+        for entity_key in scope.keys:
+            try:
+                entity = self._local_cache.get(entity_key)
+            except KeyError:
+                continue
+
+            if self._is_evictable(entity):
+                entities[entity_key] = entity
+
+        return self._expunge(entities)
+
+    def _record_scoped(self, entity_key):
+        """Record *entity_key* in active scopes if not yet in local cache."""
+        scopes = self._scopes.get(threading.current_thread().ident)
+        if not scopes:
+            return
+
+        try:
+            self._local_cache.get(entity_key)
+        except KeyError:
+            for scope in scopes:
+                scope.keys.add(entity_key)
+
+    def export_cache(self, path):
+        """Export remote values of entities in the local cache to *path*.
+
+        The snapshot is tagged with the current schemas and time so that it can
+        later be loaded with :meth:`import_cache` to warm a new session without
+        querying the server. Local modifications and entities created but not
+        yet persisted are not exported.
+
+        Return number of entities exported.
+
+        """
+        with self.auto_populating(False):
+            entities = []
+            for entity in self._local_cache.values():
+                if not isinstance(entity, ftrack_api.entity.base.Entity):
+                    continue
+
+                if self.recorded_operations.is_created(
+                    entity.entity_type, ftrack_api.inspection.primary_key(entity)
+                ):
+                    continue
+
+                entities.append(entity)
+
+        codec = ftrack_api.codec.BinaryEntityCodec(self)
+        data = pickle.dumps((time.time(), codec.encode(entities)), protocol=5)
+
+        # Write to temporary file first so that a partially written snapshot is
+        # never read.
+        directory = os.path.dirname(os.path.abspath(path))
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(file_descriptor, "wb") as file_object:
+                file_object.write(data)
+
+            os.replace(temporary_path, path)
+
+        except Exception:
+            os.remove(temporary_path)
+            raise
+
+        self.logger.debug(L("Exported {0} entities to {1}.", len(entities), path))
+        return len(entities)
+
+    def import_cache(self, path, revalidate_after=None):
+        """Import entities exported with :meth:`export_cache` from *path*.
+
+        Entities are merged into the session without querying the server. A
+        snapshot exported for different schemas is ignored.
+
+        If *revalidate_after* is set and the snapshot is older than that many
+        seconds, the imported entities are refreshed from the server in a
+        background thread, with one :meth:`populate` call per entity type.
+
+        Return list of imported entities.
+
+        .. note::
+
+            Imported entities of types with a freshness policy are considered
+            loaded when the snapshot was exported.
+
+        """
+        with open(path, "rb") as file_object:
+            exported_at, data = pickle.load(file_object)
+
+        codec = ftrack_api.codec.BinaryEntityCodec(self)
+        try:
+            entities = codec.decode(data)
+        except KeyError:
+            self.logger.warning(
+                L("Ignoring cache snapshot {0} exported for other schemas.", path)
+            )
+            return []
+
+        age = max(time.time() - exported_at, 0)
+
+        merged = {}
+        batch = self._start_cache_batch(entities)
+        try:
+            imported = [self.merge(entity, merged) for entity in entities]
+        finally:
+            self._finish_cache_batch(batch)
+
+        # Imported values are older than any loaded since the export so are
+        # recorded as least recently loaded.
+        loaded_at = time.monotonic() - age
+        for entity in reversed(imported):
+            if entity.entity_type in self.freshness_policies:
+                loaded = self._loaded_at[entity.entity_type]
+                loaded[id(entity)] = (weakref.ref(entity), loaded_at)
+                loaded.move_to_end(id(entity), last=False)
+
+        self.logger.debug(
+            L("Imported {0} entities from {1} aged {2}s.", len(imported), path, age)
+        )
+
+        if revalidate_after is not None and age >= revalidate_after and imported:
+            thread = threading.Thread(
+                target=self._revalidate_imported,
+                args=(imported,),
+                name="ftrack-api-cache-revalidation",
+            )
+            thread.daemon = True
+            thread.start()
+
+        return imported
+
+    def _revalidate_imported(self, entities):
+        """Refresh remote values of imported *entities* by entity type."""
+        by_type = collections.OrderedDict()
+        with self.auto_populating(False):
+            for entity in entities:
+                entity_entities, projections = by_type.setdefault(
+                    entity.entity_type, ([], set())
+                )
+                entity_entities.append(entity)
+                for attribute in entity.attributes:
+                    if (
+                        attribute.name not in entity.primary_key_attributes
+                        and attribute.get_remote_value(entity)
+                        is not ftrack_api.symbol.NOT_SET
+                    ):
+                        projections.add(attribute.name)
+
+        for entity_type, (entity_entities, projections) in by_type.items():
+            if not projections:
+                continue
+
+            try:
+                self.populate(entity_entities, ", ".join(sorted(projections)))
+            except Exception:
+                self.logger.exception(
+                    L("Failed to revalidate imported {0} entities.", entity_type)
+                )
+
     def auto_populating(self, auto_populate):
         """Temporarily set auto populate to *auto_populate*.
 
@@ -548,7 +1084,15 @@ class Session(object):
             with session.operation_recording(False):
                 entity['name'] = 'change_not_recorded'
 
+        .. note::
+
+            Operations are never recorded for a read only session, so the
+            returned context does nothing.
+
         """
+        if self._read_only:
+            return _NO_OPERATION_RECORDING
+
         return OperationRecordingContext(self, record_operations)
 
     @property
@@ -608,6 +1152,156 @@ class Session(object):
 
         return result[0]["data"]
 
+    def _is_evictable(self, value):
+        """Return whether cached *value* may be evicted from memory."""
+        if not isinstance(value, ftrack_api.entity.base.Entity):
+            return True
+
+        with self.auto_populating(False):
+            try:
+                entity_key = ftrack_api.inspection.primary_key(value)
+            except KeyError:
+                return False
+
+            if self.recorded_operations.has_entity(value.entity_type, entity_key):
+                return False
+
+            # Local copies made on reading a collection are not changes.
+            return not any(
+                attribute.is_modified(value) for attribute in value.attributes
+            )
+
+    def _release_pinned(self):
+        """Allow entities no longer holding local state to be evicted."""
+        if isinstance(self._local_cache, ftrack_api.cache.BoundedMemoryCache):
+            self._local_cache.release_pinned()
+
+    def _approximate_size(self, value):
+        """Return approximate size in bytes of cached *value*."""
+        size = sys.getsizeof(value)
+        if isinstance(value, ftrack_api.entity.base.Entity):
+            for attribute in value.attributes:
+                for attribute_value in (
+                    attribute.get_local_value(value),
+                    attribute.get_remote_value(value),
+                ):
+                    if attribute_value is not ftrack_api.symbol.NOT_SET:
+                        size += sys.getsizeof(attribute_value)
+
+        return size
+
+    def _mark_loaded(self, entity):
+        """Record that remote values for *entity* were just retrieved."""
+        if entity.entity_type in self.freshness_policies:
+            loaded = self._loaded_at[entity.entity_type]
+            loaded[id(entity)] = (weakref.ref(entity), time.monotonic())
+            loaded.move_to_end(id(entity))
+
+    def _revalidate_if_stale(self, entity):
+        """Refresh loaded remote values of *entity* if no longer fresh.
+
+        Other stale entities of the same type are refreshed in the same
+        :meth:`populate` call, up to :attr:`_revalidation_batch_size` entities.
+
+        """
+        max_age = self.freshness_policies.get(entity.entity_type)
+        if max_age is None:
+            return
+
+        loaded = self._loaded_at[entity.entity_type]
+        record = loaded.get(id(entity))
+        if record is None:
+            return
+
+        if record[0]() is not entity:
+            # Record of a reclaimed entity whose id has been reused.
+            del loaded[id(entity)]
+            return
+
+        now = time.monotonic()
+        if now - record[1] < max_age:
+            return
+
+        # Records are ordered by load time so only the stale records at the
+        # start need visiting.
+        stale = [entity]
+        reclaimed = []
+        for key, (reference, loaded_at) in loaded.items():
+            if now - loaded_at < max_age or len(stale) >= self._revalidation_batch_size:
+                break
+
+            other = reference()
+            if other is None:
+                reclaimed.append(key)
+
+            elif other is not entity:
+                stale.append(other)
+
+        for key in reclaimed:
+            del loaded[key]
+
+        # Mark as fresh before populating so that accessing attributes whilst
+        # populating does not trigger another revalidation.
+        projections = set()
+        for stale_entity in stale:
+            loaded[id(stale_entity)] = (weakref.ref(stale_entity), now)
+            loaded.move_to_end(id(stale_entity))
+            for attribute in stale_entity.attributes:
+                if (
+                    attribute.get_local_value(stale_entity) is ftrack_api.symbol.NOT_SET
+                    and attribute.get_remote_value(stale_entity)
+                    is not ftrack_api.symbol.NOT_SET
+                ):
+                    projections.add(attribute.name)
+
+        if projections:
+            self.logger.debug(
+                L(
+                    "Revalidating {0} stale {1} entities.",
+                    len(stale),
+                    entity.entity_type,
+                )
+            )
+            self.populate(stale, ", ".join(sorted(projections)))
+
+    def _mark_modified(self, entity):
+        """Record that *entity* holds local values."""
+        self._modified_entities[id(entity)] = weakref.ref(entity)
+
+    def _pop_modified(self):
+        """Return attached entities holding local values and stop tracking them.
+
+        Only entities still present in the top level cache are returned so that
+        detached entities keep their local state.
+
+        """
+        references = self._modified_entities
+        self._modified_entities = {}
+
+        entities = []
+        with self.auto_populating(False):
+            for reference in list(references.values()):
+                entity = reference()
+                if entity is None:
+                    continue
+
+                try:
+                    entity_key = self.cache_key_maker.key(
+                        ftrack_api.inspection.identity(entity)
+                    )
+                except KeyError:
+                    continue
+
+                try:
+                    attached = self._local_cache.get(entity_key)
+                except KeyError:
+                    continue
+
+                if attached is entity:
+                    entities.append(entity)
+
+        return entities
+
     def create(self, entity_type, data=None, reconstructing=False):
         """Create and return an entity of *entity_type* with initial *data*.
 
@@ -753,7 +1447,17 @@ class Session(object):
         return entity
 
     def delete(self, entity):
-        """Mark *entity* for deletion."""
+        """Mark *entity* for deletion.
+
+        .. note::
+
+            Deleting an entity that was created but not yet persisted discards
+            any pending updates for it.
+
+        """
+        if self._read_only:
+            raise ftrack_api.exception.ReadOnlySessionError()
+
         if self.record_operations:
             self.recorded_operations.push(
                 ftrack_api.operation.DeleteEntityOperation(
@@ -773,25 +1477,17 @@ class Session(object):
         self.logger.debug(L("Get {0} with key {1}", entity_type, entity_key))
 
         primary_key_definition = self.types[entity_type].primary_key_attributes
-        if isinstance(entity_key, str):
-            entity_key = [entity_key]
-
-        if len(entity_key) != len(primary_key_definition):
-            raise ValueError(
-                "Incompatible entity_key {0!r} supplied. Entity type {1} "
-                "expects a primary key composed of {2} values ({3}).".format(
-                    entity_key,
-                    entity_type,
-                    len(primary_key_definition),
-                    ", ".join(primary_key_definition),
-                )
-            )
+        entity_key = self._normalise_entity_key(entity_type, entity_key)
 
         entity = None
         try:
             entity = self._get(entity_type, entity_key)
 
         except KeyError:
+            if self._is_known_missing(entity_type, entity_key):
+                self.logger.debug("Entity recorded as missing. Skipping query.")
+                return None
+
             # Query for matching entity.
             self.logger.debug("Entity not present in cache. Issuing new query.")
             condition = []
@@ -803,9 +1499,156 @@ class Session(object):
             results = self.query(expression).all()
             if results:
                 entity = results[0]
+            else:
+                self._record_missing(entity_type, entity_key)
 
         return entity
 
+    def get_many(self, entity_type, entity_keys, max_expression_length=4000):
+        """Return entities of *entity_type* matching *entity_keys*.
+
+        Each key in *entity_keys* is resolved against the configured cache
+        first. All keys not present in the cache are then fetched from the
+        server using a single query per chunk, where each chunk is limited so
+        that its condition does not exceed *max_expression_length* characters.
+
+        Return a list aligned with *entity_keys*, with None in place of any
+        key that did not match an entity.
+
+        """
+        self.logger.debug(L("Get many {0} with keys {1}", entity_type, entity_keys))
+
+        primary_key_definition = self.types[entity_type].primary_key_attributes
+        entity_keys = [
+            tuple(map(str, self._normalise_entity_key(entity_type, entity_key)))
+            for entity_key in entity_keys
+        ]
+
+        found = {}
+        missing = {}
+        for entity_key in entity_keys:
+            if entity_key in found or entity_key in missing:
+                continue
+
+            try:
+                found[entity_key] = self._get(entity_type, entity_key)
+            except KeyError:
+                if not self._is_known_missing(entity_type, entity_key):
+                    missing[entity_key] = None
+
+        if missing:
+            self.logger.debug(
+                L(
+                    "{0} entities not present in cache. Issuing query for "
+                    "missing keys.",
+                    len(missing),
+                )
+            )
+
+            for condition in self._chunk_key_conditions(
+                primary_key_definition, missing, max_expression_length
+            ):
+                expression = "{0} where {1}".format(entity_type, condition)
+                for entity in self.query(expression).all():
+                    entity_key = tuple(
+                        ftrack_api.inspection.primary_key(entity).values()
+                    )
+                    found[entity_key] = entity
+
+            for entity_key in missing:
+                if entity_key not in found:
+                    self._record_missing(entity_type, entity_key)
+
+        return [found.get(entity_key) for entity_key in entity_keys]
+
+    def _normalise_entity_key(self, entity_type, entity_key):
+        """Return *entity_key* for *entity_type* as a list of values.
+
+        Raise :exc:`ValueError` if *entity_key* does not match the primary key
+        definition of *entity_type*.
+
+        """
+        primary_key_definition = self.types[entity_type].primary_key_attributes
+        if isinstance(entity_key, str):
+            entity_key = [entity_key]
+
+        if len(entity_key) != len(primary_key_definition):
+            raise ValueError(
+                "Incompatible entity_key {0!r} supplied. Entity type {1} "
+                "expects a primary key composed of {2} values ({3}).".format(
+                    entity_key,
+                    entity_type,
+                    len(primary_key_definition),
+                    ", ".join(primary_key_definition),
+                )
+            )
+
+        return entity_key
+
+    def _chunk_key_conditions(
+        self, primary_key_definition, entity_keys, max_expression_length
+    ):
+        """Yield query conditions matching *entity_keys*.
+
+        Each condition matches a subset of *entity_keys* and is kept under
+        *max_expression_length* characters where possible. A single key is
+        never split across conditions.
+
+        """
+        if len(primary_key_definition) == 1:
+            template = primary_key_definition[0] + " in ({0})"
+            separator = ", "
+            terms = ['"{0}"'.format(entity_key[0]) for entity_key in entity_keys]
+
+        else:
+            template = "({0})"
+            separator = " or "
+            terms = [
+                "({0})".format(
+                    " and ".join(
+                        '{0} is "{1}"'.format(key, value)
+                        for key, value in zip(primary_key_definition, entity_key)
+                    )
+                )
+                for entity_key in entity_keys
+            ]
+
+        overhead = len(template.format(""))
+        chunk = []
+        length = overhead
+        for term in terms:
+            term_length = len(term) + (len(separator) if chunk else 0)
+            if chunk and length + term_length > max_expression_length:
+                yield template.format(separator.join(chunk))
+                chunk = []
+                length = overhead
+                term_length = len(term)
+
+            chunk.append(term)
+            length += term_length
+
+        if chunk:
+            yield template.format(separator.join(chunk))
+
+    def _is_known_missing(self, entity_type, entity_key):
+        """Return whether *entity_key* is recorded as missing remotely."""
+        negative_cache = self.cache.negative_cache
+        if negative_cache is None:
+            return False
+
+        return (
+            self.cache_key_maker.key((str(entity_type), list(map(str, entity_key))))
+            in negative_cache
+        )
+
+    def _record_missing(self, entity_type, entity_key):
+        """Record *entity_key* as missing remotely if configured to."""
+        negative_cache = self.cache.negative_cache
+        if negative_cache is not None:
+            negative_cache.add(
+                self.cache_key_maker.key((str(entity_type), list(map(str, entity_key))))
+            )
+
     def _get(self, entity_type, entity_key):
         """Return cached entity of *entity_type* with unique *entity_key*.
 
@@ -871,13 +1714,73 @@ class Session(object):
         results = self.call(batch)
 
         # Merge entities into local cache and return merged entities.
-        data = []
-        merged = dict()
-        for entity in results[0]["data"]:
-            data.append(self._merge_recursive(entity, merged))
+        batch = self._start_cache_batch(results[0]["data"])
+        try:
+            data = self._merge_page(results[0]["data"])
+        finally:
+            self._finish_cache_batch(batch)
 
         return data, results[0]["metadata"]
 
+    def _start_cache_batch(self, entities):
+        """Start batching cache traffic for merging *entities*.
+
+        All cache keys for *entities* and the entities they reference are
+        retrieved with a single :meth:`~ftrack_api.cache.Cache.get_many` call
+        per cache layer. Until :meth:`_finish_cache_batch` is called, merged
+        entities are only set in the local cache with deeper layers updated
+        together at the end.
+
+        Return batch state or None if no batching is performed, as when there
+        are no layers beyond the local cache or a batch is already active.
+
+        """
+        ident = threading.current_thread().ident
+        if len(self.cache.caches) < 2 or ident in self._cache_batches:
+            return None
+
+        keys = []
+        seen = set()
+        pending = list(entities)
+        with self.auto_populating(False):
+            while pending:
+                entity = pending.pop()
+                if id(entity) in seen:
+                    continue
+
+                seen.add(id(entity))
+                keys.append(
+                    self.cache_key_maker.key(ftrack_api.inspection.identity(entity))
+                )
+
+                for attribute in entity.attributes:
+                    value = attribute.get_remote_value(entity)
+                    if isinstance(value, ftrack_api.entity.base.Entity):
+                        pending.append(value)
+
+                    elif isinstance(value, ftrack_api.collection.Collection):
+                        pending.extend(value)
+
+                    elif isinstance(value, ftrack_api.collection.MappedCollectionProxy):
+                        pending.extend(value.collection)
+
+        batch = {
+            "keys": set(keys),
+            "found": self.cache.get_many(keys),
+            "changed": {},
+        }
+        self._cache_batches[ident] = batch
+        return batch
+
+    def _finish_cache_batch(self, batch):
+        """Finish cache *batch*, setting changed entities in all layers."""
+        if batch is None:
+            return
+
+        del self._cache_batches[threading.current_thread().ident]
+        if batch["changed"]:
+            self.cache.set_many(batch["changed"])
+
     def merge(self, value, merged=None):
         """Merge *value* into session and return merged value.
 
@@ -973,6 +1876,59 @@ class Session(object):
 
         return attached
 
+    def _merge_page(self, entities, merged=None):
+        """Merge page of *entities* and all their attributes recursively.
+
+        Return list of merged entities.
+
+        Equivalent to calling :meth:`_merge_recursive` for each entity, but
+        the session lock is acquired and operation recording suspended once
+        for the whole page. Entities referenced from several records, such as
+        a shared status or project, are only visited once.
+
+        """
+        if merged is None:
+            merged = {}
+
+        with self._thread_lock, self.operation_recording(False):
+            with self.auto_populating(False):
+                attached = [self._merge_entity(entity, merged) for entity in entities]
+
+                # Merge referenced entities not merged along with the entity
+                # referencing them, as happens when the reference is unchanged.
+                visited = set()
+                pending = list(reversed(entities))
+                while pending:
+                    entity = pending.pop()
+                    if id(entity) in visited:
+                        continue
+
+                    visited.add(id(entity))
+
+                    entity_key = self.cache_key_maker.key(
+                        ftrack_api.inspection.identity(entity)
+                    )
+                    if entity_key not in merged:
+                        self._merge_entity(entity, merged)
+
+                    references = []
+                    for attribute in entity.attributes:
+                        value = attribute.get_remote_value(entity)
+                        if isinstance(value, ftrack_api.entity.base.Entity):
+                            references.append(value)
+
+                        elif isinstance(value, ftrack_api.collection.Collection):
+                            references.extend(value)
+
+                        elif isinstance(
+                            value, ftrack_api.collection.MappedCollectionProxy
+                        ):
+                            references.extend(value.collection)
+
+                    pending.extend(reversed(references))
+
+        return attached
+
     def _merge_entity(self, entity, merged=None):
         """Merge *entity* into session returning merged entity.
 
@@ -1008,12 +1964,24 @@ class Session(object):
                     "Entity not already processed for key {0}.".format(entity_key)
                 )
 
+            if self._scopes:
+                self._record_scoped(entity_key)
+
             # Check for existing instance of entity in cache.
             log_debug and self.logger.debug(
                 "Checking for entity in cache with key {0}".format(entity_key)
             )
+            batch = self._cache_batches.get(threading.current_thread().ident)
             try:
-                attached_entity = self.cache.get(entity_key)
+                if batch is None or entity_key not in batch["keys"]:
+                    attached_entity = self.cache.get(entity_key)
+
+                elif entity_key in batch["found"]:
+                    attached_entity = batch["found"][entity_key]
+
+                else:
+                    # Already known to be missing from deeper layers.
+                    attached_entity = self._local_cache.get(entity_key)
 
                 log_debug and self.logger.debug(
                     "Retrieved existing entity from cache: {0} at {1}".format(
@@ -1035,8 +2003,20 @@ class Session(object):
             # Mark entity as seen to avoid infinite loops.
             merged[entity_key] = attached_entity
 
-            changes = attached_entity.merge(entity, merged=merged)
-            if changes:
+            # Change details are only needed for logging.
+            changes = attached_entity._merge(
+                entity,
+                merged,
+                self._merge,
+                [] if log_debug else None,
+                merge_local=not self._read_only,
+            )
+            if changes and batch is not None:
+                self._local_cache.set(entity_key, attached_entity)
+                batch["changed"][entity_key] = attached_entity
+                self.logger.debug("Local cache updated with merged entity.")
+
+            elif changes:
                 self.cache.set(entity_key, attached_entity)
                 self.logger.debug("Cache updated with merged entity.")
 
@@ -1046,6 +2026,9 @@ class Session(object):
                     "detected."
                 )
 
+            if self.freshness_policies:
+                self._mark_loaded(attached_entity)
+
         return attached_entity
 
     def populate(self, entities, projections):
@@ -1148,7 +2131,16 @@ class Session(object):
             # repeated calls or perhaps raise an error?
 
     def commit(self):
-        """Commit all local changes to the server."""
+        """Commit all local changes to the server.
+
+        .. note::
+
+            Does nothing for a read only session.
+
+        """
+        if self._read_only:
+            return
+
         batch = []
 
         with self._thread_lock, self.auto_populating(False):
@@ -1306,29 +2298,48 @@ class Session(object):
 
             # As optimisation, clear local values which are not primary keys to
             # avoid redundant merges when merging references. Note: primary keys
-            # remain as needed for cache retrieval on new entities.
+            # remain as needed for cache retrieval on new entities. Only
+            # entities holding local values need visiting.
+            modified = self._pop_modified()
             with self.auto_populating(False), self.operation_recording(False):
-                for entity in list(self._local_cache.values()):
+                for entity in modified:
                     for attribute in entity:
                         if attribute not in entity.primary_key_attributes:
                             del entity[attribute]
 
-            # Process results merging into cache relevant data.
+            # Process results merging into cache relevant data in one pass
+            # sharing the identity map. Each entry is authoritative for its own
+            # entity so force that to merge even if already seen as a reference
+            # in a previous entry.
+            merged = {}
             for entry in result:
                 if entry["action"] in ("create", "update"):
+                    data = entry["data"]
+                    if isinstance(data, ftrack_api.entity.base.Entity):
+                        with self.auto_populating(False):
+                            entity_key = self.cache_key_maker.key(
+                                ftrack_api.inspection.identity(data)
+                            )
+
+                        merged.pop(entity_key, None)
+
                     # Merge returned entities into local cache.
-                    self.merge(entry["data"])
+                    self.merge(data, merged=merged)
 
                 elif entry["action"] == "delete":
                     # TODO: Detach entity - need identity returned?
                     # TODO: Expunge entity from cache.
                     pass
+
             # Clear remaining local state, including local values for primary
             # keys on entities that were merged.
+            modified.extend(self._pop_modified())
             with self.auto_populating(False), self.operation_recording(False):
-                for entity in list(self._local_cache.values()):
+                for entity in modified:
                     entity.clear()
 
+            self._release_pinned()
+
     def rollback(self):
         """Clear all recorded operations and local state.
 
@@ -1349,26 +2360,23 @@ class Session(object):
                 # primary key was local while not persisted. In addition, it
                 # makes no sense for failed created entities to exist in session
                 # or cache.
-                for operation in self.recorded_operations:
-                    if isinstance(
-                        operation, ftrack_api.operation.CreateEntityOperation
-                    ):
-                        entity_key = str(
-                            (
-                                str(operation.entity_type),
-                                list(operation.entity_key.values()),
-                            )
+                self.cache.remove_many(
+                    str(
+                        (
+                            str(operation.entity_type),
+                            list(operation.entity_key.values()),
                         )
-                        try:
-                            self.cache.remove(entity_key)
-                        except KeyError:
-                            pass
+                    )
+                    for operation in self.recorded_operations
+                    if isinstance(operation, ftrack_api.operation.CreateEntityOperation)
+                )
 
                 # Clear locally stored modifications on remaining entities.
-                for entity in list(self._local_cache.values()):
+                for entity in self._pop_modified():
                     entity.clear()
 
             self.recorded_operations.clear()
+            self._release_pinned()
 
     def _fetch_server_information(self):
         """Return server information."""
@@ -1615,21 +2623,25 @@ class Session(object):
         )
 
     def call(self, data):
-        """Make request to server with *data* batch describing the actions."""
+        """Make request to server with *data* batch describing the actions.
+
+        If :attr:`coalesce_requests` is True and *data* only contains read
+        actions, an identical call already in flight from another thread is
+        joined rather than sending a new request.
+
+        """
         url = self._server_url + "/api"
         headers = {"content-type": "application/json", "accept": "application/json"}
+        coalesce = self.coalesce_requests and all(
+            item.get("action") in self._COALESCABLE_ACTIONS for item in data
+        )
         data = self.encode(data, entity_attribute_strategy="modified_only")
 
         self.logger.debug(L("Calling server {0} with {1!r}", url, data))
         response = None
         try:
             result = {}
-            response = self._request.post(
-                url,
-                headers=headers,
-                data=data,
-                timeout=self.request_timeout,
-            )
+            response = self._post(url, headers, data, coalesce)
             self.logger.debug(L("Call took: {0}", response.elapsed.total_seconds()))
             self.logger.debug(L("Response: {0!r}", response.text))
 
@@ -1668,6 +2680,63 @@ class Session(object):
                 self._raise_server_error(error_message)
         return result
 
+    def _post(self, url, headers, data, coalesce=False):
+        """Return response from posting *data* to *url* with *headers*.
+
+        If *coalesce* is True then wait for and return the response of an
+        identical request already in flight, if any.
+
+        """
+        if coalesce:
+            with self._in_flight_lock:
+                flight = self._in_flight_calls.get(data)
+                leader = flight is None
+                if leader:
+                    flight = {
+                        "done": threading.Event(),
+                        "response": None,
+                        "error": None,
+                    }
+                    self._in_flight_calls[data] = flight
+
+            if not leader:
+                self.logger.debug("Joining identical call already in flight.")
+                flight["done"].wait()
+                with self._in_flight_lock:
+                    self._call_stats["coalesced"] += 1
+
+                if flight["error"] is not None:
+                    raise flight["error"]
+
+                return flight["response"]
+
+        with self._in_flight_lock:
+            self._call_stats["requests"] += 1
+
+        try:
+            response = self._request.post(
+                url,
+                headers=headers,
+                data=data,
+                timeout=self.request_timeout,
+            )
+
+        except Exception as error:
+            if coalesce:
+                flight["error"] = error
+            raise
+
+        else:
+            if coalesce:
+                flight["response"] = response
+            return response
+
+        finally:
+            if coalesce:
+                with self._in_flight_lock:
+                    del self._in_flight_calls[data]
+                flight["done"].set()
+
     def _raise_server_error(self, error_message):
         self.logger.exception(error_message)
         raise ftrack_api.exception.ServerError(error_message)
@@ -2367,6 +3436,55 @@ class Session(object):
                 raise
 
 
+#: Settings of sessions changed in the current context, such as within an
+#: :class:`AutoPopulatingContext`. Each holds a mapping of session context key
+#: to value that is replaced, never modified, on change so that it is not
+#: shared between contexts.
+_AUTO_POPULATE = contextvars.ContextVar("ftrack_api.session.auto_populate", default={})
+_RECORD_OPERATIONS = contextvars.ContextVar(
+    "ftrack_api.session.record_operations", default={}
+)
+
+#: Source of unique session context keys. Unlike :func:`id` these are never
+#: reused by a later session.
+_SESSION_CONTEXT_KEYS = itertools.count()
+
+
+def _set_context_setting(variable, key, value):
+    """Set *value* for *key* in mapping of *variable* and return previous value.
+
+    The previous value is :attr:`ftrack_api.symbol.NOT_SET` if *key* was not
+    set.
+
+    """
+    mapping = dict(variable.get())
+    previous = mapping.get(key, ftrack_api.symbol.NOT_SET)
+    mapping[key] = value
+    variable.set(mapping)
+    return previous
+
+
+def _reset_context_setting(variable, key, previous):
+    """Restore *previous* value of *key* in mapping of *variable*.
+
+    Only *key* is restored so that contexts entered and exited out of order,
+    or in different :mod:`asyncio` tasks, do not affect other sessions.
+
+    """
+    mapping = dict(variable.get())
+    if previous is ftrack_api.symbol.NOT_SET:
+        mapping.pop(key, None)
+    else:
+        mapping[key] = previous
+
+    variable.set(mapping)
+
+
+#: Context used in place of an :class:`OperationRecordingContext` for read only
+#: sessions.
+_NO_OPERATION_RECORDING = contextlib.nullcontext()
+
+
 class AutoPopulatingContext(object):
     """Context manager for temporary change of session auto_populate value."""
 
@@ -2375,16 +3493,21 @@ class AutoPopulatingContext(object):
         super(AutoPopulatingContext, self).__init__()
         self._session = session
         self._auto_populate = auto_populate
-        self._current_auto_populate = None
+        self._states = []
 
     def __enter__(self):
         """Enter context switching to desired auto populate setting."""
-        self._current_auto_populate = self._session.auto_populate
-        self._session.auto_populate = self._auto_populate
+        self._states.append(
+            _set_context_setting(
+                _AUTO_POPULATE, self._session._context_key, self._auto_populate
+            )
+        )
 
     def __exit__(self, exception_type, exception_value, traceback):
         """Exit context resetting auto populate to original setting."""
-        self._session.auto_populate = self._current_auto_populate
+        _reset_context_setting(
+            _AUTO_POPULATE, self._session._context_key, self._states.pop()
+        )
 
 
 class OperationRecordingContext(object):
@@ -2395,16 +3518,47 @@ class OperationRecordingContext(object):
         super(OperationRecordingContext, self).__init__()
         self._session = session
         self._record_operations = record_operations
-        self._current_record_operations = None
+        self._states = []
 
     def __enter__(self):
         """Enter context."""
-        self._current_record_operations = self._session.record_operations
-        self._session.record_operations = self._record_operations
+        self._states.append(
+            _set_context_setting(
+                _RECORD_OPERATIONS, self._session._context_key, self._record_operations
+            )
+        )
 
     def __exit__(self, exception_type, exception_value, traceback):
         """Exit context."""
-        self._session.record_operations = self._current_record_operations
+        _reset_context_setting(
+            _RECORD_OPERATIONS, self._session._context_key, self._states.pop()
+        )
+
+
+class SessionScope(object):
+    """Context manager expunging clean entities attached within it on exit."""
+
+    def __init__(self, session):
+        """Initialise scope for *session*."""
+        super(SessionScope, self).__init__()
+        self._session = session
+
+        #: Cache keys of entities attached within scope.
+        self.keys = set()
+
+        #: Entities expunged on exit.
+        self.expunged = []
+
+    def __enter__(self):
+        """Enter scope, recording entities attached from now on."""
+        self.keys.clear()
+        self.expunged = []
+        self._session._enter_scope(self)
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        """Exit scope, expunging clean entities attached within it."""
+        self.expunged = self._session._exit_scope(self)
 
 
 class OperationPayload(collections.abc.MutableMapping):
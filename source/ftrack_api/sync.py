@@ -0,0 +1,230 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2024 ftrack
+
+"""Incrementally synchronise a local replica of remote entities.
+
+A :class:`ReplicaSynchroniser` keeps a persistent cache layer up to date by
+only fetching entities modified since the previous synchronisation::
+
+    def cache(session):
+        codec = ftrack_api.codec.BinaryEntityCodec(session)
+        return ftrack_api.cache.SerialisedCache(
+            ftrack_api.cache.SqliteCache("/path/to/replica.sqlite"),
+            encode=codec.encode,
+            decode=codec.decode,
+        )
+
+    session = ftrack_api.Session(cache=cache)
+
+    synchroniser = ftrack_api.sync.ReplicaSynchroniser(
+        session, {"AssetVersion": "date", "Note": "date"}
+    )
+    synchroniser.synchronise()
+
+"""
+
+from builtins import object
+import json
+import logging
+import time
+
+import arrow
+
+import ftrack_api.cache
+import ftrack_api.inspection
+from ftrack_api.logging import LazyLogMessage as L
+
+
+class ReplicaSynchroniser(object):
+    """Synchronise cached entities using modification timestamps."""
+
+    #: Cache key template for the synchronisation state of an entity type.
+    STATE_KEY = "ftrack_api.sync:{0}"
+
+    def __init__(
+        self, session, entity_types, cache=None, page_size=500, reconcile_interval=3600
+    ):
+        """Initialise synchroniser for *session*.
+
+        *entity_types* should be a mapping of entity type names to synchronise
+        to the name of a date attribute updated whenever an entity of that type
+        is modified.
+
+        *cache* is the cache to store entities and synchronisation state in. It
+        defaults to the layers of the session cache below its memory cache,
+        which must only hold entities. If there are no such layers then a
+        :class:`~ftrack_api.cache.MemoryCache` private to this synchroniser is
+        used.
+
+        *page_size* is the number of entities to fetch and store at a time.
+
+        Entities deleted remotely are removed by comparing cached keys against
+        all remote identifiers once every *reconcile_interval* seconds. Set to
+        None to only reconcile when :meth:`reconcile` is called.
+
+        """
+        super(ReplicaSynchroniser, self).__init__()
+        self.logger = logging.getLogger(__name__ + "." + self.__class__.__name__)
+        self.session = session
+        self.entity_types = dict(entity_types)
+        if cache is None:
+            cache = self._default_cache(session)
+
+        self.cache = cache
+        self.page_size = page_size
+        self.reconcile_interval = reconcile_interval
+
+    def synchronise(self, entity_types=None):
+        """Synchronise *entity_types*, defaulting to all configured types.
+
+        Return mapping of entity type to a mapping of the number of entities
+        *fetched* and *removed*.
+
+        """
+        if entity_types is None:
+            entity_types = list(self.entity_types)
+
+        results = {}
+        for entity_type in entity_types:
+            results[entity_type] = self.synchronise_entity_type(entity_type)
+
+        return results
+
+    def synchronise_entity_type(self, entity_type):
+        """Synchronise entities of *entity_type* modified since last run.
+
+        Return mapping of the number of entities *fetched* and *removed*.
+
+        """
+        timestamp_attribute = self.entity_types[entity_type]
+        state = self._load_state(entity_type)
+
+        projections = set(self.session.types[entity_type].default_projections)
+        projections.add(timestamp_attribute)
+        expression = "select {0} from {1}".format(
+            ", ".join(sorted(projections)), entity_type
+        )
+
+        watermark = state.get("watermark")
+        if watermark is not None:
+            # Timestamps are stored without microseconds so entities modified
+            # during the second of the watermark are fetched again. The offset
+            # is always given explicitly so the server does not interpret the
+            # literal in its own local timezone.
+            expression += ' where {0} >= "{1}"'.format(
+                timestamp_attribute, arrow.get(watermark).to("utc").isoformat()
+            )
+
+        expression += " order by {0}".format(timestamp_attribute)
+
+        fetched = 0
+        latest = None
+        page = {}
+        with self.session.auto_populating(False):
+            for entity in self.session.query(expression, page_size=self.page_size):
+                page[self._cache_key(entity)] = entity
+
+                timestamp = entity[timestamp_attribute]
+                if timestamp is not None and (latest is None or timestamp > latest):
+                    latest = timestamp
+
+                if len(page) >= self.page_size:
+                    fetched += self._store(page)
+                    page = {}
+
+        fetched += self._store(page)
+
+        if latest is not None:
+            state["watermark"] = (
+                arrow.get(latest).to("utc").replace(microsecond=0).isoformat()
+            )
+
+        removed = 0
+        now = time.time()
+        if self.reconcile_interval is not None and (
+            now - state.get("reconciled", 0) >= self.reconcile_interval
+        ):
+            removed = self.reconcile(entity_type)
+            state["reconciled"] = now
+
+        self._save_state(entity_type, state)
+
+        self.logger.debug(
+            L(
+                "Synchronised {0} entities: {1} fetched, {2} removed.",
+                entity_type,
+                fetched,
+                removed,
+            )
+        )
+        return {"fetched": fetched, "removed": removed}
+
+    def reconcile(self, entity_type):
+        """Remove cached entities of *entity_type* no longer present remotely.
+
+        Only primary key attributes are fetched for comparison.
+
+        Return number of entities removed.
+
+        """
+        primary_key_attributes = self.session.types[entity_type].primary_key_attributes
+        expression = "select {0} from {1}".format(
+            ", ".join(primary_key_attributes), entity_type
+        )
+
+        remote_keys = set()
+        with self.session.auto_populating(False):
+            for entity in self.session.query(expression, page_size=self.page_size):
+                remote_keys.add(self._cache_key(entity))
+
+        stale = [
+            key
+            for key in self.cache.keys()
+            if self.session.cache_key_entity_type(key) == entity_type
+            and key not in remote_keys
+        ]
+        if stale:
+            self.cache.remove_many(stale)
+
+        return len(stale)
+
+    def _default_cache(self, session):
+        """Return persistent layers of *session* cache."""
+        layers = session.cache.caches[1:]
+        if not layers:
+            return ftrack_api.cache.MemoryCache()
+
+        if len(layers) == 1:
+            return layers[0]
+
+        return ftrack_api.cache.LayeredCache(layers)
+
+    def watermark(self, entity_type):
+        """Return timestamp of latest synchronised *entity_type* change or None."""
+        watermark = self._load_state(entity_type).get("watermark")
+        if watermark is None:
+            return None
+
+        return arrow.get(watermark)
+
+    def _cache_key(self, entity):
+        """Return cache key for *entity*."""
+        return self.session.cache_key_maker.key(ftrack_api.inspection.identity(entity))
+
+    def _store(self, page):
+        """Store *page* mapping of cache keys to entities and return count."""
+        if page:
+            self.cache.set_many(page)
+
+        return len(page)
+
+    def _load_state(self, entity_type):
+        """Return synchronisation state for *entity_type*."""
+        try:
+            return json.loads(self.cache.get(self.STATE_KEY.format(entity_type)))
+        except KeyError:
+            return {}
+
+    def _save_state(self, entity_type, state):
+        """Store synchronisation *state* for *entity_type*."""
+        self.cache.set(self.STATE_KEY.format(entity_type), json.dumps(state))
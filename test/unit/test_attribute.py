@@ -148,3 +148,55 @@ def test_iterate_over_attributes_collection():
         attributes.remove(attribute)
 
     assert len(attributes) == 0
+
+
+def test_attribute_storage_slots(mocked_schema_session):
+    """Store entity values in slots of the entity type attributes."""
+    session = mocked_schema_session
+    bar = session._create("Bar", {"id": "bar", "name": "remote"}, reconstructing=True)
+
+    attributes = bar.attributes
+    assert len(bar._ftrack_values) == attributes.storage_size
+    assert not hasattr(bar, "_ftrack_attribute_storage")
+
+    name = attributes.get("name")
+    assert bar._ftrack_values[name._remote_index] == "remote"
+
+    bar["name"] = "local"
+    assert bar._ftrack_values[name._local_index] == "local"
+    assert bar["name"] == "local"
+
+    # Slots are not reused once an attribute is removed.
+    attributes.remove(name)
+    try:
+        extra = ftrack_api.attribute.ScalarAttribute("extra", "string")
+        attributes.add(extra)
+        assert extra._local_index > name._remote_index
+
+        extra.set_remote_value(bar, "value")
+        assert extra.get_remote_value(bar) == "value"
+        assert len(bar._ftrack_values) == attributes.storage_size
+    finally:
+        attributes.remove(extra)
+        attributes.add(name)
+
+
+def test_shared_attribute_storage():
+    """Fall back to mapping storage for attribute owned by other collection."""
+    attribute = ftrack_api.attribute.Attribute("shared")
+    first = ftrack_api.attribute.Attributes([ftrack_api.attribute.Attribute("a")])
+    first.add(attribute)
+    second = ftrack_api.attribute.Attributes([attribute])
+
+    assert attribute._storage_owner is first
+    assert second.storage_size == 0
+
+    class Entity(object):
+        attributes = second
+        primary_key_attributes = []
+
+    entity = Entity()
+    attribute.set_remote_value(entity, "value")
+
+    assert attribute.get_remote_value(entity) == "value"
+    assert not hasattr(entity, "_ftrack_values")
@@ -5,12 +5,28 @@ import os
 import uuid
 import tempfile
 import sys
+import multiprocessing
+import fnmatch
+import socketserver
+import threading
 import pytest
 
 import ftrack_api.cache
 
 
-@pytest.fixture(params=["proxy", "layered", "memory", "file", "serialised"])
+@pytest.fixture(
+    params=[
+        "proxy",
+        "layered",
+        "memory",
+        "bounded",
+        "file",
+        "sqlite",
+        "mapped",
+        "redis",
+        "serialised",
+    ]
+)
 def cache(request):
     """Return cache."""
     if request.param == "proxy":
@@ -22,6 +38,9 @@ def cache(request):
     elif request.param == "memory":
         cache = ftrack_api.cache.MemoryCache()
 
+    elif request.param == "bounded":
+        cache = ftrack_api.cache.BoundedMemoryCache(max_entries=100)
+
     elif request.param == "file":
         cache_path = os.path.join(
             tempfile.gettempdir(), "{0}.dbm".format(uuid.uuid4().hex)
@@ -40,6 +59,41 @@ def cache(request):
 
         request.addfinalizer(cleanup)
 
+    elif request.param == "sqlite":
+        cache_path = os.path.join(
+            tempfile.gettempdir(), "{0}.sqlite".format(uuid.uuid4().hex)
+        )
+
+        cache = ftrack_api.cache.SqliteCache(cache_path)
+
+        def cleanup():
+            """Cleanup."""
+            cache.close()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(cache_path + suffix):
+                    os.remove(cache_path + suffix)
+
+        request.addfinalizer(cleanup)
+
+    elif request.param == "mapped":
+        cache_path = os.path.join(
+            tempfile.gettempdir(), "{0}.mmap".format(uuid.uuid4().hex)
+        )
+
+        cache = ftrack_api.cache.MappedFileCache(cache_path, size=64 * 1024, slots=128)
+
+        def cleanup():
+            """Cleanup."""
+            cache.close()
+            os.remove(cache_path)
+
+        request.addfinalizer(cleanup)
+
+    elif request.param == "redis":
+        server = request.getfixturevalue("redis_server")
+        cache = ftrack_api.cache.RedisCache(*server.server_address, namespace="test:")
+        request.addfinalizer(cache.close)
+
     elif request.param == "serialised":
         cache = ftrack_api.cache.SerialisedCache(
             ftrack_api.cache.MemoryCache(),
@@ -164,6 +218,28 @@ def test_clear_encountering_missing_key(cache, mocker):
     assert cache.keys() == ["missing"]
 
 
+def test_get_many(cache):
+    """Retrieve several items from cache omitting missing keys."""
+    cache.set("a", "a_value")
+    cache.set("b", "b_value")
+    assert cache.get_many(["a", "b", "missing"]) == {"a": "a_value", "b": "b_value"}
+
+
+def test_set_many(cache):
+    """Set several items in cache."""
+    cache.set("a", "old")
+    cache.set_many({"a": "a_value", "b": "b_value"})
+    assert cache.get("a") == "a_value"
+    assert cache.get("b") == "b_value"
+
+
+def test_remove_many(cache):
+    """Remove several items from cache ignoring missing keys."""
+    cache.set_many({"a": "a_value", "b": "b_value", "c": "c_value"})
+    cache.remove_many(["a", "b", "missing"])
+    assert cache.keys() == ["c"]
+
+
 def test_layered_cache_propagates_value_on_get():
     """Layered cache propagates value on get."""
     caches = [
@@ -202,6 +278,551 @@ def test_layered_cache_remove_at_depth():
     assert not cache.keys()
 
 
+class Value(object):
+    """Weakly referenceable value for testing."""
+
+
+def test_bounded_memory_cache_evicts_least_recently_used():
+    """Evict least recently used values beyond entry limit."""
+    cache = ftrack_api.cache.BoundedMemoryCache(max_entries=2)
+    values = [Value(), Value(), Value()]
+
+    cache.set("a", values[0])
+    cache.set("b", values[1])
+    cache.get("a")
+    cache.set("c", values[2])
+
+    assert sorted(cache.keys()) == ["a", "c"]
+    assert cache.stats["evictions"] == 1
+
+    # Evicted value still referenced elsewhere is returned and restored.
+    assert cache.get("b") is values[1]
+    assert cache.stats["revivals"] == 1
+    assert sorted(cache.keys()) == ["b", "c"]
+
+    # Evicted value no longer referenced elsewhere is gone.
+    del values[0]
+    with pytest.raises(KeyError):
+        cache.get("a")
+
+
+def test_bounded_memory_cache_retains_unevictable_values():
+    """Retain values that are not evictable regardless of limits."""
+    pinned = Value()
+    cache = ftrack_api.cache.BoundedMemoryCache(
+        max_entries=2, is_evictable=lambda value: value is not pinned
+    )
+
+    cache.set("pinned", pinned)
+    cache.set("a", Value())
+    cache.set("b", Value())
+
+    assert sorted(cache.keys()) == ["b", "pinned"]
+    assert cache.stats["evictions"] == 1
+    assert cache.stats["skipped"] == 1
+
+
+def test_bounded_memory_cache_checks_unevictable_values_once():
+    """Set unevictable values aside until released."""
+    pinned = set()
+    checked = []
+
+    def is_evictable(value):
+        """Return whether *value* is evictable, recording the check."""
+        checked.append(value)
+        return value not in pinned
+
+    values = [Value() for _ in range(10)]
+    pinned.update(values[:5])
+    cache = ftrack_api.cache.BoundedMemoryCache(
+        max_entries=6, is_evictable=is_evictable
+    )
+    for index, value in enumerate(values):
+        cache.set(str(index), value)
+
+    assert len(cache.keys()) == 6
+    assert cache.stats["skipped"] == 5
+    assert len(checked) == 9
+
+    pinned.clear()
+    cache.release_pinned()
+    cache.set("new", Value())
+
+    assert len(cache.keys()) == 6
+    assert cache.get("new") is not None
+    assert cache.stats["skipped"] == 5
+
+
+def test_bounded_memory_cache_measures_size_on_set():
+    """Measure size of values only when set."""
+    sizes = []
+
+    def size_of(value):
+        """Return size of *value*, recording the call."""
+        sizes.append(value)
+        return len(value)
+
+    cache = ftrack_api.cache.BoundedMemoryCache(max_bytes=10, size_of=size_of)
+    cache.set("a", "x" * 4)
+    for _ in range(3):
+        cache.get("a")
+
+    assert sizes == ["x" * 4]
+
+
+def test_bounded_memory_cache_evicts_beyond_byte_limit():
+    """Evict values beyond approximate byte limit."""
+    cache = ftrack_api.cache.BoundedMemoryCache(max_bytes=10, size_of=len)
+
+    cache.set("a", "x" * 4)
+    cache.set("b", "x" * 4)
+    cache.set("c", "x" * 4)
+
+    assert sorted(cache.keys()) == ["b", "c"]
+    assert cache.stats["evictions"] == 1
+
+
+@pytest.fixture
+def sqlite_cache_path(request):
+    """Return path to temporary SQLite cache file."""
+    cache_path = os.path.join(
+        tempfile.gettempdir(), "{0}.sqlite".format(uuid.uuid4().hex)
+    )
+
+    def cleanup():
+        """Cleanup."""
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(cache_path + suffix):
+                os.remove(cache_path + suffix)
+
+    request.addfinalizer(cleanup)
+    return cache_path
+
+
+def test_sqlite_cache_shared_between_connections(sqlite_cache_path):
+    """Share values between SqliteCache instances using the same file."""
+    writer = ftrack_api.cache.SqliteCache(sqlite_cache_path)
+    reader = ftrack_api.cache.SqliteCache(sqlite_cache_path)
+
+    writer.set_many({"a": "a_value", "b": b"b_value"})
+
+    assert reader.get_many(["a", "b", "c"]) == {"a": "a_value", "b": b"b_value"}
+
+    writer.close()
+    reader.close()
+
+
+def test_sqlite_cache_expires_values(sqlite_cache_path, mocker):
+    """Expire SqliteCache values after time to live."""
+    mocked = mocker.patch("time.time", return_value=100.0)
+    cache = ftrack_api.cache.SqliteCache(sqlite_cache_path, ttl=10)
+
+    cache.set("default", "value")
+    cache.set("override", "value", ttl=20)
+
+    mocked.return_value = 115.0
+    with pytest.raises(KeyError):
+        cache.get("default")
+
+    assert cache.keys() == ["override"]
+
+    cache.close()
+
+
+def test_sqlite_cache_evicts_beyond_byte_limit(sqlite_cache_path, mocker):
+    """Evict least recently set SqliteCache values beyond size limit."""
+    mocked = mocker.patch("time.time", return_value=100.0)
+    cache = ftrack_api.cache.SqliteCache(sqlite_cache_path, max_bytes=10)
+
+    for index, key in enumerate(["a", "b", "c"]):
+        mocked.return_value = 100.0 + index
+        cache.set(key, "x" * 4)
+
+    assert sorted(cache.keys()) == ["b", "c"]
+
+    cache.close()
+
+
+def test_sqlite_cache_overwrite_keeps_size_total(sqlite_cache_path):
+    """Keep SqliteCache size total accurate when overwriting keys."""
+    cache = ftrack_api.cache.SqliteCache(sqlite_cache_path, max_bytes=1000)
+
+    for _ in range(200):
+        cache.set("a", "x" * 10)
+
+    cache.set("b", "x" * 10)
+    assert sorted(cache.keys()) == ["a", "b"]
+
+    connection = cache._connect()
+    (total,) = connection.execute("SELECT total FROM cache_size").fetchone()
+    assert total == 20
+
+    cache.close()
+
+
+@pytest.fixture
+def mapped_cache_path(request):
+    """Return path to temporary mapped file cache."""
+    cache_path = os.path.join(
+        tempfile.gettempdir(), "{0}.mmap".format(uuid.uuid4().hex)
+    )
+
+    def cleanup():
+        """Cleanup."""
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+
+    request.addfinalizer(cleanup)
+    return cache_path
+
+
+def _set_in_process(cache_path, key, value):
+    """Set *value* for *key* in mapped file cache at *cache_path*."""
+    cache = ftrack_api.cache.MappedFileCache(cache_path)
+    cache.set(key, value)
+    cache.close()
+
+
+def test_mapped_file_cache_shared_between_processes(mapped_cache_path):
+    """Read values set by another process from MappedFileCache."""
+    cache = ftrack_api.cache.MappedFileCache(
+        mapped_cache_path, size=64 * 1024, slots=128
+    )
+
+    process = multiprocessing.get_context("spawn").Process(
+        target=_set_in_process, args=(mapped_cache_path, "key", b"value")
+    )
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+
+    assert cache.get("key") == b"value"
+
+    cache.set("key", "updated")
+    assert cache.get("key") == "updated"
+
+    cache.close()
+
+
+def test_mapped_file_cache_resets_when_full(mapped_cache_path):
+    """Empty MappedFileCache when its data region is full."""
+    cache = ftrack_api.cache.MappedFileCache(mapped_cache_path, size=4096, slots=16)
+
+    cache.set("a", "x" * 1500)
+    cache.set("b", "x" * 1500)
+    assert sorted(cache.keys()) == ["a", "b"]
+
+    cache.set("c", "x" * 1500)
+    assert cache.keys() == ["c"]
+    assert cache.get("c") == "x" * 1500
+
+    cache.close()
+
+
+def test_mapped_file_cache_get_whilst_closing(mapped_cache_path, mocker):
+    """Read from MappedFileCache whilst another thread closes it."""
+    cache = ftrack_api.cache.MappedFileCache(
+        mapped_cache_path, size=64 * 1024, slots=128
+    )
+    cache.set("key", "value")
+
+    threads = []
+    read = cache._read
+
+    def close_then_read(*args):
+        """Close cache from another thread before reading."""
+        thread = threading.Thread(target=cache.close)
+        thread.start()
+        thread.join(0.1)
+        threads.append(thread)
+        return read(*args)
+
+    mocker.patch.object(cache, "_read", side_effect=close_then_read)
+    assert cache.get("key") == "value"
+
+    for thread in threads:
+        thread.join()
+
+    assert cache._map is None
+
+
+class RedisHandler(socketserver.StreamRequestHandler):
+    """Handle Redis protocol commands for testing."""
+
+    def handle(self):
+        """Reply to commands until the connection is closed."""
+        server = self.server
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+
+            command = []
+            for _ in range(int(line[1:])):
+                length = int(self.rfile.readline()[1:])
+                command.append(self.rfile.read(length + 2)[:-2])
+
+            with server.lock:
+                server.commands.append(command)
+                if server.error is not None:
+                    reply = b"-" + server.error + b"\r\n"
+                else:
+                    reply = getattr(self, "_" + command[0].decode().lower())(
+                        server.data, *command[1:]
+                    )
+
+            self.wfile.write(reply)
+
+    def _encode(self, value):
+        """Return *value* encoded as a reply."""
+        if value is None:
+            return b"$-1\r\n"
+
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+
+        if isinstance(value, list):
+            return b"*%d\r\n" % len(value) + b"".join(map(self._encode, value))
+
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def _get(self, data, key):
+        """Reply with value for *key*."""
+        return self._encode(data.get(key))
+
+    def _mget(self, data, *keys):
+        """Reply with values for *keys*."""
+        return self._encode([data.get(key) for key in keys])
+
+    def _set(self, data, key, value, *options):
+        """Set *value* for *key*, recording any expiry."""
+        data[key] = value
+        if options:
+            self.server.expiries[key] = int(options[1])
+
+        return b"+OK\r\n"
+
+    def _del(self, data, *keys):
+        """Remove *keys* replying with number removed."""
+        return self._encode(sum(data.pop(key, None) is not None for key in keys))
+
+    def _scan(self, data, cursor, _, pattern, *options):
+        """Reply with all keys matching *pattern*."""
+        pattern = pattern.replace(b"\\", b"").decode()
+        keys = [key for key in data if fnmatch.fnmatchcase(key.decode(), pattern)]
+        return self._encode([b"0", keys])
+
+
+@pytest.fixture
+def redis_server(request):
+    """Return in process server handling Redis protocol commands."""
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), RedisHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.data = {}
+    server.expiries = {}
+    server.commands = []
+    server.error = None
+
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    def cleanup():
+        """Cleanup."""
+        server.shutdown()
+        server.server_close()
+
+    request.addfinalizer(cleanup)
+    return server
+
+
+def test_redis_cache_pipelines_batch_operations(redis_server):
+    """Set and get several RedisCache values with one command each."""
+    cache = ftrack_api.cache.RedisCache(
+        *redis_server.server_address, namespace="a:", ttl=10
+    )
+
+    cache.set_many({"a": "a_value", "b": b"b_value"})
+    cache.set("c", "c_value", ttl=20)
+
+    assert cache.get_many(["a", "b", "missing"]) == {
+        "a": "a_value",
+        "b": b"b_value",
+    }
+    assert [command[0] for command in redis_server.commands] == [
+        b"SET",
+        b"SET",
+        b"SET",
+        b"MGET",
+    ]
+    assert redis_server.expiries == {b"a:a": 10000, b"a:b": 10000, b"a:c": 20000}
+
+    cache.close()
+
+
+def test_redis_cache_namespaces_keys(redis_server):
+    """Isolate RedisCache instances using different namespaces."""
+    namespaces = iter(["first:", "second:"])
+    first = ftrack_api.cache.RedisCache(
+        *redis_server.server_address, namespace=lambda: next(namespaces)
+    )
+    second = ftrack_api.cache.RedisCache(
+        *redis_server.server_address, namespace=lambda: next(namespaces)
+    )
+
+    first.set("key", "first")
+    second.set("key", "second")
+
+    assert first.get("key") == "first"
+    assert second.get("key") == "second"
+    assert first.keys() == ["key"]
+
+    first.close()
+    second.close()
+
+
+def test_redis_cache_unavailable():
+    """Treat unavailable RedisCache server as missing values."""
+    server = socketserver.TCPServer(("127.0.0.1", 0), RedisHandler)
+    address = server.server_address
+    server.server_close()
+
+    cache = ftrack_api.cache.RedisCache(*address, timeout=1)
+    cache.set("key", "value")
+
+    with pytest.raises(KeyError):
+        cache.get("key")
+
+    assert cache.get_many(["key"]) == {}
+
+
+def test_redis_cache_server_error(redis_server):
+    """Treat RedisCache server error replies as missing values."""
+    cache = ftrack_api.cache.RedisCache(*redis_server.server_address, retry_delay=0)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+    redis_server.error = b"LOADING Redis is loading the dataset in memory"
+    with pytest.raises(KeyError):
+        cache.get("key")
+
+    assert cache.keys() == []
+
+    redis_server.error = None
+    assert cache.get("key") == "value"
+
+    cache.close()
+
+
+def test_redis_cache_reconnect_backoff(mocker):
+    """Wait before reconnecting to unavailable RedisCache server."""
+    server = socketserver.TCPServer(("127.0.0.1", 0), RedisHandler)
+    address = server.server_address
+    server.server_close()
+
+    mocked = mocker.patch("time.monotonic", return_value=100.0)
+    connect = mocker.spy(ftrack_api.cache.socket, "create_connection")
+
+    cache = ftrack_api.cache.RedisCache(*address, timeout=1, retry_delay=1)
+    assert cache.get_many(["key"]) == {}
+    assert cache.get_many(["key"]) == {}
+    assert connect.call_count == 1
+
+    mocked.return_value = 101.5
+    assert cache.get_many(["key"]) == {}
+    assert connect.call_count == 2
+
+
+def test_layered_cache_records_statistics():
+    """Record hits, misses and back-fills per LayeredCache layer."""
+    statistics = ftrack_api.cache.CacheStatistics(
+        categorise=lambda key: key.split(":")[0]
+    )
+    caches = [ftrack_api.cache.MemoryCache(), ftrack_api.cache.MemoryCache()]
+    cache = ftrack_api.cache.LayeredCache(caches, statistics=statistics)
+
+    caches[1].set("a:1", "value")
+    caches[1].set("b:1", "value")
+
+    cache.get("a:1")
+    cache.get("a:1")
+    with pytest.raises(KeyError):
+        cache.get("a:missing")
+    cache.get_many(["b:1", "b:missing"])
+
+    report = statistics.report(names=["top", "bottom"], top=1)
+    top, bottom = report["layers"]
+
+    assert top["name"] == "top"
+    assert (top["hits"], top["misses"], top["backfills"]) == (1, 4, 2)
+    assert top["hit_rate"] == 0.2
+    assert top["categories"]["a"] == {"hits": 1, "misses": 2, "backfills": 1}
+    assert (bottom["hits"], bottom["misses"], bottom["backfills"]) == (2, 2, 0)
+    assert report["hot_keys"] == [("a:1", 2)]
+    assert len(report["missed_keys"]) == 1
+
+    statistics.reset()
+    assert statistics.report() == {"layers": [], "hot_keys": [], "missed_keys": []}
+
+
+def test_layered_cache_records_statistics_without_layers():
+    """Raise KeyError when recording statistics for LayeredCache without layers."""
+    statistics = ftrack_api.cache.CacheStatistics()
+    cache = ftrack_api.cache.LayeredCache([], statistics=statistics)
+
+    with pytest.raises(KeyError):
+        cache.get("key")
+
+    assert statistics.report()["missed_keys"] == [("key", 1)]
+
+
+def test_layered_cache_get_many():
+    """Retrieve several values from LayeredCache propagating to higher layers."""
+    caches = [ftrack_api.cache.MemoryCache(), ftrack_api.cache.MemoryCache()]
+    cache = ftrack_api.cache.LayeredCache(caches)
+
+    caches[0].set("a", "a_value")
+    caches[1].set("b", "b_value")
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": "a_value", "b": "b_value"}
+    assert caches[0].get("b") == "b_value"
+
+
+def test_negative_cache_expires(mocker):
+    """Expire negative cache records after time to live."""
+    mocked = mocker.patch("time.monotonic", return_value=100.0)
+    cache = ftrack_api.cache.NegativeCache(ttl=10)
+
+    cache.add("key")
+    assert "key" in cache
+
+    mocked.return_value = 110.0
+    assert "key" not in cache
+
+    assert cache.stats == {
+        "hits": 1,
+        "misses": 1,
+        "stores": 1,
+        "invalidations": 0,
+        "expirations": 1,
+    }
+
+
+def test_layered_cache_set_invalidates_negative_cache():
+    """Discard negative cache record when setting key on LayeredCache."""
+    negative_cache = ftrack_api.cache.NegativeCache()
+    cache = ftrack_api.cache.LayeredCache(
+        [ftrack_api.cache.MemoryCache()], negative_cache=negative_cache
+    )
+
+    negative_cache.add("key")
+    cache.set("key", "value")
+
+    assert "key" not in negative_cache
+    assert negative_cache.stats["invalidations"] == 1
+
+
 def test_expand_references():
     """Test that references are expanded from serialized cache."""
 
@@ -349,6 +970,17 @@ def test_memoised_call():
     )
 
 
+def test_memoiser_records_statistics():
+    """Count memoised call hits and misses."""
+    memoiser = ftrack_api.cache.Memoiser()
+
+    memoiser.call(function, ({}, 1))
+    memoiser.call(function, ({}, 1))
+    memoiser.call(function, ({}, 2))
+
+    assert memoiser.stats == {"hits": 1, "misses": 2}
+
+
 def test_memoised_call_variations():
     """Call memoised function with identical arguments using variable format."""
     memoiser = ftrack_api.cache.Memoiser()
@@ -0,0 +1,68 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2024 ftrack
+
+import arrow
+import pytest
+
+import ftrack_api.cache
+import ftrack_api.codec
+import ftrack_api.inspection
+
+
+def test_encode_decode_entity(mocked_schema_session):
+    """Round trip entity remote values and references through codec."""
+    session = mocked_schema_session
+    bars = [
+        session._create("Bar", {"id": "bar_{0}".format(index)}, reconstructing=True)
+        for index in range(2)
+    ]
+    foo = session._create(
+        "Foo",
+        {
+            "id": "foo",
+            "string": "value",
+            "date": arrow.get("2020-01-01T10:00:00"),
+            "bars": bars,
+        },
+        reconstructing=True,
+    )
+
+    codec = ftrack_api.codec.BinaryEntityCodec(session)
+    data = codec.encode(foo)
+    assert isinstance(data, bytes)
+
+    decoded = codec.decode(data)
+
+    assert decoded is not foo
+    assert ftrack_api.inspection.identity(decoded) == ("Foo", ["foo"])
+    assert decoded["string"] == "value"
+    assert decoded["date"] == arrow.get("2020-01-01T10:00:00")
+    assert [bar["id"] for bar in decoded["bars"]] == ["bar_0", "bar_1"]
+    assert not session.recorded_operations
+
+
+def test_decode_with_different_schema_hash(mocked_schema_session):
+    """Treat data encoded for different schemas as missing."""
+    session = mocked_schema_session
+    codec = ftrack_api.codec.BinaryEntityCodec(session)
+    data = codec.encode("value")
+
+    session._server_information["schema_hash"] = "changed"
+
+    with pytest.raises(KeyError):
+        codec.decode(data)
+
+    cache = ftrack_api.cache.LayeredCache(
+        [
+            ftrack_api.cache.MemoryCache(),
+            ftrack_api.cache.SerialisedCache(
+                ftrack_api.cache.MemoryCache(),
+                encode=codec.encode,
+                decode=codec.decode,
+            ),
+        ]
+    )
+    cache.caches[1].proxied.set("key", data)
+
+    with pytest.raises(KeyError):
+        cache.get("key")
@@ -252,6 +252,62 @@ def test_collection_notify_on_modification(
     assert operation.new_value == collection
 
 
+def test_collection_coalesce_modifications(
+    mock_entity, mock_attribute, mock_entities, session
+):
+    """Record single operation retaining original old value for modifications."""
+    collection = ftrack_api.collection.Collection(
+        mock_entity, mock_attribute, data=mock_entities
+    )
+
+    new_entities = [create_mock_entity(session), create_mock_entity(session)]
+    collection.extend(new_entities)
+    assert len(session.recorded_operations) == 1
+
+    operation = list(session.recorded_operations)[0]
+    assert list(operation.old_value) == mock_entities
+    assert operation.new_value is collection
+
+
+def test_collection_unrecorded_modification_not_in_operation(
+    mock_entity, mock_attribute, mock_entities, session
+):
+    """Exclude modification made without recording from pending operation."""
+    collection = ftrack_api.collection.Collection(
+        mock_entity, mock_attribute, data=mock_entities
+    )
+
+    collection.append(create_mock_entity(session))
+    expected = list(collection)
+
+    with session.operation_recording(False):
+        collection.append(create_mock_entity(session))
+
+    operation = list(session.recorded_operations)[0]
+    assert list(operation.new_value) == expected
+    assert len(collection) == len(expected) + 1
+
+
+def test_collection_track_changes(mock_entity, mock_attribute, mock_entities, session):
+    """Track entities added and removed relative to baseline."""
+    collection = ftrack_api.collection.Collection(
+        mock_entity, mock_attribute, data=mock_entities
+    )
+    assert collection.changes is None
+
+    collection.track_changes()
+    assert collection.changes == ([], [])
+
+    new_entity = create_mock_entity(session)
+    collection.append(new_entity)
+    del collection[0]
+    assert collection.changes == ([new_entity], [mock_entities[0]])
+
+    collection.insert(0, mock_entities[0])
+    del collection[-1]
+    assert collection.changes == ([], [])
+
+
 def test_mapped_collection_proxy_shallow_copy(new_project, unique_name):
     """Shallow copying mapped collection proxy avoids indirect mutation."""
     metadata = new_project["metadata"]
@@ -1,6 +1,10 @@
 # :coding: utf-8
 # :copyright: Copyright (c) 2014 ftrack
 
+import copy
+import pickle
+
+import ftrack_api.cache
 import ftrack_api.inspection
 import ftrack_api.symbol
 
@@ -12,6 +16,48 @@ def test_identity(user):
     assert identity[1] == ["d07ae5d0-66e1-11e1-b5e9-f23c91df25eb"]
 
 
+def test_identity_cached_until_primary_key_set(mocked_schema_session, mocker):
+    """Reuse identity of entity until a primary key attribute is set."""
+    session = mocked_schema_session
+    bar = session._create("Bar", {"id": "bar"}, reconstructing=True)
+
+    identity = ftrack_api.inspection.identity(bar)
+    assert identity == ("Bar", ["bar"])
+    assert identity.key == str(("Bar", ["bar"]))
+
+    spy = mocker.spy(ftrack_api.inspection, "_primary_key")
+    assert ftrack_api.inspection.identity_key(bar) == identity.key
+    assert ftrack_api.inspection.primary_key(bar) == {"id": "bar"}
+    assert not spy.called
+
+    bar.attributes.get("id").set_remote_value(bar, "changed")
+    assert ftrack_api.inspection.identity(bar) == ("Bar", ["changed"])
+    assert spy.call_count == 1
+
+
+def test_identity_key_makers(mocked_schema_session):
+    """Generate keys for identities using precomputed string form."""
+    session = mocked_schema_session
+    bar = session._create("Bar", {"id": "bar"}, reconstructing=True)
+    identity = ftrack_api.inspection.identity(bar)
+
+    assert ftrack_api.cache.StringKeyMaker().key(identity) == str(("Bar", ["bar"]))
+
+    key_maker = ftrack_api.cache.ObjectKeyMaker()
+    assert key_maker.key(identity) == key_maker.key(
+        ftrack_api.inspection.Identity("Bar", ["bar"])
+    )
+    assert key_maker.key(identity) != key_maker.key(
+        ftrack_api.inspection.Identity("Bar", ["other"])
+    )
+    assert key_maker.key(identity) == key_maker.key(("Bar", ["bar"]))
+    assert key_maker.key(identity) != key_maker.key(("Bar", ["other"]))
+
+    for copied in (copy.deepcopy(identity), pickle.loads(pickle.dumps(identity))):
+        assert copied == identity
+        assert copied.key == identity.key
+
+
 def test_primary_key(user):
     """Retrieve primary key of *user*."""
     primary_key = ftrack_api.inspection.primary_key(user)
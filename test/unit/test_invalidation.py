@@ -0,0 +1,110 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2024 ftrack
+
+import threading
+
+import ftrack_api.event.base
+import ftrack_api.invalidation
+import ftrack_api.symbol
+
+
+def update_event(*entities):
+    """Return ftrack.update event for *entities*.
+
+    Each entity should be a tuple of (entityType, entityId, keys).
+
+    """
+    return ftrack_api.event.base.Event(
+        topic="ftrack.update",
+        data={
+            "entities": [
+                {
+                    "entityType": entity_type,
+                    "entityId": entity_id,
+                    "action": "update",
+                    "keys": keys,
+                }
+                for entity_type, entity_id, keys in entities
+            ]
+        },
+    )
+
+
+def test_invalidate_changed_attributes(mocked_schema_session):
+    """Reset changed remote attributes of cached entity."""
+    session = mocked_schema_session
+    bar = session.merge(
+        session._create("Bar", {"id": "bar", "name": "old"}, reconstructing=True)
+    )
+
+    invalidator = ftrack_api.invalidation.CacheInvalidator(session, delay=0)
+    invalidator.handle_event(update_event(("bar", "bar", ["name"])))
+
+    with session.auto_populating(False):
+        assert bar["name"] is ftrack_api.symbol.NOT_SET
+        assert bar["id"] == "bar"
+
+    assert invalidator.stats == {"events": 1, "invalidated": 1, "refreshed": 0}
+
+
+def test_refresh_coalesced_changes(mocked_schema_session, mocker):
+    """Refresh entities changed by several events with one populate call."""
+    session = mocked_schema_session
+    bars = [
+        session.merge(
+            session._create(
+                "Bar",
+                {"id": "bar_{0}".format(index), "name": "old"},
+                reconstructing=True,
+            )
+        )
+        for index in range(2)
+    ]
+
+    mocked = mocker.patch.object(session, "populate")
+
+    invalidator = ftrack_api.invalidation.CacheInvalidator(
+        session, refresh=True, delay=60
+    )
+    invalidator.handle_event(update_event(("bar", "bar_0", ["name"])))
+    invalidator.handle_event(
+        update_event(("bar", "bar_0", ["name"]), ("bar", "bar_1", ["name"]))
+    )
+    invalidator.handle_event(update_event(("bar", "uncached", ["name"])))
+    assert not mocked.called
+
+    invalidator.flush()
+
+    mocked.assert_called_once_with(bars, "name")
+    assert invalidator.stats == {"events": 3, "invalidated": 2, "refreshed": 2}
+
+
+def test_flush_holds_session_lock(mocked_schema_session):
+    """Invalidate entities only whilst holding the session lock."""
+    session = mocked_schema_session
+    bar = session.merge(
+        session._create("Bar", {"id": "bar", "name": "old"}, reconstructing=True)
+    )
+
+    invalidator = ftrack_api.invalidation.CacheInvalidator(session, delay=60)
+    invalidator.handle_event(update_event(("bar", "bar", ["name"])))
+
+    session._thread_lock.acquire()
+    try:
+        thread = threading.Thread(target=invalidator.flush)
+        thread.start()
+        thread.join(0.1)
+        assert thread.is_alive()
+
+        with session.auto_populating(False):
+            assert bar["name"] == "old"
+
+    finally:
+        session._thread_lock.release()
+
+    thread.join()
+
+    with session.auto_populating(False):
+        assert bar["name"] is ftrack_api.symbol.NOT_SET
+
+    assert invalidator.stats["invalidated"] == 1
@@ -74,3 +74,67 @@ def test_operations_iter():
     assert len(operations) == 3
     for operation, expected in zip(operations, [operation_a, operation_b, operation_c]):
         assert operation is expected
+
+
+def test_operations_coalesce_attribute_updates():
+    """Coalesce updates to same entity attribute into single operation."""
+    operations = ftrack_api.operation.Operations()
+    entity_key = {"id": "1"}
+
+    operations.push(
+        ftrack_api.operation.UpdateEntityOperation(
+            "User", entity_key, "username", "original", "a"
+        )
+    )
+    operations.push(
+        ftrack_api.operation.UpdateEntityOperation(
+            "User", entity_key, "email", "original@example.com", "a@example.com"
+        )
+    )
+    operations.push(
+        ftrack_api.operation.UpdateEntityOperation(
+            "User", entity_key, "username", "a", "b"
+        )
+    )
+
+    assert len(operations) == 2
+
+    email, username = list(operations)
+    assert email.attribute_name == "email"
+    assert username.attribute_name == "username"
+    assert username.old_value == "original"
+    assert username.new_value == "b"
+
+
+def test_operations_discard_updates_of_created_then_deleted_entity():
+    """Discard pending updates for entity created then deleted."""
+    operations = ftrack_api.operation.Operations()
+    create = ftrack_api.operation.CreateEntityOperation("User", {"id": "1"}, {})
+    other = ftrack_api.operation.CreateEntityOperation("User", {"id": "2"}, {})
+    delete = ftrack_api.operation.DeleteEntityOperation("User", {"id": "1"})
+
+    operations.push(create)
+    operations.push(other)
+    operations.push(
+        ftrack_api.operation.UpdateEntityOperation(
+            "User", {"id": "1"}, "username", "a", "b"
+        )
+    )
+    operations.push(delete)
+
+    assert list(operations) == [create, other, delete]
+    assert operations.is_created("User", {"id": "1"})
+
+
+def test_operations_keep_delete_of_persisted_entity():
+    """Record delete of entity that was not created in stack."""
+    operations = ftrack_api.operation.Operations()
+    operations.push(
+        ftrack_api.operation.UpdateEntityOperation(
+            "User", {"id": "1"}, "username", "a", "b"
+        )
+    )
+    operations.push(ftrack_api.operation.DeleteEntityOperation("User", {"id": "1"}))
+
+    assert len(operations) == 2
+    assert isinstance(operations.pop(), ftrack_api.operation.DeleteEntityOperation)
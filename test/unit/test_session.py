@@ -1,14 +1,19 @@
 # :coding: utf-8
 # :copyright: Copyright (c) 2015 ftrack
 
+import asyncio
 import os
 import tempfile
 import functools
+import gc
 import uuid
 import textwrap
 import datetime
 import json
 import random
+import threading
+import time
+import weakref
 
 import pytest
 import mock
@@ -341,6 +346,21 @@ def test_create_then_delete_operation_ordering(session, unique_name):
     session.commit()
 
 
+def test_create_then_delete_discards_updates(mocked_schema_session):
+    """Discard pending updates of entity created then deleted."""
+    entity = mocked_schema_session.create("Bar", {"id": "bar_unique_id"})
+    entity["name"] = "myBar"
+    assert len(mocked_schema_session.recorded_operations) == 2
+
+    mocked_schema_session.delete(entity)
+
+    create, delete = list(mocked_schema_session.recorded_operations)
+    assert isinstance(create, ftrack_api.operation.CreateEntityOperation)
+    assert isinstance(delete, ftrack_api.operation.DeleteEntityOperation)
+    assert mocked_schema_session.created == []
+    assert mocked_schema_session.deleted == [entity]
+
+
 def test_create_and_modify_to_have_required_attribute(session, unique_name):
     """Create and modify entity to have required attribute in transaction."""
     entity = session.create("Scope", {})
@@ -899,6 +919,111 @@ def test_rollback_entity_deletion(session, new_user):
     assert new_user in session._local_cache.values()
 
 
+def test_commit_only_resets_modified_entities(mocked_schema_session, mocker):
+    """Reset local state of modified entities only on commit."""
+    session = mocked_schema_session
+    clean = session.merge(
+        session._create("Bar", {"id": "clean", "name": "a"}, reconstructing=True)
+    )
+    modified = session.merge(
+        session._create("Bar", {"id": "modified", "name": "a"}, reconstructing=True)
+    )
+    modified["name"] = "b"
+
+    mocker.patch.object(
+        session,
+        "call",
+        return_value=[
+            {
+                "action": "update",
+                "data": session._create(
+                    "Bar", {"id": "modified", "name": "b"}, reconstructing=True
+                ),
+            }
+        ],
+    )
+    mocked_clear = mocker.patch.object(clean, "clear")
+
+    session.commit()
+
+    assert not mocked_clear.called
+    assert modified.attributes.get("name").get_local_value(modified) is (
+        ftrack_api.symbol.NOT_SET
+    )
+    assert modified["name"] == "b"
+
+
+def test_rollback_only_resets_modified_entities(mocked_schema_session, mocker):
+    """Reset local state of modified entities only on rollback."""
+    session = mocked_schema_session
+    clean = session.merge(
+        session._create("Bar", {"id": "clean", "name": "a"}, reconstructing=True)
+    )
+    modified = session.merge(
+        session._create("Bar", {"id": "modified", "name": "a"}, reconstructing=True)
+    )
+    modified["name"] = "b"
+
+    mocked_clear = mocker.patch.object(clean, "clear")
+
+    session.rollback()
+
+    assert not mocked_clear.called
+    assert modified["name"] == "a"
+
+
+def test_reading_does_not_mark_entities_modified(mocked_schema_session):
+    """Only mark entities modified by a change, not by reading collections."""
+    session = mocked_schema_session
+    bar = session._create("Bar", {"id": "bar"}, reconstructing=True)
+    foo = session.merge(
+        session._create("Foo", {"id": "foo", "bars": [bar]}, reconstructing=True)
+    )
+
+    assert [entity["id"] for entity in foo["bars"]] == ["bar"]
+
+    # Refresh the unmodified local copy of the collection.
+    baz = session._create("Bar", {"id": "baz"}, reconstructing=True)
+    session.merge(
+        session._create("Foo", {"id": "foo", "bars": [bar, baz]}, reconstructing=True)
+    )
+    assert [entity["id"] for entity in foo["bars"]] == ["bar", "baz"]
+    assert session._modified_entities == {}
+
+    foo["bars"].append(session._create("Bar", {"id": "other"}, reconstructing=True))
+    assert list(session._modified_entities) == [id(foo)]
+
+
+def test_commit_tracked_collection_change(mocked_schema_session, mocker):
+    """Commit full collection value whilst reporting its changes."""
+    session = mocked_schema_session
+
+    bars = [
+        session._create("Bar", {"id": "bar_{0}".format(index)}, reconstructing=True)
+        for index in range(3)
+    ]
+    foo = session.merge(
+        session._create("Foo", {"id": "foo", "bars": bars}, reconstructing=True)
+    )
+
+    with session.operation_recording(False):
+        new_bar = session.create("Bar", {"id": "bar_new"})
+
+    foo["bars"].append(new_bar)
+    del foo["bars"][0]
+    assert foo["bars"].changes == ([new_bar], [bars[0]])
+
+    mocked = mocker.patch.object(session, "call", return_value=[])
+    session.commit()
+
+    payloads = mocked.call_args[0][0]
+    assert len(payloads) == 1
+
+    value = payloads[0]["entity_data"]["bars"]
+    assert isinstance(value, ftrack_api.collection.Collection)
+    assert list(value) == [bars[1], bars[2], new_bar]
+
+
 # Caching
 # ------------------------------------------------------------------------------
 
@@ -923,6 +1048,643 @@ def test_get_entity_bypassing_cache(session, user, mocker):
     assert session.call.called
 
 
+def test_get_many_entities(session, user):
+    """Retrieve several entities by type and ids in input order."""
+    entity_type, entity_key = ftrack_api.inspection.identity(user)
+    session.cache.remove(
+        session.cache_key_maker.key(ftrack_api.inspection.identity(user))
+    )
+
+    matching = session.get_many(entity_type, ["non-existant-id", entity_key])
+
+    assert matching == [None, user]
+
+
+def test_get_many_queries_only_missing_entities(mocked_schema_session, mocker):
+    """Retrieve cached entities locally and query missing ones in chunks."""
+    session = mocked_schema_session
+    cached = session.merge(session._create("Bar", {"id": "bar_0"}, reconstructing=True))
+
+    def query(expression):
+        """Return Bar entities matching ids in *expression*."""
+        records = []
+        for index in (1, 2):
+            entity_id = "bar_{0}".format(index)
+            if '"{0}"'.format(entity_id) in expression:
+                records.append(
+                    session.merge(
+                        session._create("Bar", {"id": entity_id}, reconstructing=True)
+                    )
+                )
+
+        return records, {}
+
+    mocked = mocker.patch.object(session, "_query", side_effect=query)
+
+    matching = session.get_many(
+        "Bar",
+        ["bar_2", "bar_0", "missing", "bar_1", "bar_2"],
+        max_expression_length=len('id in ("bar_2", "missing")'),
+    )
+
+    assert [entity and entity["id"] for entity in matching] == [
+        "bar_2",
+        "bar_0",
+        None,
+        "bar_1",
+        "bar_2",
+    ]
+    assert matching[1] is cached
+    assert matching[0] is matching[4]
+
+    expressions = [call[0][0] for call in mocked.call_args_list]
+    assert len(expressions) == 2
+    assert 'where id in ("bar_2", "missing") ' in expressions[0]
+    assert 'where id in ("bar_1") ' in expressions[1]
+
+
+def test_get_missing_entity_from_negative_cache(mocker, mocked_schemas):
+    """Skip server query for entity recently found to be missing."""
+    mocker.patch.object(
+        ftrack_api.Session, "_load_schemas", return_value=mocked_schemas
+    )
+    mocker.patch.object(ftrack_api.Session, "_configure_locations")
+    session = ftrack_api.Session(negative_cache_ttl=60)
+
+    mocked = mocker.patch.object(session, "_query", return_value=([], {}))
+
+    assert session.get("Bar", "missing") is None
+    assert session.get("Bar", "missing") is None
+    assert session.get_many("Bar", ["missing"]) == [None]
+    assert mocked.call_count == 1
+
+    # Creating the entity locally invalidates the negative record.
+    bar = session.create("Bar", {"id": "missing"})
+    assert session.get("Bar", "missing") is bar
+    assert session.cache.negative_cache.stats["invalidations"] == 1
+
+
+def test_get_entity_with_object_key_maker(mocker, mocked_schemas):
+    """Retrieve merged entity from cache when keyed by ObjectKeyMaker."""
+    mocker.patch.object(
+        ftrack_api.Session, "_load_schemas", return_value=mocked_schemas
+    )
+    mocker.patch.object(ftrack_api.Session, "_configure_locations")
+    session = ftrack_api.Session(
+        cache_key_maker=ftrack_api.cache.ObjectKeyMaker(), negative_cache_ttl=60
+    )
+
+    bar = session.merge(session._create("Bar", {"id": "b1"}, reconstructing=True))
+    mocked = mocker.patch.object(session, "_query", return_value=([], {}))
+
+    assert session.get("Bar", "b1") is bar
+    assert session.get("Bar", "missing") is None
+    assert session.get("Bar", "missing") is None
+    assert mocked.call_count == 1
+
+
+def test_bounded_memory_cache_keeps_modified_entities(mocker, mocked_schemas):
+    """Evict only unmodified entities from bounded memory cache."""
+    mocker.patch.object(
+        ftrack_api.Session, "_load_schemas", return_value=mocked_schemas
+    )
+    mocker.patch.object(ftrack_api.Session, "_configure_locations")
+    session = ftrack_api.Session(memory_cache_max_entries=3)
+
+    modified = session.merge(
+        session._create("Bar", {"id": "modified"}, reconstructing=True)
+    )
+    modified["name"] = "changed"
+
+    deleted = session.merge(
+        session._create("Bar", {"id": "deleted"}, reconstructing=True)
+    )
+    session.delete(deleted)
+
+    session.merge(session._create("Bar", {"id": "clean_0"}, reconstructing=True))
+    session.merge(session._create("Bar", {"id": "clean_1"}, reconstructing=True))
+
+    assert sorted(entity["id"] for entity in session._local_cache.values()) == [
+        "clean_1",
+        "deleted",
+        "modified",
+    ]
+    assert session._local_cache.stats["evictions"] == 1
+    assert session.get("Bar", "modified") is modified
+
+
+def test_bounded_memory_cache_evicts_read_entities(mocker, mocked_schemas):
+    """Evict entities whose collections were only read."""
+    mocker.patch.object(
+        ftrack_api.Session, "_load_schemas", return_value=mocked_schemas
+    )
+    mocker.patch.object(ftrack_api.Session, "_configure_locations")
+    session = ftrack_api.Session(memory_cache_max_entries=5)
+
+    for index in range(5):
+        foo = session.merge(
+            session._create("Foo", {"id": "foo_{0}".format(index)}, reconstructing=True)
+        )
+        foo.attributes.get("bars").set_remote_value(foo, [])
+        assert len(foo["bars"]) == 0
+
+    for index in range(20):
+        session.merge(
+            session._create("Bar", {"id": "bar_{0}".format(index)}, reconstructing=True)
+        )
+
+    assert sorted(entity["id"] for entity in session._local_cache.values()) == [
+        "bar_{0}".format(index) for index in range(15, 20)
+    ]
+    assert session._local_cache.stats["skipped"] == 0
+    assert len(session.recorded_operations) == 0
+
+
+def test_query_batches_cache_layer_traffic(mocker, mocked_schemas):
+    """Retrieve and store a query page in deeper cache layers in one call each."""
+    mocker.patch.object(
+        ftrack_api.Session, "_load_schemas", return_value=mocked_schemas
+    )
+    mocker.patch.object(ftrack_api.Session, "_configure_locations")
+    layer = ftrack_api.cache.MemoryCache()
+    session = ftrack_api.Session(cache=layer)
+
+    cached = session._create("Bar", {"id": "bar_0"}, reconstructing=True)
+    layer.set(str(("Bar", ["bar_0"])), cached)
+
+    def create(entity_type, data):
+        """Return entity as if decoded from a query response."""
+        return session._create(entity_type, data, reconstructing=True)
+
+    page = [
+        create(
+            "Foo",
+            {
+                "id": "foo_{0}".format(index),
+                "bars": [
+                    create("Bar", {"id": "bar_0", "name": "name"}),
+                    create("Bar", {"id": "bar_{0}".format(index + 1)}),
+                ],
+            },
+        )
+        for index in range(2)
+    ]
+    mocker.patch.object(session, "call", return_value=[{"data": page, "metadata": {}}])
+    spies = dict(
+        (name, mocker.spy(layer, name))
+        for name in ("get", "get_many", "set", "set_many")
+    )
+
+    foos = session.query("Foo").all()
+
+    assert [bar["id"] for bar in foos[1]["bars"]] == ["bar_0", "bar_2"]
+    assert foos[0]["bars"][0] is cached
+    assert cached["name"] == "name"
+
+    assert spies["get_many"].call_count == 1
+    assert spies["set_many"].call_count == 1
+    assert not spies["get"].called
+    assert not spies["set"].called
+    assert sorted(spies["set_many"].call_args[0][0]) == sorted(
+        str((entity_type, [entity_id]))
+        for entity_type, entity_id in [
+            ("Foo", "foo_0"),
+            ("Foo", "foo_1"),
+            ("Bar", "bar_0"),
+            ("Bar", "bar_1"),
+            ("Bar", "bar_2"),
+        ]
+    )
+
+
+def test_cache_stats(mocked_schema_session):
+    """Report cache effectiveness per entity type and reset counters."""
+    assert mocked_schema_session.cache.statistics is None
+    assert mocked_schema_session.cache_stats()["layers"] == []
+
+    session = ftrack_api.Session(cache_statistics=True)
+    session.merge(session._create("Bar", {"id": "bar"}, reconstructing=True))
+    session.reset_cache_stats()
+
+    session.get("Bar", "bar")
+    session.get("Bar", "bar")
+    session.cache.get_many([str(("Foo", ["missing"]))])
+
+    report = session.cache_stats(top=5, reset=True)
+
+    (layer,) = report["layers"]
+    assert layer["name"] == session._local_cache.__class__.__name__
+    assert (layer["hits"], layer["misses"]) == (2, 1)
+    assert layer["categories"]["Bar"]["hits"] == 2
+    assert layer["categories"]["Foo"]["misses"] == 1
+    assert report["hot_keys"] == [(str(("Bar", ["bar"])), 2)]
+    assert report["missed_keys"] == [(str(("Foo", ["missing"])), 1)]
+    assert "calls" in report
+
+    assert session.cache_stats()["layers"] == []
+    session.close()
+
+
+def test_export_and_import_cache(mocked_schema_session, temporary_directory, mocker):
+    """Restore exported entities into session without querying the server."""
+    session = mocked_schema_session
+    path = os.path.join(temporary_directory, "snapshot")
+
+    bar = session.merge(
+        session._create("Bar", {"id": "bar", "name": "name"}, reconstructing=True)
+    )
+    session.merge(
+        session._create("Foo", {"id": "foo", "bars": [bar]}, reconstructing=True)
+    )
+    session.create("Bar", {"id": "created"})
+
+    assert session.export_cache(path) == 2
+
+    session.reset()
+    mocked = mocker.patch.object(session, "call")
+
+    imported = session.import_cache(path)
+
+    assert sorted(entity["id"] for entity in imported) == ["bar", "foo"]
+    foo = session.get("Foo", "foo")
+    assert foo["bars"][0]["name"] == "name"
+    assert foo["bars"][0] is session.get("Bar", "bar")
+    assert not mocked.called
+
+    session._server_information["schema_hash"] = "changed"
+    assert session.import_cache(path) == []
+
+
+def test_import_cache_revalidates_old_snapshot(
+    mocked_schema_session, temporary_directory, mocker
+):
+    """Refresh entities from an old cache snapshot in the background."""
+    session = mocked_schema_session
+    path = os.path.join(temporary_directory, "snapshot")
+
+    session.merge(
+        session._create("Bar", {"id": "bar", "name": "name"}, reconstructing=True)
+    )
+    mocker.patch("time.time", return_value=100.0)
+    session.export_cache(path)
+    session.reset()
+
+    mocked = mocker.patch.object(session, "populate")
+
+    time.time.return_value = 110.0
+    session.import_cache(path, revalidate_after=60)
+    assert not mocked.called
+
+    time.time.return_value = 200.0
+    imported = session.import_cache(path, revalidate_after=60)
+    for thread in threading.enumerate():
+        if thread.name == "ftrack-api-cache-revalidation":
+            thread.join()
+
+    mocked.assert_called_once_with(imported, "name")
+
+
+def test_merge_page(mocked_schema_session, mocker):
+    """Merge page of entities and unchanged shared references once."""
+    session = mocked_schema_session
+    bar = session.merge(
+        session._create("Bar", {"id": "bar", "name": "old"}, reconstructing=True)
+    )
+    for index in range(3):
+        session.merge(
+            session._create(
+                "Foo",
+                {"id": "foo_{0}".format(index), "bars": [bar]},
+                reconstructing=True,
+            )
+        )
+
+    page = [
+        session._create(
+            "Foo",
+            {
+                "id": "foo_{0}".format(index),
+                "bars": [
+                    session._create(
+                        "Bar", {"id": "bar", "name": "new"}, reconstructing=True
+                    )
+                ],
+            },
+            reconstructing=True,
+        )
+        for index in range(3)
+    ]
+    spy = mocker.spy(ftrack_api.entity.base.Entity, "_merge")
+
+    attached = session._merge_page(page)
+    merged_bars = [
+        call[0][0] for call in spy.call_args_list if call[0][0].entity_type == "Bar"
+    ]
+    assert len(merged_bars) == 1
+
+    assert [foo["id"] for foo in attached] == ["foo_0", "foo_1", "foo_2"]
+    assert attached[0]["bars"][0] is bar
+    assert bar["name"] == "new"
+    assert not session.recorded_operations
+
+
+def test_reset_releases_entities_without_garbage_collection(mocker, mocked_schemas):
+    """Release related entities on reset by reference counting alone."""
+    mocker.patch.object(
+        ftrack_api.Session,
+        "_load_schemas",
+        return_value=mocked_schemas
+        + [
+            {
+                "id": "Node",
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "parent": {"$ref": "Node"},
+                    "children": {"type": "array", "items": {"$ref": "Node"}},
+                },
+                "immutable": ["id"],
+                "primary_key": ["id"],
+                "required": ["id"],
+                "default_projections": ["id"],
+            }
+        ],
+    )
+    mocker.patch.object(ftrack_api.Session, "_configure_locations")
+    session = ftrack_api.Session()
+
+    gc.collect()
+    gc.disable()
+    try:
+        references = []
+        for index in range(10):
+            parent = session.merge(
+                session._create(
+                    "Node", {"id": "parent_{0}".format(index)}, reconstructing=True
+                )
+            )
+            child = session.merge(
+                session._create(
+                    "Node",
+                    {"id": "child_{0}".format(index), "parent": parent},
+                    reconstructing=True,
+                )
+            )
+            parent.attributes.get("children").set_remote_value(parent, [child])
+
+            assert parent["children"][0] is child
+            assert child["parent"] is parent
+            references.extend([weakref.ref(parent), weakref.ref(child)])
+
+        # Collect instances left over from merging before resetting.
+        children = parent["children"]
+        del parent, child
+        gc.collect()
+
+        session.reset()
+
+        # Only the last pair is still referenced, through the held collection.
+        assert [reference() is None for reference in references] == (
+            [True] * (len(references) - 2) + [False, False]
+        )
+
+        # Collections still held remain usable.
+        with session.operation_recording(False):
+            children.append(
+                session._create("Node", {"id": "other"}, reconstructing=True)
+            )
+
+        del children
+        assert [reference() for reference in references] == [None] * len(references)
+
+    finally:
+        gc.enable()
+
+
+def test_entity_outlives_session(mocker, mocked_schemas):
+    """Keep entity usable once its session is no longer referenced."""
+    mocker.patch.object(
+        ftrack_api.Session, "_load_schemas", return_value=mocked_schemas
+    )
+    mocker.patch.object(ftrack_api.Session, "_configure_locations")
+
+    def first():
+        """Return entity from a session that then goes out of scope."""
+        session = ftrack_api.Session()
+        foo = session._create("Foo", {"id": "foo"}, reconstructing=True)
+        foo["bars"] = [
+            session._create("Bar", {"id": "bar", "name": "name"}, reconstructing=True)
+        ]
+        return session.merge(foo)
+
+    foo = first()
+    gc.collect()
+
+    assert foo.session.closed is False
+    assert foo["bars"][0]["name"] == "name"
+    assert foo["bars"].entity is foo
+
+    foo.session.expunge(foo, cascade=True)
+    gc.collect()
+    assert foo["bars"].entity is foo
+    assert foo["bars"][0]["name"] == "name"
+
+
+def test_expunge(mocked_schema_session):
+    """Expunge entities and, when cascading, entities in their collections."""
+    session = mocked_schema_session
+    foo = session.merge(
+        session._create(
+            "Foo",
+            {
+                "id": "foo",
+                "bars": [session._create("Bar", {"id": "bar"}, reconstructing=True)],
+            },
+            reconstructing=True,
+        )
+    )
+    bar = foo["bars"][0]
+
+    assert session.expunge(foo) == [foo]
+    assert session.get("Bar", "bar") is bar
+    with pytest.raises(KeyError):
+        session._local_cache.get(session.cache_key_maker.key(("Foo", ["foo"])))
+
+    foo = session.merge(foo)
+    assert session.expunge([foo], cascade=True) == [foo, bar]
+    assert len(list(session._local_cache.keys())) == 0
+
+
+def test_scope(mocked_schema_session):
+    """Expunge clean entities attached within scope on exit."""
+    session = mocked_schema_session
+    shared = session.merge(
+        session._create("Bar", {"id": "shared"}, reconstructing=True)
+    )
+
+    with session.scope() as scope:
+        session.merge(session._create("Bar", {"id": "shared"}, reconstructing=True))
+        clean = session.merge(
+            session._create("Bar", {"id": "clean"}, reconstructing=True)
+        )
+        modified = session.merge(
+            session._create("Bar", {"id": "modified"}, reconstructing=True)
+        )
+        modified["name"] = "changed"
+        created = session.create("Bar", {"id": "created"})
+
+    assert scope.expunged == [clean]
+
+    cached = list(session._local_cache.values())
+    assert clean not in cached
+    for entity in (shared, modified, created):
+        assert entity in cached
+
+
+def test_read_only_session(mocker, mocked_schemas):
+    """Query through read only session with immutable entities."""
+    mocker.patch.object(
+        ftrack_api.Session, "_load_schemas", return_value=mocked_schemas
+    )
+    mocker.patch.object(ftrack_api.Session, "_configure_locations")
+    session = ftrack_api.Session(read_only=True)
+    assert session.read_only
+    assert not session.record_operations
+
+    foo = session.merge(
+        session._create(
+            "Foo",
+            {
+                "id": "foo",
+                "string": "value",
+                "bars": [session._create("Bar", {"id": "bar"}, reconstructing=True)],
+            },
+            reconstructing=True,
+        )
+    )
+    assert foo["string"] == "value"
+    assert [bar["id"] for bar in foo["bars"]] == ["bar"]
+
+    with pytest.raises(ftrack_api.exception.ReadOnlySessionError):
+        foo["string"] = "changed"
+
+    with pytest.raises(ftrack_api.exception.ImmutableCollectionError):
+        foo["bars"].append(session._create("Bar", {"id": "other"}, True))
+
+    with pytest.raises(ftrack_api.exception.ReadOnlySessionError):
+        session.create("Bar", {"id": "created"})
+
+    with pytest.raises(ftrack_api.exception.ReadOnlySessionError):
+        session.delete(foo)
+
+    mocked = mocker.patch.object(session, "call")
+    session.commit()
+    assert not mocked.called
+    assert not session.recorded_operations
+
+
+def test_revalidate_stale_entities(mocker, mocked_schemas):
+    """Refresh stale entities of a type together on attribute access."""
+    mocker.patch.object(
+        ftrack_api.Session, "_load_schemas", return_value=mocked_schemas
+    )
+    mocker.patch.object(ftrack_api.Session, "_configure_locations")
+    session = ftrack_api.Session(freshness_policies={"Bar": 30})
+    monotonic = mocker.patch("time.monotonic", return_value=100.0)
+
+    def merge_bar(entity_id, name):
+        """Merge Bar with *entity_id* and *name* as if retrieved remotely."""
+        return session.merge(
+            session._create("Bar", {"id": entity_id, "name": name}, reconstructing=True)
+        )
+
+    bars = [merge_bar("bar_0", "old"), merge_bar("bar_1", "old")]
+    monotonic.return_value = 120.0
+    fresh = merge_bar("bar_2", "old")
+
+    def query(expression):
+        """Return Bar entities with updated names."""
+        return [merge_bar(bar["id"], "new") for bar in bars], {}
+
+    mocked = mocker.patch.object(session, "_query", side_effect=query)
+
+    assert bars[0]["name"] == "old"
+    assert not mocked.called
+
+    monotonic.return_value = 131.0
+    assert bars[0]["name"] == "new"
+    assert bars[1]["name"] == "new"
+    assert fresh["name"] == "old"
+
+    assert mocked.call_count == 1
+    expression = mocked.call_args[0][0]
+    assert expression.startswith("select id, name from Bar where id in (")
+    assert "bar_2" not in expression
+
+
+def test_loaded_records_ordered_by_load_time(mocker, mocked_schemas):
+    """Keep load records ordered so only stale records are visited."""
+    mocker.patch.object(
+        ftrack_api.Session, "_load_schemas", return_value=mocked_schemas
+    )
+    mocker.patch.object(ftrack_api.Session, "_configure_locations")
+    session = ftrack_api.Session(freshness_policies={"Bar": 30})
+    monotonic = mocker.patch("time.monotonic", return_value=100.0)
+
+    bars = []
+    for index in range(3):
+        monotonic.return_value = 100.0 + index * 10
+        bars.append(
+            session.merge(
+                session._create(
+                    "Bar",
+                    {"id": "bar_{0}".format(index), "name": "old"},
+                    reconstructing=True,
+                )
+            )
+        )
+
+    # Reloading moves record to the end.
+    monotonic.return_value = 125.0
+    session.merge(
+        session._create("Bar", {"id": "bar_0", "name": "new"}, reconstructing=True)
+    )
+
+    records = session._loaded_at["Bar"]
+    assert list(records) == [id(bars[1]), id(bars[2]), id(bars[0])]
+
+    mocked = mocker.patch.object(session, "populate")
+    monotonic.return_value = 141.0
+    bars[1]["name"]
+
+    mocked.assert_called_once_with([bars[1]], "id, name")
+    assert list(records) == [id(bars[2]), id(bars[0]), id(bars[1])]
+
+
+def test_revalidate_ignores_records_of_reclaimed_entities(mocker, mocked_schemas):
+    """Ignore load record left by a reclaimed entity with the same id."""
+    mocker.patch.object(
+        ftrack_api.Session, "_load_schemas", return_value=mocked_schemas
+    )
+    mocker.patch.object(ftrack_api.Session, "_configure_locations")
+    session = ftrack_api.Session(freshness_policies={"Bar": 30})
+    monotonic = mocker.patch("time.monotonic", return_value=100.0)
+
+    bar = session._create("Bar", {"id": "bar", "name": "name"}, reconstructing=True)
+
+    # Simulate the id of the entity having been used by a reclaimed entity.
+    reclaimed = session._create("Bar", {"id": "reclaimed"}, reconstructing=True)
+    session._loaded_at["Bar"][id(bar)] = (weakref.ref(reclaimed), 0.0)
+    del reclaimed
+
+    mocked = mocker.patch.object(session, "populate")
+    monotonic.return_value = 200.0
+    assert bar["name"] == "name"
+
+    assert not mocked.called
+    assert id(bar) not in session._loaded_at["Bar"]
+
+
 def test_get_entity_from_cache(cache, task, mocker):
     """Retrieve an entity by type and id from cache."""
     session = ftrack_api.Session(cache=cache)
@@ -1487,6 +2249,42 @@ def test_auto_populate_is_thread_dependent(session, propagating_thread):
         t.join()
 
 
+def test_auto_populate_is_task_dependent(mocked_schema_session):
+    """Keep auto_populate and record_operations changes local to asyncio task."""
+    session = mocked_schema_session
+
+    async def disabled():
+        """Return states seen whilst disabled and other task runs."""
+        with session.auto_populating(False), session.operation_recording(False):
+            await asyncio.sleep(0)
+            return session.auto_populate, session.record_operations
+
+    async def default():
+        """Return states seen whilst other task has them disabled."""
+        await asyncio.sleep(0)
+        return session.auto_populate, session.record_operations
+
+    async def main():
+        return await asyncio.gather(disabled(), default())
+
+    assert asyncio.run(main()) == [(False, False), (True, True)]
+    assert session.auto_populate is True
+    assert session.record_operations is True
+
+    # Settings are kept per session in module level context variables.
+    other = ftrack_api.Session(auto_populate=False)
+    with session.auto_populating(False):
+        other.auto_populate = True
+        assert (session.auto_populate, other.auto_populate) == (False, True)
+
+    assert (session.auto_populate, other.auto_populate) == (True, True)
+    assert ftrack_api.session._AUTO_POPULATE.get()
+
+    other.close()
+    assert other.auto_populate is False
+    assert not ftrack_api.session._AUTO_POPULATE.get()
+
+
 def test_operation_recoding_thread_dependent(session, propagating_thread):
     """Make sure operation recording is thread dependent."""
     _id = str(uuid.uuid4())
@@ -1512,6 +2310,56 @@ def test_operation_recoding_thread_dependent(session, propagating_thread):
         assert operation.entity_key["id"] == _id
 
 
+def test_coalesce_identical_concurrent_calls(
+    mocked_schema_session, mocker, propagating_thread
+):
+    """Send identical concurrent read only calls to the server once."""
+    session = mocked_schema_session
+    entered = threading.Event()
+    release = threading.Event()
+    joined = threading.Event()
+
+    def post(*args, **kwargs):
+        """Block until released and return a canned response."""
+        entered.set()
+        release.wait()
+        return mocker.Mock(text='[{"data": [], "metadata": {}}]')
+
+    mocked = mocker.patch.object(session._request, "post", side_effect=post)
+
+    class JoinedEvent(threading.Event):
+        """Event signalling when waited upon."""
+
+        def wait(self, timeout=None):
+            """Signal *joined* and wait."""
+            joined.set()
+            return super(JoinedEvent, self).wait(timeout)
+
+    batch = [{"action": "query", "expression": "select id from Foo"}]
+    leader = propagating_thread(target=session.call, args=(batch,))
+    leader.start()
+    entered.wait()
+
+    # Detect the follower joining the call in flight.
+    (flight,) = session._in_flight_calls.values()
+    flight["done"] = JoinedEvent()
+
+    follower = propagating_thread(target=session.call, args=(batch,))
+    follower.start()
+    joined.wait()
+    release.set()
+
+    assert leader.join() == follower.join() == [{"data": [], "metadata": {}}]
+    assert mocked.call_count == 1
+    assert session.call_stats == {"requests": 1, "coalesced": 1}
+    assert not session._in_flight_calls
+
+    # Calls that modify data are always sent.
+    session.call([{"action": "delete", "entity_type": "Foo", "entity_key": ["1"]}])
+    assert mocked.call_count == 2
+    assert session.call_stats == {"requests": 2, "coalesced": 1}
+
+
 def test_strict_api_header():
     """Create ftrack session containing ftrack-strict-api = True header."""
     new_session = ftrack_api.Session(strict_api=True)
@@ -0,0 +1,89 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2024 ftrack
+
+import arrow
+
+import ftrack_api
+import ftrack_api.cache
+import ftrack_api.sync
+
+
+def test_synchronise_modified_entities(mocked_schema_session, mocker):
+    """Fetch entities modified since watermark and remove deleted entities."""
+    replica = ftrack_api.cache.MemoryCache()
+    session = ftrack_api.Session(cache=replica)
+    remote = {
+        "foo_0": arrow.get("2020-01-01T10:00:00"),
+        "foo_1": arrow.get("2020-01-02T12:00:00+02:00"),
+    }
+
+    def query(expression):
+        """Return remote Foo entities matching *expression*."""
+        records = []
+        for entity_id, date in sorted(remote.items()):
+            if ">=" in expression and date < arrow.get("2020-01-02T10:00:00"):
+                continue
+
+            data = {"id": entity_id}
+            if expression.startswith("select date"):
+                data["date"] = date
+
+            records.append(
+                session.merge(session._create("Foo", data, reconstructing=True))
+            )
+
+        return records, {}
+
+    mocked = mocker.patch.object(session, "_query", side_effect=query)
+
+    synchroniser = ftrack_api.sync.ReplicaSynchroniser(
+        session, {"Foo": "date"}, reconcile_interval=None
+    )
+    assert synchroniser.cache is replica
+
+    assert synchroniser.synchronise() == {"Foo": {"fetched": 2, "removed": 0}}
+    assert synchroniser.watermark("Foo") == arrow.get("2020-01-02T10:00:00")
+
+    remote["foo_2"] = arrow.get("2020-01-03T10:00:00")
+    del remote["foo_0"]
+
+    assert synchroniser.synchronise_entity_type("Foo") == {
+        "fetched": 2,
+        "removed": 0,
+    }
+    expression = mocked.call_args_list[-1][0][0]
+    assert 'where date >= "2020-01-02T10:00:00+00:00" order by date' in expression
+
+    assert synchroniser.reconcile("Foo") == 1
+    assert mocked.call_args_list[-1][0][0].startswith("select id from Foo")
+    assert sorted(
+        replica.get(key)["id"]
+        for key in replica.keys()
+        if session.cache_key_entity_type(key) == "Foo"
+    ) == ["foo_1", "foo_2"]
+    assert synchroniser.watermark("Foo") == arrow.get("2020-01-03T10:00:00")
+
+    # State is only stored outside the session memory cache.
+    state_key = synchroniser.STATE_KEY.format("Foo")
+    assert state_key in replica.keys()
+    assert state_key not in session._local_cache.keys()
+    assert session.created == []
+    assert session.modified == []
+    assert session.deleted == []
+
+    session.close()
+
+
+def test_synchronise_without_persistent_cache(mocked_schema_session, mocker):
+    """Keep state private to synchroniser if session has no persistent cache."""
+    session = mocked_schema_session
+    mocker.patch.object(session, "_query", return_value=([], {}))
+
+    synchroniser = ftrack_api.sync.ReplicaSynchroniser(
+        session, {"Foo": "date"}, reconcile_interval=None
+    )
+    assert synchroniser.cache is not session.cache
+    assert synchroniser.synchronise() == {"Foo": {"fetched": 0, "removed": 0}}
+
+    assert session._local_cache.keys() == []
+    assert session.created == []